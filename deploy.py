@@ -29,7 +29,10 @@
         Code written by John Collins © 2021
           -------------------------------
 """
+import functools
+import json
 import logging
+import os
 import random
 
 from dash import dcc
@@ -41,9 +44,15 @@ from dash.dependencies import State
 
 from dash.exceptions import PreventUpdate
 
+import flask
+import plotly
+
 from seqapp import app # NOTE: `app.app` should be changed to `[your new app name].app` !
 from seqapp import callbacks
+from seqapp import sessionlog
 from seqapp.layout import children as page_layout
+from seqapp.config import VERSION
+from seqapp.utils import CachedPayload
 from seqapp.utils import convert_html_to_dash
 
 
@@ -75,12 +84,55 @@ quotes += [("Albert Einstein", q) for q in [
 # ]]
 
 
+ERROR_404_TEMPLATE = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "static/error-pages/404.html"
+)
+
+
+def quote_html(author, quote):
+    return f'<br><center><h6><i style="font-size: 80%; font-family: Montserrat, sans-serif; font-weight: 500">"{quote}"</i><br>—{author}</h6></center><br><br><br>'
+
+
+@functools.lru_cache(maxsize=1)
+def compile_404_page():
+    """Pre-split (at its [up to two] "🌊" markers) & pre-convert the
+    404 page template, once (upon the first 404, rather than at import):
+    its two fixed leading parts, and its tail with each of the `quotes`
+    appended (one is picked per request).
+
+    Returns
+    -------
+    tuple
+        (head component, middle component, [tail component per quote])
+    """
+    with open(ERROR_404_TEMPLATE) as error_404:
+        parse_404 = ("".join(error_404.readlines()).split("🌊") + ["", ""])[:3]
+    return (
+        convert_html_to_dash(parse_404[0]),
+        convert_html_to_dash(parse_404[1]),
+        [convert_html_to_dash(parse_404[2] + quote_html(*q)) for q in quotes],
+    )
+
+
+def get_main_layout():
+    """Function abstraction that returns unaltered main
+    app layout of Dash-renderable to-be-React components.
+    Useful for applying Flask Exstensions decorators,
+    etc.
+
+    Returns
+    -------
+    dash.html.Div: with param `children` = list of Dash components
+    """
+    return html.Div(page_layout, style={"textAlign": "center"})
+
+
 @app.callback(
-    Output("page-content", "children"),
+    [Output("page-content", "children"), Output("page-kind", "data")],
     [Input("url", "pathname"), Input("url", "href")],
-    [State("page-content", "children")],
+    [State("page-kind", "data")],
 )
-def display_page(pathname, href, current_page):
+def display_page(pathname, href, page_kind):
     """Activated upon url change, *react*ively returning new page components,
     as applicable. (I.e., User's browser tab does not actually reload when
     changing URL - unless of course it is the first load or a reload of the
@@ -88,6 +140,10 @@ def display_page(pathname, href, current_page):
     returned for certain expected non-standard, specific URL href path
     extensions.)
 
+    The main page ships with the (cached, see `serve_cached_layout`) app
+    layout itself, so it is only re-sent when navigating back to it from
+    an error page.
+
 
     Callbacks
     ---------
@@ -105,18 +161,16 @@ def display_page(pathname, href, current_page):
             'http://localhost:9001/dash-webapp-template/#log-in')
 
         ## States
-        current_page : list
-            components list attr from `html.Div` (id='page-content')
-            Components list of what is currently displayed on UI page.
-            Same callback parameter object as that returned. Required for
-            checking if 'page-content' is empty or not (i.e., whether the
-            callback is the first load vs. a subsequent URL change).
+        page_kind : str
+            attr from `dcc.Store` (id='page-kind') | Which page is currently
+            displayed: "main" or "404" (in place of uploading the whole
+            current 'page-content' components tree with every URL change).
 
     Returns
     -------
-    html.Div:
-        Dash component App UI full main page's worth of components -
-        arrayed via list attr 'children'
+    tuple:
+        (html.Div: Dash component App UI full main page's worth of
+        components - arrayed via list attr 'children', new page kind)
 
     Raises
     ------
@@ -126,60 +180,63 @@ def display_page(pathname, href, current_page):
         links (i.e., enabling user-controlled rapid page scroll
         navigation)
     """
-
-    # @cache.cached(timeout=TIMEOUT)
-    def get_main_layout():
-        """Function abstraction that returns unaltered main
-        app layout of Dash-renderable to-be-React components.
-        Useful for applying Flask Exstensions decorators,
-        etc.
-
-        Returns
-        -------
-        dash.html.Div: with param `children` = list of Dash components
-        """
-        return html.Div(page_layout, style={"textAlign": "center"})
-
     if not pathname:
         raise PreventUpdate
-    if "#" in href and len(current_page) > 0:
+    if "#" in href and page_kind:
         raise PreventUpdate
     elif any(
             tag in pathname.replace("/", "").lower()
             for tag in ["app", "dash-webapp-template"]): # allowed url href paths
-        return get_main_layout()
+        if page_kind == "main":
+            raise PreventUpdate
+        return get_main_layout(), "main"
     else:
-        with open("static/error-pages/404.html") as error_404:
-            parse_404 = "".join(error_404.readlines())
-            author, quote, = random.choice(quotes)
-            parse_404 = (
-                parse_404 +
-                f'<br><center><h6><i style="font-size: 80%; font-family: Montserrat, sans-serif; font-weight: 500">"{quote}"</i><br>—{author}</h6></center><br><br><br>'
-            ).split("🌊")
-            return html.Div([convert_html_to_dash(parse_404[0])] + [
-                html.Img(
-                    src="seqapp/assets/images/",
-                    style={
-                        "width": "40%",
-                        "opacity": "0.75",
-                        "borderRadius": "150px"
-                    },
-                )
-            ] + [convert_html_to_dash(parse_404[1])] + [
-                html.A(
-                    "/dash-webapp-template/",
-                    href="dash-webapp-template/",
-                    style={"fontSize": "250%"})
-            ] + [convert_html_to_dash(parse_404[2])])
+        page_404_head, page_404_middle, page_404_tails = compile_404_page()
+        return html.Div([page_404_head] + [
+            html.Img(
+                src="seqapp/assets/images/",
+                style={
+                    "width": "40%",
+                    "opacity": "0.75",
+                    "borderRadius": "150px"
+                },
+            )
+        ] + [page_404_middle] + [
+            html.A(
+                "/dash-webapp-template/",
+                href="dash-webapp-template/",
+                style={"fontSize": "250%"})
+        ] + [random.choice(page_404_tails)]), "404"
 
 
 
 app.layout = html.Div([
     dcc.Location(id="url", refresh=False),
-    html.Div(id="page-content", children=[])
+    dcc.Store(id="page-kind", data="main"),
+    html.Div(id="page-content", children=[get_main_layout()])
 ])
 
 
+@functools.lru_cache(maxsize=1)
+def layout_payload(version=VERSION):
+    """The app layout, serialized to JSON (& pre-compressed) once per
+    process and app version."""
+    return CachedPayload(
+        json.dumps(app.layout, cls=plotly.utils.PlotlyJSONEncoder).encode("utf-8")
+    )
+
+
+def serve_cached_layout():
+    """Drop-in for Dash's `/_dash-layout` view: the cached payload, with
+    gzip/brotli variants, each with its own strong ETag (-> `304`s on reload)."""
+    return layout_payload(VERSION).response(flask.request)
+
+
+app.server.view_functions[
+    f"{app.config.routes_pathname_prefix}_dash-layout"
+] = serve_cached_layout
+
+
 ############################################
 # #         D E P L O Y M E N T          # #
 ############################################
@@ -239,6 +296,7 @@ if __name__ != "__main__":
     gunicorn_logger = logging.getLogger('gunicorn.error')
     app.logger.handlers = logger.handlers
     app.logger.setLevel(logger.level)
+    sessionlog.install(app.logger, app.server)
     app.logger.info(
         "Initializing dash-webapp-template (App) `app.server` for handoff..."
     )
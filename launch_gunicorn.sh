@@ -13,7 +13,14 @@ THREADS=${3:-8}
 GUNICORN_PROD_LOGS="./seqapp/app/prod/gunicorn/logs/${TODAY}"
 mkdir -p $GUNICORN_PROD_LOGS
 
+# Cache the app's build metadata (version & updates) once, rather than
+# have every starting worker query git.
+python3 seqapp/config/buildinfo.py "$(pwd)"
+
+# Preload (& warm up) the app in the master process, so that workers
+# share it copy-on-write - see seqapp/prefork.py (readiness: /readyz).
 gunicorn \
+  --preload \
   -b 0.0.0.0:$PORT \
   -w $NUM_WORKERS \
   --worker-class gthread \
@@ -22,7 +29,7 @@ gunicorn \
   --max-requests 100 \
   --max-requests-jitter 10 \
   --access-logfile "${GUNICORN_PROD_LOGS}/${TODAY}.access.log" \
-  app.wsgi:server
+  seqapp.prefork:server
 
 
 # --daemon \
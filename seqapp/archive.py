@@ -0,0 +1,408 @@
+"""
+A R C H I V E  |  app.archive
+-----------------
+On-the-fly (streamed) zip archives of output files.
+
+`stream_zip` yields a ZIP64-capable archive chunk by chunk as its member
+files are read, so a download can start at once and no archive is ever
+written to disk: memory use is bounded by `ZIP_STREAM_BLOCK`, whatever
+the total size. Members whose format is already compressed (see
+`ZIP_STORED_EXTENSIONS`) are stored as-is rather than deflated again;
+the others are deflated at their genre's `ZIP_COMPRESSLEVEL`.
+
+Streamed archives are also teed into the session's `ZIP_CACHE_DIR`,
+keyed by a hash of their manifest (member paths, sizes & mtimes, plus
+genre): a repeated request for an unchanged selection is then served
+straight from the cached file (see `cached_zip`), and the cache is kept
+under `ZIP_CACHE_MAX_BYTES` per session by evicting the least recently
+used archives.
+
+For genres in `PARALLEL_ZIP_GENRES` (typically many large, compressible
+files, e.g. FASTQ bundles), `stream_zip_parallel` deflates members
+concurrently (zlib releases the GIL while compressing), then writes the
+compressed members out in order, with their sizes & CRCs known up front.
+All downloads of a process share one pool of `ZIP_COMPRESS_WORKERS`
+threads; each keeps at most `ZIP_READAHEAD_BYTES` of input compressed
+ahead of what it has sent, and compressed members beyond
+`ZIP_SPOOL_MAX_BYTES` wait in temporary files rather than in memory.
+
+Examples
+--------
+>>> return flask.Response(
+...     flask.stream_with_context(stream_zip(files, root=session_dir)),
+...     mimetype="application/zip",
+... )
+
+Attributes
+----------
+logger : logging.Logger
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import contextlib
+import hashlib
+import struct
+import tempfile
+import zlib
+
+from concurrent.futures import ThreadPoolExecutor
+
+from seqapp.config import *
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """The process-wide compression thread pool (re-created after a fork)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ThreadPoolExecutor(max_workers=ZIP_COMPRESS_WORKERS, thread_name_prefix="zip")
+            _pool_pid = os.getpid()
+        return _pool
+
+
+class _StreamSink(io.RawIOBase):
+    """Write-only, unseekable file object buffering the bytes `zipfile`
+    writes until they are drained (makes `zipfile` emit data descriptors
+    instead of seeking back to patch member headers)."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def compress_type(filename):
+    """`zipfile` compression method for a member file, by extension."""
+    if filename.lower().endswith(ZIP_STORED_EXTENSIONS):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def arcnames(files, root=None):
+    """Archive member names: paths relative to `root` (else basenames)."""
+    if root:
+        return [os.path.relpath(f, root) for f in files]
+    return [os.path.basename(f) for f in files]
+
+
+def stream_zip(files, root=None, level=None):
+    """Generate a zip archive of `files`, chunk by chunk.
+
+    Parameters
+    ----------
+    files : list of str
+        Full paths of the member files.
+    root : str, optional
+        Directory the member names are made relative to.
+    level : int, optional
+        zlib level of the deflated members (default: zlib's own).
+
+    Yields
+    ------
+    bytes
+    """
+    sink = _StreamSink()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as zipf:
+        for filename, arcname in zip(files, arcnames(files, root)):
+            try:
+                info = zipfile.ZipInfo.from_file(filename, arcname)
+                info.compress_type = compress_type(filename)
+                info._compresslevel = level  # (ZipFile's compresslevel skips given ZipInfos)
+                with open(filename, "rb") as src, zipf.open(info, "w", force_zip64=True) as dst:
+                    for block in iter(partial(src.read, ZIP_STREAM_BLOCK), b""):
+                        dst.write(block)
+                        data = sink.drain()
+                        if data:
+                            yield data
+            except FileNotFoundError:
+                logger.warning(f"Skipping file removed during zip streaming: {filename}")
+                continue
+            yield sink.drain()
+    yield sink.drain()
+
+
+class _Member:
+    """A member file, compressed (or checksummed, if stored) ahead of
+    being written out by `stream_zip_parallel`."""
+
+    def __init__(self, filename, arcname, method, level):
+        self.filename = filename
+        self.arcname = arcname
+        self.method = method
+        st = os.stat(filename)
+        self.mode = st.st_mode
+        self.mtime = st.st_mtime
+        self.crc = 0
+        self.file_size = 0
+        self.data = None  # spooled deflate stream (None if stored)
+        compressor = None
+        if method == zipfile.ZIP_DEFLATED:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+            self.data = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_BYTES)
+        with open(filename, "rb") as src:
+            for block in iter(partial(src.read, ZIP_STREAM_BLOCK), b""):
+                self.crc = zlib.crc32(block, self.crc)
+                self.file_size += len(block)
+                if compressor:
+                    self.data.write(compressor.compress(block))
+        if compressor:
+            self.data.write(compressor.flush())
+            self.compress_size = self.data.tell()
+            self.data.seek(0)
+        else:
+            self.compress_size = self.file_size
+
+    def dos_time(self):
+        y, mo, d, h, mi, sec = time.localtime(self.mtime)[:6]
+        if y < 1980:
+            y, mo, d, h, mi, sec = 1980, 1, 1, 0, 0, 0
+        return (h << 11) | (mi << 5) | (sec // 2), ((y - 1980) << 9) | (mo << 5) | d
+
+    def blocks(self):
+        """The member's (compressed) data."""
+        src = self.data or open(self.filename, "rb")
+        with src:
+            yield from iter(partial(src.read, ZIP_STREAM_BLOCK), b"")
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+
+
+_ZIP64_VERSION = 45
+_UTF8_FLAG = 0x800
+
+
+def _local_header(member):
+    name = member.arcname.encode("utf-8")
+    dostime, dosdate = member.dos_time()
+    extra = struct.pack("<2H2Q", 0x0001, 16, member.file_size, member.compress_size)
+    return struct.pack(
+        "<4s5H3L2H", b"PK\x03\x04", _ZIP64_VERSION, _UTF8_FLAG, member.method,
+        dostime, dosdate, member.crc, 0xFFFFFFFF, 0xFFFFFFFF, len(name), len(extra),
+    ) + name + extra
+
+
+def _central_header(member, offset):
+    name = member.arcname.encode("utf-8")
+    dostime, dosdate = member.dos_time()
+    extra = struct.pack(
+        "<2H3Q", 0x0001, 24, member.file_size, member.compress_size, offset
+    )
+    return struct.pack(
+        "<4s6H3L5H2L", b"PK\x01\x02", (3 << 8) | _ZIP64_VERSION, _ZIP64_VERSION,
+        _UTF8_FLAG, member.method, dostime, dosdate, member.crc, 0xFFFFFFFF,
+        0xFFFFFFFF, len(name), len(extra), 0, 0, 0, (member.mode & 0xFFFF) << 16,
+        0xFFFFFFFF,
+    ) + name + extra
+
+
+def _end_records(n_entries, cd_offset, cd_size):
+    eocd64_offset = cd_offset + cd_size
+    return (
+        struct.pack(
+            "<4sQ2H2L4Q", b"PK\x06\x06", 44, (3 << 8) | _ZIP64_VERSION, _ZIP64_VERSION,
+            0, 0, n_entries, n_entries, cd_size, cd_offset,
+        )
+        + struct.pack("<4sLQL", b"PK\x06\x07", 0, eocd64_offset, 1)
+        + struct.pack(
+            "<4s4H2LH", b"PK\x05\x06", 0, 0, min(n_entries, 0xFFFF),
+            min(n_entries, 0xFFFF), min(cd_size, 0xFFFFFFFF),
+            min(cd_offset, 0xFFFFFFFF), 0,
+        )
+    )
+
+
+def stream_zip_parallel(files, root=None, level=zlib.Z_DEFAULT_COMPRESSION, readahead=None):
+    """Generate a (ZIP64) zip archive of `files`, deflating members
+    concurrently on the shared compression pool.
+
+    Members are compressed ahead of the one being sent for up to
+    `readahead` bytes of input (at least one member), spooled to
+    temporary files beyond `ZIP_SPOOL_MAX_BYTES`, and written out in
+    order.
+
+    Parameters
+    ----------
+    files : list of str
+        Full paths of the member files.
+    root : str, optional
+        Directory the member names are made relative to.
+    level : int, optional
+        zlib compression level (0-9).
+    readahead : int, optional
+        Read-ahead budget (bytes); defaults to `ZIP_READAHEAD_BYTES`.
+
+    Yields
+    ------
+    bytes
+    """
+    budget = ZIP_READAHEAD_BYTES if readahead is None else readahead
+    pool = _get_pool()
+    entries, offset = [], 0
+    pending, ahead = collections.deque(), 0
+    todo = iter(zip(files, arcnames(files, root)))
+    nxt = next(todo, None)
+    try:
+        while True:
+            while nxt is not None:
+                filename, arcname = nxt
+                try:
+                    size = os.path.getsize(filename)
+                except OSError:
+                    size = 0
+                if pending and ahead + size > budget:
+                    break
+                pending.append(
+                    (size, pool.submit(_Member, filename, arcname, compress_type(filename), level))
+                )
+                ahead += size
+                nxt = next(todo, None)
+            if not pending:
+                break
+            size, future = pending.popleft()
+            ahead -= size
+            try:
+                member = future.result()
+            except FileNotFoundError as e:
+                logger.warning(f"Skipping file removed during zip streaming: {e.filename}")
+                continue
+            with contextlib.closing(member):
+                header = _local_header(member)
+                yield header
+                entries.append(_central_header(member, offset))
+                offset += len(header) + member.compress_size
+                yield from member.blocks()
+    finally:
+        for _, future in pending:
+            if not future.cancel():
+                future.add_done_callback(_close_member)
+    central_directory = b"".join(entries)
+    yield central_directory
+    yield _end_records(len(entries), offset, len(central_directory))
+
+
+def _close_member(future):
+    """Release the spooled data of a member no longer to be sent."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def stream_archive(files, root=None, genre=None):
+    """Zip stream of a genre's files, at the genre's `ZIP_COMPRESSLEVEL`:
+    deflated in parallel for `PARALLEL_ZIP_GENRES`, else sequentially."""
+    if genre in PARALLEL_ZIP_GENRES:
+        level = ZIP_COMPRESSLEVEL.get(genre, zlib.Z_DEFAULT_COMPRESSION)
+        return stream_zip_parallel(files, root=root, level=level)
+    return stream_zip(files, root=root, level=ZIP_COMPRESSLEVEL.get(genre))
+
+
+def manifest_key(files, genre=""):
+    """Hash of an archive's manifest: member paths, sizes & mtimes, and
+    the genre (changes whenever any member is added, removed or touched).
+
+    Returns
+    -------
+    str
+        '<genre>-<sha256 hex digest>'
+    """
+    digest = hashlib.sha256(f"{genre}\n".encode())
+    for filename in sorted(files):
+        try:
+            st = os.stat(filename)
+        except FileNotFoundError:
+            continue
+        digest.update(f"{filename}\t{st.st_size}\t{st.st_mtime_ns}\n".encode())
+    return f"{rpunct(genre)}-{digest.hexdigest()}"
+
+
+def _cache_path(session_dir, key):
+    return os.path.join(session_dir, ZIP_CACHE_DIR, f"{key}.zip")
+
+
+def cached_zip(session_dir, key):
+    """Path of the cached archive for manifest `key` (marked as recently
+    used), else None."""
+    zipped = _cache_path(session_dir, key)
+    try:
+        os.utime(zipped)
+    except FileNotFoundError:
+        return None
+    return zipped
+
+
+def gc_zip_cache(session_dir, keep=None, max_bytes=None):
+    """Evict superseded archives (same genre as `keep`), then the least
+    recently used ones, until the session's cache fits `max_bytes`
+    (default `ZIP_CACHE_MAX_BYTES`)."""
+    cache_dir = os.path.join(session_dir, ZIP_CACHE_DIR)
+    budget = ZIP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    keep_name = f"{keep}.zip" if keep else None
+    entries = []
+    with contextlib.suppress(FileNotFoundError), os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".zip") and not entry.name.startswith("."):
+                with contextlib.suppress(FileNotFoundError):
+                    entries.append((entry.stat().st_mtime_ns, entry.stat().st_size, entry.path))
+    genre = keep.split("-", 1)[0] + "-" if keep else None
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, zipped in sorted(entries):
+        name = os.path.basename(zipped)
+        superseded = genre and name.startswith(genre) and name != keep_name
+        if superseded or (total > budget and name != keep_name):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(zipped)
+            total -= size
+            logger.info(f"Evicted cached zip archive {zipped} ({size} bytes)")
+
+
+def stream_zip_cached(files, session_dir, key, root=None, genre=None):
+    """`stream_archive`, also teeing the archive into the session's zip cache
+    under manifest `key` (kept only if streamed to completion).
+
+    Yields
+    ------
+    bytes
+    """
+    zipped = _cache_path(session_dir, key)
+    os.makedirs(os.path.dirname(zipped), exist_ok=True)
+    part = os.path.join(
+        os.path.dirname(zipped), f".{key}.{os.getpid()}.{threading.get_ident()}.part"
+    )
+    completed = False
+    try:
+        with open(part, "wb") as cache:
+            for data in stream_archive(files, root=root, genre=genre):
+                cache.write(data)
+                yield data
+        os.replace(part, zipped)
+        completed = True
+        gc_zip_cache(session_dir, keep=key)
+    finally:
+        if not completed:  # (e.g., client disconnected mid-download)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(part)
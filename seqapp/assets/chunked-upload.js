@@ -0,0 +1,143 @@
+/*
+ * Chunked, resumable uploads -> `/uploadChunk` (see seqapp/uploads.py).
+ *
+ * Files picked via the `#chunked-upload-input` button (which opens a file
+ * dialog; `dash.html` has no file <input>) are sent one after another,
+ * `chunk_size` bytes per POST, straight into the current session's
+ * output directory. Before each file the server is asked how much of it
+ * it already holds, so re-selecting the same files after a dropped
+ * connection resumes where it stopped. When the batch is done, the
+ * hidden `#chunked-upload-done` button is clicked so Dash callbacks can
+ * pick up the (lightweight) upload handles.
+ *
+ * Files dropped on `dcc.Upload` take the same route: the clientside
+ * callback `window.dash_clientside.uploads.store_uploads` (registered in
+ * seqapp/callbacks.py) turns its base64 `contents` back into files, sends
+ * them through `/uploadChunk`, and clears `contents` at once - so no
+ * server-side callback request ever carries file contents.
+ */
+(function () {
+    "use strict";
+
+    function currentRunId() {
+        var session = JSON.parse(window.sessionStorage.getItem("session") || "null");
+        return session && session.RUN_ID !== "NA" ? session.RUN_ID : null;
+    }
+
+    function showProgress(text) {
+        var el = document.getElementById("chunked-upload-progress");
+        if (el) {
+            el.textContent = text;
+        }
+    }
+
+    function uploadUrl(runId, file, extra) {
+        var params = new URLSearchParams(Object.assign({
+            run_id: runId,
+            filename: file.name
+        }, extra || {}));
+        return "/uploadChunk?" + params.toString();
+    }
+
+    async function uploadFile(runId, file, index, count) {
+        var resp = await fetch(uploadUrl(runId, file));
+        var status = await resp.json();
+        if (!resp.ok) {
+            throw new Error(status.error || resp.statusText);
+        }
+        // A completed upload of the same size is not sent again; one of a
+        // different size is a new file under the same name
+        var complete = status.complete && status.offset === file.size;
+        var offset = status.complete ? 0 : status.offset;
+        // (an empty file is still sent, as a single empty final chunk)
+        while (!complete) {
+            var chunk = file.slice(offset, offset + status.chunk_size);
+            resp = await fetch(uploadUrl(runId, file, {
+                offset: offset,
+                total: file.size,
+                last_modified: file.lastModified
+            }), {method: "POST", body: chunk});
+            var result = await resp.json();
+            if (resp.status === 409) {
+                offset = result.offset;  // server holds a different amount; resync
+                complete = result.complete;
+                continue;
+            }
+            if (!resp.ok) {
+                throw new Error(result.error || resp.statusText);
+            }
+            offset = result.offset;
+            complete = result.complete;
+            showProgress(
+                "⇪ (" + (index + 1) + "/" + count + ") " + file.name + ": " +
+                (complete ? 100 : Math.floor(100 * offset / Math.max(file.size, 1))) + "%"
+            );
+        }
+    }
+
+    async function uploadAll(files) {
+        var runId = currentRunId();
+        if (!runId) {
+            showProgress("Please sign in first!");
+            return;
+        }
+        for (var i = 0; i < files.length; i++) {
+            try {
+                await uploadFile(runId, files[i], i, files.length);
+            } catch (err) {
+                showProgress("⚠ Upload failed for " + files[i].name + ": " + err.message +
+                             " (re-select the files to resume)");
+                return;
+            }
+        }
+        showProgress("✔ " + files.length + " file(s) received.");
+        var done = document.getElementById("chunked-upload-done");
+        if (done) {
+            done.click();
+        }
+    }
+
+    // A `dcc.Upload` data URI ("data:<type>;base64,<data>") as a File
+    function dataUriToFile(contents, name, lastModified) {
+        var comma = contents.indexOf(",");
+        var binary = atob(contents.slice(comma + 1));
+        var bytes = new Uint8Array(binary.length);
+        for (var i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        var type = contents.slice(5, comma).replace(/;base64$/, "");
+        return new File([bytes], name, {type: type, lastModified: lastModified});
+    }
+
+    var uploads = {
+        store_uploads: function (contents, names, dates) {
+            if (!contents || !contents.length) {
+                return window.dash_clientside.no_update;
+            }
+            uploadAll(contents.map(function (c, i) {
+                // (`dcc.Upload` dates are in s, `File.lastModified` in ms)
+                var date = dates && dates[i] !== undefined ? dates[i] * 1000 : Date.now();
+                return dataUriToFile(c, names[i], Math.round(date));
+            }));
+            return null;
+        }
+    };
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {uploads: uploads});
+
+    function pickFiles() {
+        var input = document.createElement("input");
+        input.type = "file";
+        input.multiple = true;
+        input.addEventListener("change", function () {
+            uploadAll(Array.prototype.slice.call(input.files));
+        });
+        input.click();
+    }
+
+    document.addEventListener("click", function (event) {
+        if (event.target && event.target.closest && event.target.closest("#chunked-upload-input")) {
+            pickFiles();
+        }
+    });
+})();
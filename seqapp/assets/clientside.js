@@ -0,0 +1,223 @@
+/*
+ * Clientside callbacks (`window.dash_clientside.ui`) for pure-UI
+ * interactions, registered in seqapp/callbacks.py with
+ * `ClientsideFunction("ui", <name>)`.
+ *
+ * These do no server work, so they run in the browser: no round trip
+ * to `_dash-update-component`, and no gunicorn thread held per click.
+ * Each mirrors the server-side callback it replaced, returning the
+ * same components (as Dash component JSON - see `html()` below) and
+ * the same values, including the `null`s the Python versions returned
+ * implicitly.
+ */
+(function () {
+    "use strict";
+
+    // `dash.html.<type>(children, **props)` (as serialized: `children` is
+    // always present, null if none)
+    function html(type, children, props) {
+        var p = Object.assign({}, props || {});
+        p.children = children === undefined ? null : children;
+        return {namespace: "dash_html_components", type: type, props: p};
+    }
+
+    // Python's `f"{value}"`
+    function str(value) {
+        return value === null || value === undefined ? "None" : String(value);
+    }
+
+    function isNone(value) {
+        return value === "None" || value === null || value === undefined;
+    }
+
+    // URL of a file under seqapp/assets/: its fingerprinted URL, from the
+    // `asset-urls` store (see seqapp/static_assets.py), else the plain one
+    function assetUrl(assets, path) {
+        if (assets && assets[path]) {
+            return assets[path];
+        }
+        var config = document.getElementById("_dash-config");
+        var prefix = config ? JSON.parse(config.textContent).requests_pathname_prefix : "/";
+        return prefix + "assets/" + path;
+    }
+
+    function newSelectionPrompt(assets) {
+        return [
+            html("Div", [
+                html("Span", "Make a new selection.", {
+                    style: {textAlign: "center", fontFamily: "Muli", fontSize: "1.5rem"}
+                }),
+                html("Span", html("Img", undefined, {
+                    src: assetUrl(assets, "animations/dna-minimal-green.gif"),
+                    height: "150",
+                    style: {
+                        transform: "translateY(-55px) translateX(5px)",
+                        filter: "hue-rotate(100deg) contrast(1.1) saturate(5)",
+                        position: "absolute",
+                        opacity: "0.5",
+                        borderRadius: "250px"
+                    }
+                }))
+            ], {
+                style: {
+                    marginLeft: "25%",
+                    position: "relative",
+                    textAlign: "center",
+                    width: "50%",
+                    zIndex: "-1"
+                }
+            }),
+            html("Div", [
+                html("Span", "↪⦿"),
+                html("Img", undefined, {
+                    src: assetUrl(assets, "images/scope-unic.png"),
+                    width: "80",
+                    style: {marginTop: "15px", marginBottom: "-25px", cursor: "pointer"}
+                }),
+                html("Span", "⥅♅")
+            ], {
+                style: {
+                    textAlign: "center",
+                    fontSize: "1.75rem",
+                    animation: "animateGlow 45s infinite linear!important",
+                    cursor: "pointer"
+                }
+            })
+        ];
+    }
+
+    function submissionPrompt(dd1, dd2, clearSubmission, assets) {
+        return html("Div", [
+            html("Code", "♻ Cleared submission state: [total_clears=" + str(clearSubmission) + "]", {
+                style: {fontStyle: "italic", fontSize: "0.9rem", marginBottom: "5px"}
+            }),
+            html("Br"),
+            html("Div", [
+                html("H6", [
+                    html("P", "⮊ Click ⬫Submit⬫ 𝑓𝗈𝓇⤑" + str(dd2) + " ~ " + str(dd1)),
+                    html("Span", "to initiate "),
+                    html("Span", "in silico ", {
+                        style: {fontStyle: "italic", fontFamily: "'Times', serif"}
+                    }),
+                    html("Span", "analysis of selections.")
+                ], {
+                    style: {
+                        textAlign: "center",
+                        cursor: "pointer",
+                        color: "#ffffff6e",
+                        backgroundImage: "url(https://media.giphy.com/media/4HIOPSXOitJ2o/giphy.gif)",
+                        mozBackgroundClip: "text",
+                        webkitBackgroundClip: "text",
+                        fontWeight: "700",
+                        backgroundSize: "60%"
+                    }
+                })
+            ], {
+                style: {
+                    position: "absolute",
+                    margin: "0.5% -5% -5% -5%",
+                    textAlign: "center",
+                    display: "inline-block",
+                    mixBlendMode: "lighten",
+                    width: "200px"
+                }
+            }),
+            html("Br"),
+            html("Br"),
+            html("Div", [
+                html("Span", "✂"),
+                html("Span", "۝"),
+                html("Span", "⭾"),
+                html("Span", "α/β"),
+                html("Div", [
+                    html("Video", undefined, {
+                        src: assetUrl(assets, "animations/T-Cell_TEM_4-3.mp4"),
+                        id: "t-cell",
+                        autoPlay: true,
+                        loop: true,
+                        controls: false,
+                        preload: "true",
+                        muted: true
+                    })
+                ], {style: {filter: "opacity(0.25)"}})
+            ], {
+                style: {
+                    textAlign: "center",
+                    fontSize: "2rem",
+                    width: "20%",
+                    marginLeft: "40.5%",
+                    mixBlendMode: "exclusion"
+                },
+                className: "animate twirl"
+            })
+        ], {style: {textAlign: "center"}});
+    }
+
+    var ui = {
+        update_workflow_choice: function (workflow) {
+            return [html("H2", str(workflow), {style: {textAlign: "center"}})];
+        },
+
+        trigger_dropdowns: function (submitNClicks, clearNClicks, dd1, dd2) {
+            if (clearNClicks === submitNClicks + 1) {
+                return html(
+                    "Code",
+                    "⚠ | ℹ Overclicking clear *may* require compensatory submits! (I.e., Try clicking submit button >1 times, if submissions are not going through.)",
+                    {
+                        style: {
+                            color: "red",
+                            display: "flex",
+                            flexFlow: "column wrap",
+                            fontSize: "1.0rem",
+                            margin: "0px 30% 20px 30%"
+                        }
+                    }
+                );
+            }
+            if (!isNone(dd1) && !isNone(dd2)) {
+                return [html("Code", "SUBMISSION for: " + str(dd1) + ", @Well" + str(dd2))];
+            }
+            if (clearNClicks > submitNClicks + 1) {
+                return html(
+                    "Code",
+                    "Submissions cleared: " + str(clearNClicks) +
+                        ", [submissions_count=" + str(submitNClicks) + "].",
+                    {style: {fontStyle: "normal", color: "gray", margin: "0px 30% 20px 30%"}}
+                );
+            }
+            return html("Code", "No submissions received, it seems...");
+        },
+
+        display_generated_dd_output: function (
+            dd1, dd2, submission, clearSubmission, workflow, sessionData, submissionTimestamp, assets
+        ) {
+            if ((dd1 === "None" && dd2 === "None") || dd1 === null || dd1 === undefined) {
+                return newSelectionPrompt(assets);
+            }
+            if (dd1 === "Error" || dd2 === "Error") {
+                return null;
+            }
+            if (dd1 !== "None" && (dd2 === null || dd2 === undefined)) {
+                return [
+                    html("H5", "ℹ | Informational message to display.", {
+                        style: {textAlign: "center", marginLeft: "25%", width: "50%"}
+                    })
+                ];
+            }
+            if (dd1 !== "None" && dd2 !== "None") {
+                return submissionPrompt(dd1, dd2, clearSubmission, assets);
+            }
+            return null;
+        },
+
+        clear_dd1_selection: function (nClicks) {
+            return nClicks > 0 ? "None" : null;
+        },
+
+        clear_dd2_selection: function (val, nClicks) {
+            return nClicks > 0 && val === "None" ? "None" : null;
+        }
+    };
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {ui: ui});
+})();
@@ -0,0 +1,307 @@
+"""
+B E N C H M A R K S  |  app.benchmarks
+-----------------------
+Micro-benchmarks of app hot paths, runnable against a full deployment:
+
+    >$ python -m seqapp.benchmarks [benchmark name ...]
+
+Each benchmark prints one line of results per input size.
+
+Attributes
+----------
+BENCHMARKS : dict
+    Benchmark name -> function.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+from seqapp.config import *
+
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    """Register `func` under its name (minus a 'bench_' prefix)."""
+    BENCHMARKS[func.__name__.replace("bench_", "", 1)] = func
+    return func
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    """Best-of-`repeat` wall time of `func(*args, **kwargs)`, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def random_seq(n, alphabet="ACGT", seed=0):
+    return "".join(random.Random(seed).choices(alphabet, k=n))
+
+
+@benchmark
+def bench_wrap_seq(sizes=(1_000, 100_000, 10_000_000), widths=(60, 125)):
+    """`wrap_seq_nucleic`: linear `iter_wrapped_seq` vs. the former
+    prefix-rejoining implementation (quadratic; skipped above 100 kb)."""
+    from seqapp.bioinfo.pipeline import iter_wrapped_seq
+    from seqapp.utils import ljoin
+
+    def quadratic(seq, wrap):
+        seq_lines = [seq[x_i : x_i + wrap] for x_i in range(0, len(seq), wrap)]
+        return [
+            (
+                "".join(
+                    f"000{str(x_i)}"[-4:] + ":...." * 4 + "|"
+                    for x_i in range(
+                        len(ljoin(seq_lines[: n - 1])), len(ljoin(seq_lines[:n])), 25
+                    )
+                )
+            )[: len(seq_lines[n - 1])]
+            for n in range(1, len(seq_lines) + 1)
+        ]
+
+    for n in sizes:
+        seq = random_seq(n)
+        for wrap in widths:
+            linear = timed(lambda: collections.deque(iter_wrapped_seq(seq, wrap), maxlen=0))
+            before = f"{timed(quadratic, seq, wrap, repeat=1):.4f}s" if n <= 100_000 else "(skipped)"
+            print(f"wrap_seq  {n:>10,d} bp @ {wrap:>3d} cols:  linear {linear:.4f}s  |  former {before}")
+
+
+@benchmark
+def bench_html_to_dash(repeat=100):
+    """`convert_html_to_dash` of the 404 page template: cold (bs4 parse &
+    conversion) vs. warm (memoized) calls."""
+    from seqapp.utils import HTML_TO_DASH_CACHE
+    from seqapp.utils import convert_html_to_dash
+
+    template = f"{APP_HOME}/static/error-pages/404.html"
+    with open(template) as f:
+        source = f.read()
+
+    def cold():
+        HTML_TO_DASH_CACHE.clear()
+        convert_html_to_dash(source)
+
+    cold_t = timed(cold, repeat=repeat)
+    warm_t = timed(convert_html_to_dash, source, repeat=repeat)
+    print(
+        f"html_to_dash  {len(source):,d} chars:  cold {cold_t * 1e3:.3f}ms  |  "
+        f"warm {warm_t * 1e3:.3f}ms  ({cold_t / max(warm_t, 1e-9):,.0f}x)"
+    )
+
+
+@benchmark
+def bench_callback_map(legacy_blocks=1000):
+    """`_dash-dependencies` (callback map sent to every browser on load)
+    & first page load (`/`, layout & dependencies; cold) of the app, vs.
+    the same app with the former one-callback-per-id `show_pipeline_commands`
+    registered for `legacy_blocks` command blocks."""
+    import gzip
+
+    from deploy import app
+
+    def first_load(dash_app):
+        prefix = dash_app.config.routes_pathname_prefix
+        with dash_app.server.test_client() as client:
+            t0 = time.perf_counter()
+            for url in ("/", f"{prefix}_dash-layout"):
+                client.get(url)
+            deps = client.get(f"{prefix}_dash-dependencies").data
+            return deps, time.perf_counter() - t0
+
+    def report(label, dash_app):
+        deps, load_t = first_load(dash_app)
+        print(
+            f"callback_map  {label:<8s}  {len(json.loads(deps)):>5,d} callbacks  "
+            f"{len(deps) / 1e3:>9,.1f} kB  ({len(gzip.compress(deps)) / 1e3:,.1f} kB gz)  "
+            f"|  first load {load_t * 1e3:.1f}ms"
+        )
+
+    report("current", app)
+
+    legacy = dash.Dash(__name__)
+    legacy.layout = app.layout
+    legacy.config.suppress_callback_exceptions = True
+    legacy._callback_list.extend(app._callback_list)
+    for n in range(legacy_blocks):
+
+        @legacy.callback(
+            Output(f"cmds-dt-{n}", "style"),
+            [Input(f"show-cmds-{n}", "n_clicks")],
+            [State(f"cmds-dt-{n}", "style")],
+        )
+        def show_pipeline_commands(n_clicks, style):
+            raise PreventUpdate
+
+    report("former", legacy)
+
+
+REFRESH_UPLOADS_TRIGGER = "refresh-uploads.n_clicks"
+
+FORMER_UPLOAD_CALLBACKS = [
+    # (output, inputs, state) of the former `update_output` &
+    # `enable_combined_file_uploads`, whose inputs included the uploads'
+    # base64 contents
+    ("output-data-upload.children",
+     [("upload-data", "contents"), ("upload-data", "filename"), ("upload-data", "last_modified"),
+      ("initiate-pipeline", "n_clicks"), ("clear-pipeline", "n_clicks"),
+      ("append-uploads", "n_clicks"), ("refresh-uploads", "n_clicks"), ("clear-uploads", "n_clicks"),
+      ("memory", "data"), ("sign-on-submit", "n_clicks"), ("session", "data")],
+     [("workflow-id", "value"), ("initiate-pipeline", "n_clicks_timestamp"),
+      ("clear-pipeline", "n_clicks_timestamp"), ("sign-on-submit", "n_clicks_timestamp"),
+      ("refresh-uploads", "n_clicks_timestamp"), ("clear-uploads", "n_clicks_timestamp")]),
+    ("memory.data",
+     [("append-uploads", "n_clicks"), ("clear-uploads", "n_clicks"),
+      ("refresh-uploads", "n_clicks"), ("upload-data", "contents")],
+     [("session", "data"), ("memory", "data"), ("append-uploads", "n_clicks_timestamp"),
+      ("refresh-uploads", "n_clicks_timestamp"), ("clear-uploads", "n_clicks_timestamp"),
+      ("upload-data", "filename"), ("upload-data", "last_modified")]),
+]
+
+
+def server_callbacks(app):
+    """(output, inputs, state) of every server-side callback of `app`,
+    with inputs & state as lists of (component id, property)."""
+
+    def deps(items):
+        return [(d["id"], d["property"]) for d in items]
+
+    return [
+        (cb["output"], deps(cb["inputs"]), deps(cb["state"]))
+        for cb in app._callback_list if not cb.get("clientside_function")
+    ]
+
+
+def upload_client_state(batch_bytes, n_files):
+    """Component props as held in the browser after uploading a batch of
+    `n_files` files (`batch_bytes` in all) through `dcc.Upload`.
+
+    Returns
+    -------
+    tuple
+        (props by "<id>.<property>", size of `upload-data.contents` in bytes)
+    """
+    names = [f"sample_{i:04d}.csv" for i in range(n_files)]
+    # (base64 of the batch, plus per file: data URI prefix, quotes & separator)
+    contents_bytes = 4 * -(-batch_bytes // 3) + n_files * len('"data:text/csv;base64,", ')
+    client_state = {
+        "upload-data.contents": None,  # (sized separately: `contents_bytes`)
+        "upload-data.filename": names,
+        "upload-data.last_modified": [1.6e9] * n_files,
+        "upload-status.data": {"files": n_files, "bytes": batch_bytes, "t": 1.6e18},
+        "memory.data": {"APP_RUNID_x-list_of_names": names},
+        "session.data": {"RUN_ID": "APP_RUNID_x", "PATH_TO_SESSION_OUTPUT": "/" * 80,
+                         "session_log_file": "/" * 100, "user_proper": "User", "UUID": "0" * 32},
+    }
+    return client_state, contents_bytes
+
+
+def callback_request_bytes(callbacks, trigger, client_state, contents_bytes=0):
+    """Body sizes of the `_dash-update-component` requests fired by a
+    change of `trigger` ("<id>.<property>"), built as the Dash renderer
+    builds them.
+
+    Parameters
+    ----------
+    callbacks : list of tuple
+        (output, inputs, state), as from `server_callbacks`.
+    trigger : str
+    client_state : dict
+        Props by "<id>.<property>" (others are sent as `1`).
+    contents_bytes : int, optional
+        Size of `upload-data.contents`, added wherever it is sent.
+
+    Returns
+    -------
+    dict
+        Request body size (bytes), by callback output.
+    """
+
+    def props(deps):
+        return [{"id": i, "property": p, "value": client_state.get(f"{i}.{p}", 1)} for i, p in deps]
+
+    sizes = {}
+    for output, inputs, state in callbacks:
+        if tuple(trigger.split(".")) not in inputs:
+            continue
+        body = {"output": output, "outputs": {"id": output, "property": ""},
+                "inputs": props(inputs), "changedPropIds": [trigger], "state": props(state)}
+        sizes[output] = len(json.dumps(body))
+        if ("upload-data", "contents") in [*inputs, *state]:
+            sizes[output] += contents_bytes
+    return sizes
+
+
+@benchmark
+def bench_callback_request_size(batch_bytes=500 * 1024 ** 2, n_files=500):
+    """Bytes POSTed to `_dash-update-component` by one "Refresh Uploads"
+    click after uploading a `batch_bytes` batch of `n_files` files
+    through `dcc.Upload`: for the app's callbacks vs. the former
+    `update_output` & `enable_combined_file_uploads` (whose inputs
+    included the uploads' base64 contents)."""
+    from deploy import app
+
+    client_state, contents_bytes = upload_client_state(batch_bytes, n_files)
+    for label, callbacks in [("current", server_callbacks(app)), ("former", FORMER_UPLOAD_CALLBACKS)]:
+        sizes = callback_request_bytes(callbacks, REFRESH_UPLOADS_TRIGGER, client_state, contents_bytes)
+        print(
+            f"callback_request_size  {label:<8s}  {len(sizes)} callback request(s) "
+            f"per click:  {sum(sizes.values()):>15,d} bytes  ({batch_bytes / 1024 ** 2:,.0f} MB batch, {n_files} files)"
+        )
+
+
+def import_time(module="deploy", cwd=APP_HOME):
+    """Cumulative import times, from `python -X importtime -c "import
+    <module>"` run (from `cwd`) in a fresh interpreter.
+
+    Returns
+    -------
+    tuple
+        (total seconds for `module`, [(microseconds, module name), ...])
+
+    Raises
+    ------
+    ImportError
+        If the import fails (with the end of its stderr).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode:
+        raise ImportError(f"`import {module}` failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|", 2)
+            if cumulative.strip().isdigit():
+                rows.append((int(cumulative), name.rstrip()))
+    total = max(us for us, name in rows if name.strip() == module) / 1e6
+    return total, rows
+
+
+@benchmark
+def bench_import_time(module="deploy", top=15):
+    """Cold start up: `python -X importtime -c "import deploy"` in a fresh
+    interpreter, with the slowest imports (cumulative); exits non-zero
+    over the `IMPORT_TIME_BUDGET_S` budget."""
+    try:
+        total, rows = import_time(module)
+    except ImportError as e:
+        sys.exit(f"import_time  {e}")
+    for us, name in sorted(rows, reverse=True)[:top]:
+        print(f"import_time  {us / 1e3:>10,.1f}ms  {name}")
+    print(f"import_time  `import {module}`: {total:.3f}s  (budget {IMPORT_TIME_BUDGET_S:.3f}s)")
+    if total > IMPORT_TIME_BUDGET_S:
+        sys.exit(f"import_time  over budget by {total - IMPORT_TIME_BUDGET_S:.3f}s")
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or [*BENCHMARKS]:
+        BENCHMARKS[name]()
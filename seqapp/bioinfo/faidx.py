@@ -0,0 +1,386 @@
+"""
+F A I D X  |  app.bioinfo.faidx
+-----------------------
+Indexed random access to reference FASTA & GenBank files.
+
+FASTA files get a samtools-compatible `.fai` index (one line per record:
+name, length, byte offset of the first base, bases per line, bytes per
+line), so any record or subsequence is read from the memory-mapped file
+with a constant number of seeks. GenBank files get a `.gbi` sidecar
+(name, byte start, byte end of each `LOCUS ... //` entry), so a single
+record is parsed from its own slice instead of the whole file.
+
+Indexes are (re)built on first use, and again whenever the reference
+file changes: an index is stamped with its reference's mtime and only
+trusted while the two match (and an open reference is reloaded as soon
+as its mtime or size differs). Reloading swaps in a new mapping; the
+old one is closed once no reader holds it any more. Update reference
+files by replacing them (write aside, then rename): truncating a file
+in place under a live mapping faults its readers.
+
+`fetch_reference` looks record names up in a per-archive name -> file
+map, rebuilt only when the archive's file listing changes (as seen by
+its `OutputIndex`, i.e., one `stat` per directory).
+
+Examples
+--------
+>>> ref = open_reference(f"{PLASMIDS_ARCHIVE}/pUC19.fasta")
+>>> ref.fetch("pUC19", 100, 160)
+'GCGCAACGCAATTAATGTGAGTTAGCTCACTCATTAGGCACCCCAGGCTTTACACTTTATG'
+>>> fetch_reference("pUC19")  # (looked up across the plasmids archive)
+
+Attributes
+----------
+logger : logging.Logger
+REFERENCES : LRUCache
+    Open indexes, by reference file path (per process).
+ARCHIVE_RECORDS : dict
+    Archive -> (reference files, {record name: reference file}).
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import mmap
+
+from seqapp.config import *
+from seqapp.utils import LRUCache
+from seqapp.utils import output_index
+
+logger = logging.getLogger(__name__)
+
+GENBANK_EXTENSIONS = tuple([".gb", ".gbk", ".genbank"])
+
+REFERENCES = LRUCache(maxsize=256)
+
+ARCHIVE_RECORDS = {}
+_archive_lock = threading.Lock()
+
+_Mapping = collections.namedtuple("_Mapping", ["signature", "records", "mm"])
+
+
+def _write_index(index_path, rows, mtime_ns):
+    """Atomically (re)write tab-separated index `rows` to `index_path`,
+    stamped with (its reference's) `mtime_ns`."""
+    tmp = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.writelines("\t".join(map(str, row)) + "\n" for row in rows)
+    os.utime(tmp, ns=(time.time_ns(), mtime_ns))
+    os.replace(tmp, index_path)
+
+
+def build_fai(fasta_path, fai_path=None):
+    """Write a samtools-compatible `.fai` index of a FASTA file.
+
+    Parameters
+    ----------
+    fasta_path : str
+    fai_path : str, optional
+        Defaults to `fasta_path + ".fai"`.
+
+    Returns
+    -------
+    list of tuple
+        (name, length, offset, linebases, linewidth) per record.
+
+    Raises
+    ------
+    ValueError
+        If a record's sequence lines are not all of the same length
+        (save the last), which would make offsets non-computable.
+    """
+    rows, record = [], None
+    mtime_ns = os.stat(fasta_path).st_mtime_ns  # (before reading: a change meanwhile -> stale)
+
+    def close(record):
+        if record is not None:
+            rows.append(
+                (record["name"], record["length"], record["offset"],
+                 record["linebases"] or 0, record["linewidth"] or 0)
+            )
+
+    with open(fasta_path, "rb") as f:
+        offset = 0
+        for line in f:
+            width = len(line)
+            if line.startswith(b">"):
+                close(record)
+                name = (line[1:].split(None, 1) or [b""])[0].decode("utf-8")
+                record = {
+                    "name": name, "length": 0, "offset": offset + width,
+                    "linebases": None, "linewidth": None, "ended": False,
+                }
+            elif record is not None:
+                bases = len(line.rstrip(b"\r\n"))
+                if bases and record["ended"]:
+                    raise ValueError(
+                        f"{fasta_path}: inconsistent line lengths in record '{record['name']}'"
+                    )
+                if record["linebases"] is None:
+                    record["linebases"], record["linewidth"] = bases, width
+                elif bases > record["linebases"]:
+                    raise ValueError(
+                        f"{fasta_path}: inconsistent line lengths in record '{record['name']}'"
+                    )
+                if bases < record["linebases"] or width != record["linewidth"]:
+                    record["ended"] = True  # (only the last line may be short)
+                record["length"] += bases
+            offset += width
+    close(record)
+    _write_index(fai_path or f"{fasta_path}.fai", rows, mtime_ns)
+    return rows
+
+
+def build_gbi(genbank_path, gbi_path=None):
+    """Write a `.gbi` index (name, start, end byte) of a GenBank file's
+    `LOCUS ... //` entries.
+
+    Returns
+    -------
+    list of tuple
+        (name, start, end) per record.
+    """
+    rows, start, name = [], None, None
+    mtime_ns = os.stat(genbank_path).st_mtime_ns
+    with open(genbank_path, "rb") as f:
+        offset = 0
+        for line in f:
+            if line.startswith(b"LOCUS"):
+                fields = line.split()
+                start, name = offset, fields[1].decode("utf-8") if len(fields) > 1 else ""
+            elif line.startswith(b"//") and start is not None:
+                rows.append((name, start, offset + len(line)))
+                start = None
+            offset += len(line)
+    _write_index(gbi_path or f"{genbank_path}.gbi", rows, mtime_ns)
+    return rows
+
+
+class _IndexedReference:
+    """Memory-mapped reference file + its (auto-rebuilt) index."""
+
+    index_suffix = None
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = f"{path}{self.index_suffix}"
+        self._mapping = None
+        self._lock = threading.Lock()
+
+    def _build(self):
+        raise NotImplementedError
+
+    def _parse(self, row):
+        raise NotImplementedError
+
+    def _current(self):
+        """The index & mapping of the reference as it is now: (re)loaded
+        if the file's (mtime, size) differs from the loaded one's, and
+        swapped in whole, so that readers never see a closed mapping.
+
+        Returns
+        -------
+        _Mapping
+        """
+        st = os.stat(self.path)
+        signature = (st.st_mtime_ns, st.st_size)
+        mapping = self._mapping
+        if mapping is not None and mapping.signature == signature:
+            return mapping
+        with self._lock:
+            mapping = self._mapping
+            if mapping is not None and mapping.signature == signature:
+                return mapping
+            try:
+                stale = os.stat(self.index_path).st_mtime_ns != signature[0]
+            except FileNotFoundError:
+                stale = True
+            # (same mtime, other size: rewritten within one mtime tick)
+            stale = stale or (mapping is not None and mapping.signature[0] == signature[0])
+            if stale:
+                logger.info(f"Indexing reference file {self.path}...")
+                self._build()
+            with open(self.index_path) as f:
+                rows = [self._parse(line.rstrip("\n").split("\t")) for line in f if line.strip()]
+            with open(self.path, "rb") as f:
+                mm = None
+                if os.fstat(f.fileno()).st_size:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapping = _Mapping(signature, {row[0]: row[1:] for row in rows}, mm)
+            return self._mapping
+
+    @staticmethod
+    def _bytes(mapping, start, end):
+        return mapping.mm[start:end] if mapping.mm is not None else b""
+
+    def __contains__(self, name):
+        return name in self._current().records
+
+    def __len__(self):
+        return len(self._current().records)
+
+    def names(self):
+        return [*self._current().records]
+
+    def close(self):
+        """Drop the mapping (closed once no reader holds it any more)."""
+        self._mapping = None
+
+
+class FastaIndex(_IndexedReference):
+    """Random access to the records of a (`.fai`-indexed) FASTA file.
+
+    Parameters
+    ----------
+    path : str
+        Reference FASTA file; its index is kept at `path + ".fai"`.
+    """
+
+    index_suffix = ".fai"
+
+    def _build(self):
+        build_fai(self.path, self.index_path)
+
+    def _parse(self, row):
+        name, *fields = row[:5]
+        return (name, *map(int, fields))
+
+    def length(self, name):
+        return self._current().records[name][0]
+
+    def fetch(self, name, start=0, end=None):
+        """Sequence of record `name`, or its [start, end) (0-based) slice.
+
+        Returns
+        -------
+        str
+        """
+        mapping = self._current()
+        length, offset, linebases, linewidth = mapping.records[name]
+        start, end, _ = slice(start, end).indices(length)
+        if end <= start:
+            return ""
+
+        def byte(pos):
+            return offset + (pos // linebases) * linewidth + pos % linebases
+
+        raw = self._bytes(mapping, byte(start), byte(end - 1) + 1)
+        return raw.replace(b"\n", b"").replace(b"\r", b"").decode("ascii")
+
+    def record(self, name):
+        """Record `name` as a `SeqRecord` (id & sequence only)."""
+        return SeqRecord(Seq(self.fetch(name)), id=name, name=name, description="")
+
+
+class GenbankIndex(_IndexedReference):
+    """Random access to the records of a (`.gbi`-indexed) GenBank file.
+
+    Parameters
+    ----------
+    path : str
+        Reference GenBank file; its index is kept at `path + ".gbi"`.
+    """
+
+    index_suffix = ".gbi"
+
+    def _build(self):
+        build_gbi(self.path, self.index_path)
+
+    def _parse(self, row):
+        name, start, end = row[:3]
+        return (name, int(start), int(end))
+
+    def record(self, name):
+        """Record `name` as a (fully annotated) `SeqRecord`."""
+        mapping = self._current()
+        start, end = mapping.records[name]
+        return SeqIO.read(StringIO(self._bytes(mapping, start, end).decode("utf-8")), "genbank")
+
+    def length(self, name):
+        return len(self.record(name))
+
+    def fetch(self, name, start=0, end=None):
+        """Sequence of record `name`, or its [start, end) (0-based) slice."""
+        return str(self.record(name).seq[start:end])
+
+
+def open_reference(path):
+    """Shared (per process) index of a reference FASTA or GenBank file.
+
+    Returns
+    -------
+    FastaIndex or GenbankIndex
+    """
+    path = os.path.realpath(path)
+    kind = GenbankIndex if path.endswith(GENBANK_EXTENSIONS) else FastaIndex
+    return REFERENCES.get_or_create(path, lambda: kind(path))
+
+
+def archive_records(archive=None):
+    """Record name -> reference file, across the reference files of an
+    archive (the first file, in path order, holding a name wins); rebuilt
+    only when the archive's list of reference files changes.
+
+    Parameters
+    ----------
+    archive : str, optional
+        Defaults to `PLASMIDS_ARCHIVE`.
+
+    Returns
+    -------
+    dict
+    """
+    archive = os.path.normpath(archive or PLASMIDS_ARCHIVE)
+    files = tuple(
+        sorted(output_index(archive).files(output_filetype_genres["REF"] + GENBANK_EXTENSIONS))
+    )
+    cached = ARCHIVE_RECORDS.get(archive)
+    if cached is not None and cached[0] == files:
+        return cached[1]
+    with _archive_lock:
+        cached = ARCHIVE_RECORDS.get(archive)
+        if cached is not None and cached[0] == files:
+            return cached[1]
+        records = {}
+        for path in files:
+            try:
+                for name in open_reference(path).names():
+                    records.setdefault(name, path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable reference file {path}: {e}")
+        ARCHIVE_RECORDS[archive] = (files, records)
+        return records
+
+
+def fetch_reference(name, start=0, end=None, archive=None):
+    """Look up (a slice of) reference record `name` across all reference
+    files of the plasmids archive (see `archive_records`).
+
+    Parameters
+    ----------
+    name : str
+        Record name (FASTA ID / GenBank LOCUS name).
+    start, end : int, optional
+        0-based, half-open slice of the sequence.
+    archive : str, optional
+        Defaults to `PLASMIDS_ARCHIVE`.
+
+    Returns
+    -------
+    str or None
+        Sequence, or None if no reference file holds `name`.
+    """
+    path = archive_records(archive).get(name)
+    if path is None:
+        return None
+    try:
+        reference = open_reference(path)
+        if name in reference:
+            return reference.fetch(name, start, end)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Skipping unreadable reference file {path}: {e}")
+    # The file changed in place since the name map was built: rebuild it.
+    ARCHIVE_RECORDS.pop(os.path.normpath(archive or PLASMIDS_ARCHIVE), None)
+    path = archive_records(archive).get(name)
+    return open_reference(path).fetch(name, start, end) if path else None
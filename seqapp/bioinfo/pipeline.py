@@ -10,6 +10,9 @@ ly via the UI and made available for direct file downloads via custom HTML-
 transforming functions triggered by user callbacks and thus located in the
 callbacks.py module.
 """
+import contextlib
+import csv
+import hashlib
 import os
 import sys
 
@@ -18,12 +21,81 @@ sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 from seqapp.config import *
 
 from seqapp import app
+from seqapp import jobs
+from seqapp import uploads
 from seqapp.utils import *
 
 
 # logger = logging.getLogger(__name__)
 
 
+PARSE_CACHE = LRUCache(
+    maxsize=PARSE_CACHE_MAX_ENTRIES,
+    maxbytes=PARSE_CACHE_MAX_BYTES,
+    sizeof=lambda df: int(df.memory_usage(deep=True).sum()),
+)
+"""Parsed upload DataFrames, keyed by (session output dir, parse
+generation, content hash), shared across the append / refresh /
+initiate callbacks of a session. Each parse is also pickled into the
+session dir (`PARSE_CACHE_DIR`), so that it is parsed once per session
+rather than once per gunicorn worker (or pipeline worker process): a
+miss here is first looked up there. Parsing also writes per-sample
+outputs to the session dir, so clearing a session's uploads
+(`forget_parsed`) starts a new generation: re-uploads are parsed - and
+written - anew."""
+
+
+def _parse_generation(f_wout):
+    """Current parse generation of a session (as seen by every worker)."""
+    try:
+        return os.stat(os.path.join(f_wout, PARSE_CACHE_GENERATION_FILE)).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def _parsed_file(key):
+    f_wout, generation, digest = key
+    return os.path.join(f_wout, PARSE_CACHE_DIR, f"{generation}-{digest}.pkl")
+
+
+def _load_parsed(key):
+    """A session's parse of an upload, as pickled by any worker (None if
+    there is none for the current generation)."""
+    try:
+        return pd.read_pickle(_parsed_file(key))
+    except FileNotFoundError:
+        return None
+    except Exception as e:  # (e.g., truncated by a full disk) -> parse anew
+        app.logger.warning(f"Ignoring unreadable parse cache file {_parsed_file(key)}: {e}")
+        return None
+
+
+def _store_parsed(key, df):
+    """Atomically pickle a parse for the session's other workers."""
+    filepath = _parsed_file(key)
+    tmp = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        df.to_pickle(tmp)
+        os.replace(tmp, filepath)
+    except OSError as e:  # (e.g., the session's parses were just forgotten)
+        app.logger.warning(f"Could not write parse cache file {filepath}: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+
+
+def forget_parsed(f_wout):
+    """Invalidate a session's cached parses, in all workers (to be called
+    whenever its uploads, or their outputs, are cleared)."""
+    if os.path.isdir(f_wout):
+        with open(os.path.join(f_wout, PARSE_CACHE_GENERATION_FILE), "w") as f:
+            f.write(f"{tns()}")
+        shutil.rmtree(os.path.join(f_wout, PARSE_CACHE_DIR), ignore_errors=True)
+    for key in PARSE_CACHE.keys():
+        if key[0] == f_wout:
+            PARSE_CACHE.pop(key)
+
+
 def create_blank_df(header, index_name="NA"):
     """
     Function: create_blank_df
@@ -47,13 +119,93 @@ def create_blank_df(header, index_name="NA"):
 
 
 
+@dataclass
+class PackedReads:
+    """Compact, columnar representation of a batch of reads: all bases
+    and all quality scores concatenated into two `uint8` buffers, plus an
+    offsets array such that read `i` spans `offsets[i]:offsets[i + 1]`.
+
+    Whole-batch QC (e.g., `get_N_quals`) then runs as single (masked)
+    NumPy array operations, instead of Python loops over every base.
+
+    Attributes:
+        seq (np.ndarray): uint8 ASCII bases of all reads
+        qual (np.ndarray): uint8 Phred quality scores (i.e., *not* ASCII-offset)
+        offsets (np.ndarray): int64 read boundaries (length = number of reads + 1)
+        index (list, optional): read names/IDs, in order
+    """
+
+    seq: np.ndarray
+    qual: np.ndarray
+    offsets: np.ndarray
+    index: list = None
+
+    @classmethod
+    def from_reads(cls, seqs, quals, index=None, phred_offset=33):
+        """Pack per-read sequences & qualities.
+
+        Args:
+            seqs (iterable of str): read sequences
+            quals (iterable): per-read qualities; each either a sequence
+                of integer Phred scores or an ASCII-encoded quality string
+            index (list, optional): read names/IDs
+            phred_offset (int, optional): ASCII offset of quality strings
+
+        Returns:
+            PackedReads: (reads are truncated to the shorter of their
+            sequence / quality lengths, as with `zip`)
+        """
+        seq_parts, qual_parts = [], []
+        for s, q in zip(seqs, quals):
+            s = f"{s}"
+            if isinstance(q, str):
+                q = np.frombuffer(q.encode("ascii"), dtype=np.uint8) - phred_offset
+            else:
+                q = np.asarray(q, dtype=np.uint8)
+            n = min(len(s), len(q))
+            seq_parts.append(s[:n])
+            qual_parts.append(q[:n])
+        lengths = np.fromiter(map(len, seq_parts), dtype=np.int64, count=len(seq_parts))
+        offsets = np.zeros(len(seq_parts) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(
+            seq=np.frombuffer("".join(seq_parts).encode("ascii"), dtype=np.uint8),
+            qual=(
+                np.concatenate(qual_parts).astype(np.uint8, copy=False)
+                if qual_parts
+                else np.empty(0, dtype=np.uint8)
+            ),
+            offsets=offsets,
+            index=index,
+        )
+
+    @classmethod
+    def from_df(cls, df, seq_col="seq", qual_col="Q_arrays"):
+        """Pack a DataFrame of reads (rows) with sequence & quality columns."""
+        return cls.from_reads(df[seq_col], df[qual_col], index=[*df.index])
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self):
+        """np.ndarray: read lengths"""
+        return np.diff(self.offsets)
+
+    @property
+    def read_ids(self):
+        """np.ndarray: read number of every base in the buffers"""
+        return np.repeat(np.arange(len(self)), self.lengths)
+
+
 def get_N_quals(df):
     """
     Parameters
     ----------
-    df : pd.DataFrame
+    df : pd.DataFrame or PackedReads
         Input df containing Sanger reads as rows w/ bases set to
-        column 'seq' and corresponding quality score
+        column 'seq' and corresponding quality score (column
+        'Q_arrays'); or the same reads already packed.
     
     Returns
     -------
@@ -61,22 +213,12 @@ def get_N_quals(df):
         Containing quality scores only for 'N' bases
     
     """
-    bqs = []
-    for n in range(df.shape[0]):
-        bqs.append(
-            [
-                (b, q)
-                for (b, q) in [*zip(df.iloc[n].seq, df.iloc[n].Q_arrays)]
-                if b == "N"
-            ]
-        )
-    N_quals = [q for (b, q) in [*itl.chain.from_iterable(bqs)]]
+    packed = df if isinstance(df, PackedReads) else PackedReads.from_df(df)
+    N_quals = packed.qual[packed.seq == ord("N")]
     df_NQs = pd.Series(N_quals)
     return df_NQs, df_NQs.describe()
 
 
-
-
 def parse_contents(contents, filename, date, f_wout, session_log_file):
     """Parses user-uploaded input sequence files; namely, ABI Sanger
     Sequencing chromatogram 'trace' files. However, a variety of
@@ -95,43 +237,73 @@ def parse_contents(contents, filename, date, f_wout, session_log_file):
     """
     # P A R S E   F I L E   U P L O A D  I N P U T S
     content_type, content_string = contents.split(",")
-    decoded = base64.b64decode(content_string)
+    return parse_decoded(
+        lambda: base64.b64decode(content_string),
+        filename,
+        f_wout,
+        digest=hashlib.sha256(content_string.encode()).hexdigest(),
+        preview=contents[0:200],
+        content_string=content_string,
+    )
+
+
+def parse_upload(RUN_ID, handle, f_wout, session_log_file=""):
+    """Parses a file received via the chunked `/uploadChunk` endpoint
+    (i.e., already written server-side; see `seqapp.uploads`), reading
+    it straight from disk rather than from a base64 data URI.
+
+    Args:
+        RUN_ID (str): Current RUN ID
+        handle (dict): upload handle as returned by `uploads.list_uploads`
+        f_wout (str): file path of current session to write decoded sequence data
+        session_log_file (str, optional): Deprecated
+
+    Returns:
+        html.Div: same components as `parse_contents`
+    """
+    filepath = uploads.upload_path(RUN_ID, handle)
+
+    def load():
+        with open(filepath, "rb") as f:
+            return f.read()
+
+    with open(filepath, "rb") as f:
+        preview = f"{f.read(150)}"
+    return parse_decoded(
+        load, handle["filename"], f_wout, digest=handle["sha256"], preview=preview
+    )
+
+
+def parse_decoded(load, filename, f_wout, digest, preview="", content_string=None):
+    """Shared body of `parse_contents` / `parse_upload`: returns the
+    components displaying an uploaded file, reading (i.e., decoding &
+    parsing) it only if its content `digest` is not already in the
+    `PARSE_CACHE`, nor pickled in the session dir by another worker
+    (unsupported files are never cached).
+
+    Args:
+        load (callable): returns the raw (decoded) file contents as bytes
+        filename (str): file name of the uploaded input
+        f_wout (str): file path of current session to write decoded sequence data
+        digest (str): content hash of the upload (the parse cache key)
+        preview (str, optional): leading raw content shown beneath the table
+        content_string (str, optional): base64-encoded contents, if at hand
+
+    Returns:
+        html.Div: Components displaying the parsed file
+    """
     try:
-        ## READ IN : AB1 - SANGER
-        # Chromatogram Sanger reads files
-        if filename.endswith("ab1"):
-            abi_decoded = io.BytesIO(decoded)
-            df = abi2fastq(
-                input_abi=filename,
-                abi_contents=abi_decoded,
-                f_wout=f_wout,
-                abi_encoded=content_string,
-            )
-            if df.shape[0] < 1:
-                return html.Div(
-                    [
-                        "There was an error processing this file.\n(\tTraceback:\n"
-                        + f"{e}\n\t)."
-                    ]
-                )
-        ## READ IN : FASTA - (ASSUME TCRα/β ligations)
-        # TCR-alpha/beta allele-specific chain pairs sequences
-        # i.e., Assume this is the refernce file already given by user.
-        elif filename.endswith(tuple([".fa", ".fasta", ".FASTA"])):
-            df, ref = parse_input_ref_fasta(
-                input_fa=filename, fa_contents=io.StringIO(decoded.decode("utf-8"))
-            )
-        ## READ IN : FASTQ - (ASSUME TCRα/β ligations)
-        # TCR-alpha/beta allele-specific chain pairs sequences
-        elif filename.endswith(tuple([".fq", ".fastq", ".FASTQ"])):
-            fastq = SeqIO.parse(io.StringIO(decoded), "fastq")
-        ## READ IN : ARBITRARY DATA TABLES
-        elif "csv" in filename:  # or "tsv" in filename:
-            # Assume that the user uploaded a CSV file
-            df = pd.read_csv(io.StringIO(decoded.decode("utf-8")))
-        elif "xls" in filename:
-            # Assume that the user uploaded an Excel file
-            df = pd.read_excel(io.BytesIO(decoded))
+        key = (f_wout, _parse_generation(f_wout), digest)
+        df = PARSE_CACHE.get(key)
+        if df is None:
+            df = _load_parsed(key)
+            if df is None:
+                df = read_upload(load(), filename, f_wout, content_string=content_string)
+                if df is None:
+                    raise ValueError(f"Unsupported file type: {filename}")
+                _store_parsed(key, df)
+            PARSE_CACHE.put(key, df)
+        app.logger.debug(f"Parse cache: {PARSE_CACHE.stats()}")
     except Exception as e:
         print(e)
         traceback.print_exc(file=sys.stdout)
@@ -170,16 +342,79 @@ def parse_contents(contents, filename, date, f_wout, session_log_file):
             ),
             html.Div("Raw Content"),
             html.Pre(
-                contents[0:200] + "...",
+                preview + "...",
                 style={"whiteSpace": "pre-wrap", "wordBreak": "break-all"},
             ),
         ]
     )
 
 
+@functools.lru_cache(maxsize=None)
+def phred_table(offset=33):
+    """256-entry lookup table of Phred quality -> error probability.
+
+    Args:
+        offset (int, optional): encoding offset; 33 for (Sanger/Illumina
+            1.8+) ASCII quality strings, 0 for raw integer Phred scores
+            (e.g., `PackedReads.qual`)
+
+    Returns:
+        np.ndarray: float64 probabilities indexed by byte value (values
+        below `offset` are invalid and map to 1.0)
+    """
+    scores = np.arange(256, dtype=np.float64) - offset
+    table = np.where(scores < 0, 1.0, 10 ** (-scores.clip(min=0) / 10))
+    table.setflags(write=False)
+    return table
+
+
+def _qual_bytes(quals):
+    """Zero-copy uint8 view of a quality string / bytes / array."""
+    if isinstance(quals, str):
+        quals = quals.encode("ascii")
+    if isinstance(quals, (bytes, bytearray, memoryview)):
+        return np.frombuffer(quals, dtype=np.uint8)
+    return np.asarray(quals, dtype=np.uint8)
+
+
+def quals_to_probs(quals, offset=33):
+    """Batch Phred-to-probability conversion: a whole quality string (or
+    byte buffer / uint8 array) in one table lookup.
+
+    Args:
+        quals (str, bytes, or np.ndarray): encoded qualities
+        offset (int, optional): see `phred_table`
+
+    Returns:
+        np.ndarray: float64 error probability of every base
+    """
+    return phred_table(offset)[_qual_bytes(quals)]
+
+
+def read_error_stats(packed):
+    """Per-read expected errors & mean error probability of a whole batch.
+
+    Args:
+        packed (PackedReads)
+
+    Returns:
+        pd.DataFrame: columns 'length', 'expected_errors', 'mean_error'
+        (one row per read)
+    """
+    probs = phred_table(0)[packed.qual]
+    lengths = packed.lengths
+    ee = np.bincount(packed.read_ids, weights=probs, minlength=len(packed))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_error = ee / lengths
+    return pd.DataFrame(
+        {"length": lengths, "expected_errors": ee, "mean_error": mean_error},
+        index=packed.index,
+    )
+
+
 def q2p(phred_Sanger_Quality_score):
     """Quality [score] to probability (q2p)
-    converter.
+    converter. (See `quals_to_probs` for whole reads at once.)
     
     Args:
         phred_Sanger_Quality_score (str): Input Q-Score as single-character string
@@ -187,37 +422,179 @@ def q2p(phred_Sanger_Quality_score):
     Returns:
         int: Output Q-Score as multi-character decimal probability.
     """
-    Q = ord(phred_Sanger_Quality_score) - 33
-    return round(10 ** (-Q / 10), 8)
+    return round(float(quals_to_probs(phred_Sanger_Quality_score)[0]), 8)
 
 
-def read_fasta(fa_contents, fa_out=None):
-    """Parse input FASTA data.
-    
+def read_fastq(decoded):
+    """Per-read quality summary of FASTQ data (e.g., an upload): reads are
+    packed (`PackedReads`) straight from their quality strings, then
+    summarized by table lookup (`read_error_stats`).
+
     Args:
-        fa_contents (TYPE): [...]
-        fa_out (str, optional): [.fasta] output file path
-    
+        decoded (bytes or str): FASTQ contents (Sanger / Illumina 1.8+ encoding)
+
     Returns:
-        pd.DataFrame: Columnar tabulated FASTA data
+        pd.DataFrame: columns 'id', 'seq', 'length', 'expected_errors',
+        'mean_error' (one row per read)
     """
-    fa_records = [*SeqIO.parse(fa_contents, "fasta")]
-    app.logger.info(fa_records)
-    reads = pd.concat(
-        [
-            pd.DataFrame(
-                {x: str(getattr(seqr, x)) for x in ["id", "name", "seq", "[...]"]},
-                index=[n],
+    from seqapp.config import FastqGeneralIterator
+
+    if isinstance(decoded, bytes):
+        decoded = decoded.decode("ascii")
+    titles, seqs, quals = [], [], []
+    for title, seq, qual in FastqGeneralIterator(io.StringIO(decoded)):
+        titles.append(title.split(None, 1)[0] if title else "")
+        seqs.append(seq)
+        quals.append(qual)
+    packed = PackedReads.from_reads(seqs, quals, index=titles)
+    stats = read_error_stats(packed)
+    stats.insert(0, "seq", seqs)
+    return stats.rename_axis("id").reset_index()
+
+
+def iter_fasta(fa_contents):
+    """Stream records from FASTA data, one at a time, without building
+    `SeqRecord` objects.
+
+    Args:
+        fa_contents (str or file-like): path to, or open handle of
+            (text or binary), FASTA data
+
+    Yields:
+        tuple: (id, description, sequence) - where the description is the
+        full header line (sans '>') and id its first word
+    """
+    if isinstance(fa_contents, (str, os.PathLike)):
+        with open(fa_contents) as handle:
+            yield from iter_fasta(handle)
+        return
+    header, seq_lines = None, []
+    for line in fa_contents:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if line.startswith(">"):
+            if header is not None:
+                yield header.split(None, 1)[0] if header else "", header, "".join(seq_lines)
+            header, seq_lines = line[1:].strip(), []
+        elif header is not None:
+            seq_lines.append(line.strip())
+    if header is not None:
+        yield header.split(None, 1)[0] if header else "", header, "".join(seq_lines)
+
+
+FASTA_COLUMNS = ["id", "name", "description", "length", "seq"]
+
+
+def _fasta_batches(fa_contents, fa_out=None, batch_size=10000):
+    """Columnar batches of FASTA records (dicts of `FASTA_COLUMNS` lists),
+    writing the optional FASTA & `.DataFrame.tsv` outputs incrementally."""
+    with contextlib.ExitStack() as outputs:
+        if fa_out:
+            app.logger.info(f"Writing FASTA output for file: {fa_out}")
+            fa_writer = outputs.enter_context(open(fa_out, "w"))
+            tsv_writer = csv.writer(
+                outputs.enter_context(open(fa_out + ".DataFrame.tsv", "w", newline="")),
+                delimiter="\t",
             )
-            for n, seqr in enumerate(fa_records)
-        ]
-    )
-    reads.set_index("id", inplace=True)
+            tsv_writer.writerow(FASTA_COLUMNS)
+        batch = {c: [] for c in FASTA_COLUMNS}
+        for seq_id, description, seq in iter_fasta(fa_contents):
+            row = (seq_id, seq_id, description, len(seq), seq)
+            for column, value in zip(FASTA_COLUMNS, row):
+                batch[column].append(value)
+            if fa_out:
+                fa_writer.write(f">{description}\n")
+                fa_writer.writelines(f"{seq[i:i + 60]}\n" for i in range(0, len(seq), 60))
+                tsv_writer.writerow(row)
+            if len(batch["id"]) >= batch_size:
+                yield batch
+                batch = {c: [] for c in FASTA_COLUMNS}
+        if batch["id"]:
+            yield batch
     if fa_out:
-        app.logger.info(f"Writing FASTA output for file: {fa_out}")
-        SeqIO.write(fa_records, fa_out, "fasta")
-        reads.to_csv(fa_out + ".DataFrame.tsv", sep="\t")
-    return reads
+        register_output(fa_out)
+        register_output(fa_out + ".DataFrame.tsv")
+
+
+def _fasta_frame(batch):
+    reads = pd.DataFrame(batch, columns=FASTA_COLUMNS)
+    reads["length"] = reads["length"].astype(np.int64)
+    return reads.set_index("id")
+
+
+def read_fasta(fa_contents, fa_out=None, chunksize=None):
+    """Parse input FASTA data (streamed; see `iter_fasta`).
+
+    Args:
+        fa_contents (str or file-like): FASTA data (path or handle)
+        fa_out (str, optional): [.fasta] output file path; also writes a
+            tabulated copy to `fa_out + ".DataFrame.tsv"` (both written
+            incrementally, as records are read)
+        chunksize (int, optional): if given, return a generator of
+            DataFrames of at most this many records each (as with
+            `pd.read_csv`), keeping memory bounded for any file size
+
+    Returns:
+        pd.DataFrame: Columnar tabulated FASTA data, indexed by 'id'
+        (or a generator thereof, if `chunksize` is given)
+    """
+    if chunksize:
+        return (_fasta_frame(b) for b in _fasta_batches(fa_contents, fa_out, chunksize))
+    columns = {c: [] for c in FASTA_COLUMNS}
+    for batch in _fasta_batches(fa_contents, fa_out):
+        for column in FASTA_COLUMNS:
+            columns[column].extend(batch[column])
+    app.logger.info(f"Read {len(columns['id'])} FASTA records")
+    return _fasta_frame(columns)
+
+
+def read_upload(decoded, filename, f_wout, content_string=None):
+    """Read raw (decoded) upload bytes into a DataFrame according to file type.
+
+    Args:
+        decoded (bytes): raw file contents
+        filename (str): file name of the uploaded input
+        f_wout (str): file path of current session to write decoded sequence data
+        content_string (str, optional): base64 encoding of `decoded`, if at hand
+
+    Returns:
+        pd.DataFrame: parsed contents (None for unsupported file types)
+
+    Raises:
+        ValueError: if an ABI file yields no reads
+    """
+    df = None
+    ## READ IN : AB1 - SANGER
+    # Chromatogram Sanger reads files
+    if filename.endswith("ab1"):
+        abi_decoded = io.BytesIO(decoded)
+        df = abi2fastq(
+            input_abi=filename,
+            abi_contents=abi_decoded,
+            f_wout=f_wout,
+            abi_encoded=content_string or base64.b64encode(decoded).decode(),
+        )
+        if df.shape[0] < 1:
+            raise ValueError(f"No reads could be decoded from {filename}")
+    ## READ IN : FASTA - (ASSUME TCRα/β ligations)
+    # TCR-alpha/beta allele-specific chain pairs sequences
+    # i.e., Assume this is the refernce file already given by user.
+    elif filename.endswith(tuple([".fa", ".fasta", ".FASTA"])):
+        df, ref = parse_input_ref_fasta(
+            input_fa=filename, fa_contents=io.StringIO(decoded.decode("utf-8"))
+        )
+    ## READ IN : FASTQ - (ASSUME TCRα/β ligations)
+    # TCR-alpha/beta allele-specific chain pairs sequences
+    elif filename.endswith(tuple([".fq", ".fastq", ".FASTQ"])):
+        df = read_fastq(decoded)
+    ## READ IN : ARBITRARY DATA TABLES
+    elif "csv" in filename:  # or "tsv" in filename:
+        # Assume that the user uploaded a CSV file
+        df = pd.read_csv(io.StringIO(decoded.decode("utf-8")))
+    elif "xls" in filename:
+        # Assume that the user uploaded an Excel file
+        df = pd.read_excel(io.BytesIO(decoded))
+    return df
 
 
 def run_pipeline(
@@ -253,6 +630,85 @@ def run_pipeline(
     return pipeline_stream
 
 
+def parse_session_uploads(RUN_ID, FINAL_OUTPUT_DIR, prefix_key="", session_log_file="", **kwargs):
+    """First step of a pipeline job (see `submit_pipeline`): parses every
+    upload of the session (writing the per-sample inputs; cached, see
+    `PARSE_CACHE`), then detects the samples to run.
+
+    Args:
+        RUN_ID (str): Current RUN ID
+        FINAL_OUTPUT_DIR (str): local path to current session output directory
+        prefix_key (str, optional): prefix of the sample directories to run
+        session_log_file (str, optional): path to current session log file
+        **kwargs: (the job's other arguments; unused)
+
+    Returns:
+        list: names of the detected samples (directories)
+    """
+    for handle in uploads.list_uploads(RUN_ID):
+        parse_upload(RUN_ID, handle, FINAL_OUTPUT_DIR, session_log_file=session_log_file)
+    detected = [
+        *filter(
+            lambda dir: dir.startswith(prefix_key) and not dir.startswith("."),
+            os.listdir(FINAL_OUTPUT_DIR),
+        )
+    ]
+    app.logger.info(f"Samples detected: \n {detected}")
+    return detected
+
+
+def submit_pipeline(
+    RUN_ID, FINAL_OUTPUT_DIR, prefix_key="", exp="", well="", workflow="", session_log_file=""
+):
+    """Non-blocking counterpart of `run_pipeline`: queues a job on the
+    long-lived background worker pool (see `seqapp.jobs`) which parses
+    the session's uploads (`parse_session_uploads`), then runs each
+    detected sample; returns straight away.
+
+    Args:
+        RUN_ID (str): Current RUN ID (e.g., SEQAPP_RUNID_20191103224547407862)
+        FINAL_OUTPUT_DIR (str): local path to current session output directory
+        exp (str, optional): Experiment ID
+        well (str, optional): Plate Well ID
+        workflow (str, optional): upstream process team
+        session_log_file (str, optional): path to current session log file
+
+    Returns:
+        str: Job ID; poll with `jobs.job_status(FINAL_OUTPUT_DIR, job_id)`.
+    """
+    return jobs.submit(
+        FINAL_OUTPUT_DIR,
+        run_sequence_alignment_with_sangerseqqc,
+        partial(parse_session_uploads, prefix_key=prefix_key),
+        RUN_ID=RUN_ID,
+        FINAL_OUTPUT_DIR=FINAL_OUTPUT_DIR,
+        exp=exp,
+        well=well,
+        workflow=workflow,
+        session_log_file=session_log_file,
+    )
+
+
+def iter_wrapped_seq(seq, wrap=125):
+    """Lazily wrap a genetic sequence string into `wrap`-wide lines, each
+    paired with its position ruler (a "0000:....:....:....:....|" tick
+    every 25 characters), in linear time.
+
+    Args:
+        seq (str): DNA/RNA/AA sequence to display
+        wrap (int, optional): set displayed sequence line length
+
+    Yields:
+        tuple: (wrapped seq text, seq index ruler) per line
+    """
+    for offset in range(0, len(seq), wrap):
+        line = seq[offset : offset + wrap]
+        ruler = "".join(
+            f"000{x_i}"[-4:] + ":...." * 4 + "|" for x_i in range(offset, offset + len(line), 25)
+        )
+        yield line, ruler[: len(line)]
+
+
 def wrap_seq_nucleic(seq, wrap=125):
     """Wraps input genetic sequence strings and returns
     tuple of 'wrap'-limited width with tuple zipped numeric
@@ -264,20 +720,7 @@ def wrap_seq_nucleic(seq, wrap=125):
         wrap (int, optional): set displayed sequence line length
 
     Returns:
-        zipped tuple: of paired (wrapped seq text, seq index) values per line
+        iterator: of paired (wrapped seq text, seq index) values per line
+            (see `iter_wrapped_seq`)
     """
-    seq_lines = [seq[x_i : x_i + wrap] for x_i in range(0, len(seq), wrap)]
-    seq_indeces = [
-        (
-            "".join(
-                [
-                    f"000{str(x_i)}"[-4:] + ":...." * 4 + "|"
-                    for x_i in range(
-                        len(ljoin(seq_lines[: n - 1])), len(ljoin(seq_lines[:n])), 25
-                    )
-                ]
-            )
-        )[: len(seq_lines[n - 1])]
-        for n in range(1, len(seq_lines) + 1)
-    ]
-    return zip(seqlines, seq_indeces)
+    return iter_wrapped_seq(seq, wrap=wrap)
@@ -40,6 +40,7 @@ import sys
 
 sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 
+
 from flask import Flask
 from werkzeug.routing import Rule
 
@@ -47,20 +48,25 @@ from .config import *
 
 from .utils import *
 from seqapp import app
-
-import config
-from config import *
-
-import bioinfo as bioinformatics
-from bioinfo import pipeline, visualization
-from bioinfo.pipeline import (
-    parse_contents,
-)
+from seqapp import archive
+from seqapp import downloads
+from seqapp import jobs
+from seqapp import logtail
+from seqapp import session_store
+from seqapp import sessionlog
+from seqapp import static_assets
+from seqapp import uploads
+
+from seqapp.bioinfo import pipeline, visualization
+from seqapp.bioinfo.pipeline import forget_parsed
+from seqapp.bioinfo.pipeline import parse_upload
 
 version = VERSION
 
 logger = logging.getLogger(__name__)
 
+sessionlog.install(app.logger, app.server)
+
 
 ########################################
 #  S T A N D A R D  F U N C T I O N S  #
@@ -79,26 +85,86 @@ logger = logging.getLogger(__name__)
     functionalities are compatible as-is with Dash apps.
 """
 
-app.server.url_map.add(Rule('/', endpoint='downloadZAll'))
-app.server.url_map.add(Rule('/', endpoint='urlToDownload'))
+@app.server.before_request
+def log_large_callback_requests():
+    """Flag callback requests posting more than `CALLBACK_REQUEST_WARN_BYTES`
+    (e.g., upload contents round-tripping through a callback's inputs)."""
+    request = flask.request
+    size = request.content_length or 0
+    if size > CALLBACK_REQUEST_WARN_BYTES and request.path.endswith("_dash-update-component"):
+        output = (request.get_json(silent=True) or {}).get("output")
+        app.logger.warning(f"Large callback request: {size:,d} bytes, for output {output}")
+
+
+app.server.url_map.add(Rule('/downloadZAll', endpoint='/downloadZAll'))
+app.server.url_map.add(Rule('/urlToDownload', endpoint='/urlToDownload'))
 
 @app.server.endpoint("/downloadZAll")
 def download_all_selected():
     """Send path from directory to allow user to
     download zipped files as an attachment.
 
+    With `run_id` & `genre` query params (instead of `value`), the zip of
+    all of the session's output files of that genre is instead built on
+    the fly and streamed as it is read (see `seqapp.archive`) - or, if
+    none of those files changed since it was last built, sent from the
+    session's zip cache.
+
     Returns:
         File download directly to user's PC.
     """
-    value = flask.request.args.get("value")
-    fbn = f"{os.path.basename(value)}"
+    if "genre" in flask.request.args:
+        return stream_all_selected()
+    value = flask.request.args.get("value", "")
     app.logger.info(f"🗽| REQUEST TO DOWNLOAD: for [zipped] server file @ {value}")
-    return flask.send_from_directory(
-        directory=f"{os.path.dirname(value)}",
-        filename=fbn,
-        attachment_filename=fbn,
-        as_attachment=True,
-        mimetype="zip",
+    return send_authorized_download(value, mimetype="application/zip")
+
+
+def send_authorized_download(value, download_name=None, mimetype=None, allow_hidden=False):
+    """Send a file (see `seqapp.downloads`), or a 403 / 404 status."""
+    try:
+        return downloads.send_download(
+            value, download_name=download_name, mimetype=mimetype, allow_hidden=allow_hidden
+        )
+    except PermissionError as e:
+        app.logger.warning(f"{e}")
+        flask.abort(403)
+    except FileNotFoundError:
+        flask.abort(404)
+
+
+def stream_all_selected():
+    """Stream a zip of all of a session's output files of one genre.
+
+    Query params: `run_id`, `genre` (a key of `output_filetype_genres`).
+
+    Returns:
+        Streamed zip attachment; status 400 for a bad run ID or genre.
+    """
+    args = flask.request.args
+    try:
+        RUN_ID, genre = args["run_id"], args["genre"]
+        selection = output_filetype_genres[genre]
+        source = session_output_dir(RUN_ID) if genre != "REF" else PLASMIDS_ARCHIVE
+    except (KeyError, ValueError) as e:
+        return flask.jsonify({"error": f"Invalid download request: {e}"}), 400
+    files = sorted(get_output_files(selection, final_output_dir=source))
+    zipped = re.sub("['\ \(\)]", "", f"{RUN_ID}_{genre}_{clock()[-4:]}.zip")
+    session_dir = session_output_dir(RUN_ID)
+    key = archive.manifest_key(files, genre)
+    cached = archive.cached_zip(session_dir, key)
+    if cached:
+        app.logger.info(f"🗽| REQUEST TO DOWNLOAD: cached {genre} zip {cached} as {zipped}")
+        return send_authorized_download(
+            cached, download_name=zipped, mimetype="application/zip", allow_hidden=True
+        )
+    app.logger.info(f"🗽| REQUEST TO DOWNLOAD: streaming {len(files)} {genre} files as {zipped}")
+    return flask.Response(
+        flask.stream_with_context(
+            archive.stream_zip_cached(files, session_dir, key, root=source, genre=genre)
+        ),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={zipped}"},
     )
 
 
@@ -108,18 +174,69 @@ def download_file():
        to download file as an attachment.
 
     Returns:
+        File download (offloaded to nginx, if `DOWNLOADS_X_ACCEL`);
+        supports If-None-Match & Range requests.
     """
-    value = flask.request.args.get("value")
-    fbn = f"{os.path.basename(value)}"
+    value = flask.request.args.get("value", "")
     app.logger.info(f"🗽| REQUEST TO DOWNLOAD: for server file @ {value}")
     mime = "text/plain" if "png" not in value else "image/png"
-    return flask.send_from_directory(
-        directory=f"{os.path.dirname(value)}",
-        filename=fbn,
-        attachment_filename=fbn,
-        as_attachment=True,
-        mimetype=mime,
-    )
+    return send_authorized_download(value, mimetype=mime)
+
+
+app.server.url_map.add(Rule(f'{STATIC_ASSETS_URL}<path:name>', endpoint=STATIC_ASSETS_URL))
+
+@app.server.endpoint(STATIC_ASSETS_URL)
+def serve_static_asset(name):
+    """Fingerprinted app assets (see `seqapp.static_assets`); behind
+    nginx, these are served by nginx itself."""
+    return static_assets.send_asset(name)
+
+
+app.server.url_map.add(Rule('/uploadChunk', endpoint='/uploadChunk', methods=["GET", "POST"]))
+
+@app.server.endpoint("/uploadChunk")
+def upload_chunk():
+    """Resumable, chunked file upload straight into the session output
+    directory (see `seqapp.uploads` & `assets/chunked-upload.js`).
+
+    GET returns the byte offset from which to (re)start sending a file;
+    POST appends the raw request body (one chunk) at `offset`.
+
+    Query params: `run_id`, `filename`, and for POST also `offset`,
+    `total` & (optionally) `last_modified`.
+
+    Returns:
+        JSON {"filename", "offset", "complete"[, "chunk_size"]}; status
+        409 (with the expected offset) if a chunk arrives out of order.
+    """
+    args = flask.request.args
+    try:
+        if flask.request.method == "GET":
+            status = uploads.upload_offset(args["run_id"], args["filename"])
+            status["chunk_size"] = UPLOAD_CHUNK_SIZE
+            return flask.jsonify(status)
+        return flask.jsonify(
+            uploads.write_chunk(
+                args["run_id"],
+                args["filename"],
+                offset=int(args["offset"]),
+                total=int(args["total"]),
+                stream=flask.request.stream,
+                last_modified=args.get("last_modified", type=int),
+            )
+        )
+    except KeyError as e:
+        return flask.jsonify({"error": f"Missing parameter: {e}"}), 400
+    except ValueError as e:
+        app.logger.warning(f"Chunked upload rejected: {e}")
+        status = {"error": f"{e}"}
+        if "run_id" in args and "filename" in args:
+            try:
+                status.update(uploads.upload_offset(args["run_id"], args["filename"]))
+                return flask.jsonify(status), 409
+            except ValueError:
+                pass
+        return flask.jsonify(status), 400
 
 
 ########################################
@@ -313,19 +430,22 @@ def log_out_or_comeback(
     signon : int
         Total cumulative count of clicks user sign-in button
     user_profile : Dash.dcc.Store(type='local')
-        Browser-cached local app memory, containing stored saved
-        user "profile" info / stats.
+        Browser-cached local app memory, holding the token of the
+        user's server-side "profile" (see `seqapp.session_store`).
     """
     if not user_profile:
         raise PreventUpdate
     if logout < 1 and quick_logback < 1:
         raise PreventUpdate
     if quick_logback > 0:
+        profile = session_store.profile(user_profile.get("token"))
+        if profile is None:
+            raise PreventUpdate
         if signon > 0 and logout > 0:
             if logback_on_timestamp > max(log_out_timestamp, sign_on_timestamp):
-                return user_profile["userAccount"]
+                return profile["account"]
         elif signon < 1:
-            return user_profile["userAccount"]
+            return profile["account"]
     elif logout > 0 and signon > 0:
         if log_out_timestamp > sign_on_timestamp:
             return "None"
@@ -384,7 +504,8 @@ def record_user_name(
         data (Dash.dcc.Store):
             [Session] HTTP client-side memory cache
         local_cache (Dash.dcc.Store):
-            [Local] HTTP client-side memory cache
+            [Local] HTTP client-side memory cache (only holding the
+            user's profile token; see `seqapp.session_store`)
         init_pl_n_clicks (int):
             Total cumulative count of clicks initiate step 2 pipeline button
         initiate_pipeline_timestamp (int):
@@ -456,41 +577,23 @@ def record_user_name(
 
     session_log_file = f"{SESSION_OUTPUT_DIR}{RUN_ID}_CurrentSession.log"
     os.makedirs(SESSION_OUTPUT_DIR, exist_ok=True)
-    app.logger.debug(f"Number of logger handlers: {logger.handlers}")
-    fh = add_logfile(logfile=session_log_file, logger=logger)
-    app.logger.addHandler(fh)
-    app.logger.debug(f"Number of logger handlers: {logger.handlers}")
+    sessionlog.bind(session_log_file)
 
     app.logger.info(f"USER SIGN ON @ {login_t_init}")
     app.logger.info(f"*** CURRENT APP APP SOFTWARE VERSION = {VERSION} ***")
     data["session_log_file"] = session_log_file
-    data["SESSION_DATA"] = pd.DataFrame(
-        [[RUN_ID, SESSION_OUTPUT_DIR, user_selection, session_log_file]],
-        columns=["RUN_ID", "PATH_TO_SESSION_OUTPUT", "USER_ID", "LOG_FILE"],
-    ).to_json(date_format="iso", orient="split")
     app.logger.info(f"USER: '{user_selection}' | RUN ID: {RUN_ID}")
 
-    # Store basic user profile in browser local cache for  app:
-    reset_local_cache = {
-        "userName": user_proper,
-        "userAccount": user_selection,
-        "userProfileCreated": now(),
-        "countUserLogIns": 0,
-        "userRuns": {RUN_ID: data},
-    }
-    try:
-        if local_cache["userAccount"] != user_selection:
-            local_cache = reset_local_cache
-        local_cache["countUserLogIns"] += 1
-        local_cache["userRuns"][RUN_ID] = data
-    except Exception as e:
+    # Store the user profile & this run server-side; the browser's local
+    # cache keeps only the (opaque) profile token:
+    token = (local_cache or {}).get("token")
+    new_token = session_store.record_sign_on(token, user_selection, user_proper, RUN_ID, data)
+    if new_token != token:
         app.logger.info(
-            f"Creating {user_proper}'s first local memory cache! (I.e., by which to remember them by! 😉)"
+            f"Creating {user_proper}'s first profile! (I.e., by which to remember them by! 😉)"
         )
-        local_cache = reset_local_cache
-        local_cache["countUserLogIns"] += 1
 
-    return data, local_cache
+    return data, {"token": new_token}
 
 
 @app.callback(
@@ -517,7 +620,7 @@ def show_user_in_menubar(
     selected_username
         str
     local_data_cache
-        Dash.dcc.Store(type='local')
+        Dash.dcc.Store(type='local') (profile token)
     """
     log_in = [
         html.Span(
@@ -533,12 +636,12 @@ def show_user_in_menubar(
                 USER = session_data["current_user"]
 
                 default = []
-                history = {}
-                try:
-                    history = local_data_cache[f"{USER}_APP_Saved_History"]
-                    app.logger.debug(str(local_data_cache), str(history))
-                except Exception as e:
-                    history = {}
+                history = {
+                    run["run_id"]: run
+                    for run in session_store.recent_runs((local_data_cache or {}).get("token"))
+                    if run["run_id"] != session_data["RUN_ID"]
+                }
+                if not history:
                     default = [html.Li(f"You have no saved APP Results History, yet!\n")]
                 return [
                     html.Details(
@@ -615,19 +718,11 @@ def show_user_in_menubar(
     return log_in
 
 
-@app.callback(Output(f"workflow-selection", "children"), [Input(f"workflow-id", "value")])
-def update_workflow_choice(workflow):
-    """Update display at top of app based on USER's Worlflow selection
-    (e.g., "Gene Editing: [...]", etc.)
-    
-    Args:
-        workflow: str
-    
-    Returns:
-        Array of H2 HTML Header element containing workflow text.
-    """
-    app.logger.debug(f"CALLBACK:::`update_workflow_choice` triggered with value: {workflow}")
-    return [html.H2(f"{workflow}", style={"textAlign": "center"})]
+app.clientside_callback(
+    ClientsideFunction("ui", "update_workflow_choice"),
+    Output("workflow-selection", "children"),
+    [Input("workflow-id", "value")],
+)
 
 
 @app.callback(Output("dd2-dropdown", "options"), [Input("dd1-dropdown", "value")])
@@ -644,7 +739,7 @@ def update_dropdown(dd1):
     if dd1 and dd1 != "None":
         ent_id, ent_name, = dd1.split("-")
         try:
-            wells = entity_schemas.loc[ent_name].columns #.unique()
+            wells = get_entity_schemas().loc[ent_name].columns #.unique()
         except KeyError as e:
             app.logger.info(f"WellID dropdown error in Plasmid Tool:\n{e}")
             return [{"label": "——N/A——", "value": "Error"}]
@@ -657,53 +752,16 @@ def update_dropdown(dd1):
         return [{"label": "——N/A——", "value": "None"}]
 
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction("ui", "trigger_dropdowns"),
     Output("submission-status", "children"),
     [Input("submit-selected-dds", "n_clicks"), Input("clear-dd-selections", "n_clicks")],
     [State("dd1-dropdown", "value"), State("dd2-dropdown", "value")],
 )
-def trigger_dropdowns(submit_n_clicks, clear_n_clicks, dd1, dd2):
-    """Initiate first analysis
 
-    Args:
-        submit_n_clicks: int
-        clear_n_clicks: int
-        dd1: str
-        dd2: str
 
-    Returns:
-        Dash html component(s)
-    """
-    if clear_n_clicks == submit_n_clicks + 1:
-        return html.Code(
-            "⚠ | ℹ Overclicking clear *may* require compensatory submits! (I.e., Try clicking submit button >1 times, if submissions are not going through.)",
-            style={
-                "color": "red",
-                "display": "flex",
-                "flexFlow": "column wrap",
-                "fontSize": "1.0rem",
-                "margin": "0px 30% 20px 30%",
-            },
-        )
-    if all(ui not in ("None", None) for ui in [dd1, dd2]):
-        app.logger.info(
-            f"-:!:- FUNCTION('trigger_dropdowns') has been activated, and now has value 'submit_n_clicks' = {submit_n_clicks}"
-        )
-        return [html.Code(f"SUBMISSION for: {dd1}, @Well{dd2}")]
-    elif clear_n_clicks > submit_n_clicks + 1:
-        app.logger.info(
-            f"-:!:- FUNCTION('trigger_dropdowns') has been cleared, and now has value 'clear_n_clicks' = {clear_n_clicks}"
-        )
-        return html.Code(
-            f"Submissions cleared: {clear_n_clicks}, [submissions_count={submit_n_clicks}].",
-            style={"fontStyle": "normal", "color": "gray", "margin": "0px 30% 20px 30%"},
-        )
-    else:
-        return html.Code("No submissions received, it seems...")
-
-
-
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction("ui", "display_generated_dd_output"),
     Output("dd-selections", "children"),
     [
         Input("dd1-dropdown", "value"),
@@ -712,259 +770,65 @@ def trigger_dropdowns(submit_n_clicks, clear_n_clicks, dd1, dd2):
         Input("clear-dd-selections", "n_clicks"),
         Input("workflow-id", "value"),
     ],
-    [State("session", "data"), State("submit-selected-dds", "n_clicks_timestamp")],
+    [
+        State("session", "data"),
+        State("submit-selected-dds", "n_clicks_timestamp"),
+        State("asset-urls", "data"),
+    ],
 )
-def display_generated_dd_output(
-    dd1,
-    dd2,
-    submission,
-    clear_submission,
-    workflow,
-    session_data,
-    submission_timestamp,
-):
-    """Generic template for a paired dynamics set of dropdowns;
-    such that the user selection in the first dropdown dynamically
-    modifies live the possible options in the second dropdown.
-
-    Args:
-        dd1: str
-        dd2: str
-        submission: int
-        clear_submission: int
-        workflow: str
-        session_data: Dash.dcc.Store(type='session')
-        submission_timestamp: int
-    """
-
-    if (dd1 == "None" and dd2 == "None") or dd1 is None:
-        return [
-            html.Div(
-                [
-                    html.Span(
-                        f"Make a new selection.",
-                        style={"textAlign": "center", "fontFamily": "Muli", "fontSize": "1.5rem"},
-                    ),
-                    html.Span(
-                        html.Img(
-                            src="../assets/animations/dna-minimal-green.gif",
-                            height="150",
-                            style={
-                                "transform": "translateY(-55px) translateX(5px)",
-                                "filter": "hue-rotate(100deg) contrast(1.1) saturate(5)",
-                                "position": "absolute",
-                                "opacity": "0.5",
-                                "borderRadius": "250px",
-                            },
-                        )
-                    ),
-                ],
-                style={
-                    "marginLeft": "25%",
-                    "position": "relative",
-                    "textAlign": "center",
-                    "width": "50%",
-                    "zIndex": "-1",
-                },
-            ),
-            html.Div(
-                [
-                    html.Span("↪⦿"),
-                    html.Img(
-                        src="../assets/images/scope-unic.png",
-                        width="80",
-                        style={"marginTop": "15px", "marginBottom": "-25px", "cursor": "pointer"},
-                    ),
-                    html.Span("⥅♅"),
-                ],
-                style={
-                    "textAlign": "center",
-                    "fontSize": "1.75rem",
-                    "animation": "animateGlow 45s infinite linear!important",
-                    "cursor": "pointer",
-                },
-            ),
-        ]
-    elif any(ui == "Error" for ui in [dd1, dd2]):
-        return
-    elif dd1 != "None" and dd2 is None:
-        return [
-            html.H5(
-                f"ℹ | Informational message to display.",
-                style={"textAlign": "center", "marginLeft": "25%", "width": "50%"},
-            )
-        ]
-    elif all(ui != "None" for ui in [dd1, dd2]):
 
-        return html.Div(
-            [
-                html.Code(
-                    f"♻ Cleared submission state: [total_clears={clear_submission}]",
-                    style={"fontStyle": "italic", "fontSize": "0.9rem", "marginBottom": "5px"},
-                ),
-                html.Br(),
-                html.Div(
-                    [
-                        html.H6(
-                            [
-                                html.P(f"⮊ Click ⬫Submit⬫ 𝑓𝗈𝓇⤑{dd2} ~ {dd1}"),
-                                html.Span("to initiate "),
-                                html.Span(
-                                    f"in silico ",
-                                    style={"fontStyle": "italic", "fontFamily": "'Times', serif"},
-                                ),
-                                html.Span("analysis of selections."),
-                            ],
-                            style={
-                                "textAlign": "center",
-                                "cursor": "pointer",
-                                "color": "#ffffff6e",
-                                "backgroundImage": "url(https://media.giphy.com/media/4HIOPSXOitJ2o/giphy.gif)",
-                                "mozBackgroundClip": "text",
-                                "webkitBackgroundClip": "text",
-                                "fontWeight": "700",
-                                "backgroundSize": "60%",
-                            },
-                        )
-                    ],
-                    style={
-                        "position": "absolute",
-                        "margin": """0.5% -5% -5% -5%""",
-                        "textAlign": "center",
-                        "display": "inline-block",
-                        "mixBlendMode": "lighten",
-                        "width": "200px",
-                    },
-                ),
-                html.Br(),
-                html.Br(),
-                html.Div(
-                    [
-                        html.Span("✂"),
-                        html.Span("۝"),
-                        html.Span("⭾"),
-                        html.Span("α/β"),
-                        html.Div(
-                            [
-                                html.Video(
-                                    src=f"data:video/mp4;base64,{base64.b64encode(open(f'../assets/animations/T-Cell_TEM_4-3.mp4', 'rb').read()).decode()}",
-                                    id="t-cell",
-                                    autoPlay=True,
-                                    loop=True,
-                                    controls=False,
-                                    preload="true",
-                                    muted=True,
-                                )
-                            ],
-                            style={"filter": "opacity(0.25)"},
-                        ),
-                    ],
-                    style={
-                        "textAlign": "center",
-                        "fontSize": "2rem",
-                        "width": "20%",
-                        "marginLeft": "40.5%",
-                        "mixBlendMode": "exclusion",
-                    },
-                    className="animate twirl",
-                ),
-            ],
-            style={"textAlign": "center"},
-        )
 
-
-@app.callback(Output("dd1-dropdown", "value"), [Input("clear-dd-selections", "n_clicks")])
-def clear_dd1_selection(n_clicks):
-    """Clear Dropdown selections for Dropdown #1 (dd1)
-
-    ( Dropdown to clear #1 of 2 )
-
-    Args:
-        n_clicks: int
-
-    Returns:
-        str: Resets selections to default, blank states.
-    """
-    if n_clicks > 0:
-        app.logger.info(
-            f"-:!:- FUNCTION('clear_dd1_selection') has been activated, and now has value 'n_clicks' = {n_clicks}"
-        )
-        return "None"
+app.clientside_callback(
+    ClientsideFunction("ui", "clear_dd1_selection"),
+    Output("dd1-dropdown", "value"),
+    [Input("clear-dd-selections", "n_clicks")],
+)
 
 
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction("ui", "clear_dd2_selection"),
     Output("dd2-dropdown", "value"),
     [Input("dd1-dropdown", "value"), Input("clear-dd-selections", "n_clicks")],
 )
-def clear_dd2_selection(val, n_clicks):
-    """Clear Dropdown selections for Dropdown #2 (dd2)
 
-    ( Dropdown to clear #2 of 2 )
 
-    Args:
-        val (str): cascading response via `clear_dd2_selection()` callback
-        n_clicks: int
-
-    Returns:
-        str: Resets selections to default, blank states.
-    """
-    if n_clicks > 0:
-        app.logger.info(
-            f"-:!:- FUNCTION('clear_dd2_selection') has been activated, and now has value 'n_clicks' = {n_clicks} & 'val' = {val}"
-        )
-        if val == "None":
-            return "None"
-        else:
-            return None
+# Files dropped on `dcc.Upload` are sent on through `/uploadChunk` by
+# assets/chunked-upload.js, which then clears their contents from the
+# browser: no server-side callback ever takes `upload-data.contents`.
+app.clientside_callback(
+    ClientsideFunction("uploads", "store_uploads"),
+    Output("upload-data", "contents"),
+    [Input("upload-data", "contents")],
+    [State("upload-data", "filename"), State("upload-data", "last_modified")],
+)
 
 
 @app.callback(
     Output("memory", "data"),
-    [
-        Input("append-uploads", "n_clicks"),
-        Input("clear-uploads", "n_clicks"),
-        Input("refresh-uploads", "n_clicks"),
-        Input("upload-data", "contents"),
-    ],
+    [Input("append-uploads", "n_clicks"), Input("clear-uploads", "n_clicks")],
     [
         State("session", "data"),
         State("memory", "data"),
-        State("append-uploads", "n_clicks_timestamp"),
-        State("refresh-uploads", "n_clicks_timestamp"),
         State("clear-uploads", "n_clicks_timestamp"),
-        State("upload-data", "filename"),
-        State("upload-data", "last_modified"),
     ],
 )
 def enable_combined_file_uploads(
     append_nclicks,
     clear_nclicks,
-    refresh_nclicks,
-    list_of_contents,
     session_data,
     clientside_memory_cache,
-    append_nclicks_timestamp,
-    refresh_nclicks_timestamp,
     clear_nclicks_timestamp,
-    list_of_names,
-    list_of_dates,
 ):
     """Management of app components and file upload States allowing for USER-
     toggled continuation of upload (i.e., as opposed to overwriting any previously
     received ABI files uploaded).
-    
+
     Args:
         append_nclicks: int
         clear_nclicks: int
-        refresh_nclicks: int
-        list_of_contents: list of bytes
-        session_data: Dash.dcc.Store(type='memory')
-        clientside_memory_cache: Dash.dcc.Store(type='memory')
-        append_nclicks_timestamp: int
-        refresh_nclicks_timestamp: int
+        session_data: Dash.dcc.Store(type='session')
+        clientside_memory_cache: Dash.dcc.Store(type='session')
         clear_nclicks_timestamp: int
-        list_of_names: list of str
-        list_of_dates: list of int
     """
     memory_reset = {}
     if not session_data:
@@ -975,25 +839,15 @@ def enable_combined_file_uploads(
         if t_elapse < 2:
             return memory_reset
     if append_nclicks > 0:
-        LOG_FILE = session_data["session_log_file"]
         RUN_ID = session_data["RUN_ID"]
-        SESSION_OUTPUT_DIR = session_data["PATH_TO_SESSION_OUTPUT"]
+        list_of_names = [h["filename"] for h in uploads.list_uploads(RUN_ID)]
         app.logger.info(f"Append to Uploads in progress...")
         app.logger.info(f" ...Adding the following files: \n{list_of_names}")
         memory_reset = {f"{RUN_ID}-list_of_names": []}
         uploads_cache = clientside_memory_cache or memory_reset
-        parsed_upload_children = [
-            html.Details(
-                [
-                    parse_contents(c, n, d, SESSION_OUTPUT_DIR, session_log_file=LOG_FILE)
-                    for c, n, d in zip(list_of_contents, list_of_names, list_of_dates)
-                ]
-            )
-        ]
-        uploads_cache[f"{RUN_ID}-len_most_recent"] = len(parsed_upload_children)
-        uploads_cache[f"{RUN_ID}-list_of_names"].extend(list_of_names)
+        uploads_cache[f"{RUN_ID}-len_most_recent"] = len(list_of_names)
         uploads_cache[f"{RUN_ID}-list_of_names"] = list(
-            set(uploads_cache[f"{RUN_ID}-list_of_names"])
+            set(uploads_cache.get(f"{RUN_ID}-list_of_names", []) + list_of_names)
         )
         uploads_cache[f"{RUN_ID}-len_of_contents"] = len(uploads_cache[f"{RUN_ID}-list_of_names"])
         return uploads_cache
@@ -1001,213 +855,275 @@ def enable_combined_file_uploads(
         return memory_reset
 
 
-for n in range(1000):
+@app.callback(
+    Output("upload-status", "data"),
+    [Input("chunked-upload-done", "n_clicks"), Input("clear-uploads", "n_clicks")],
+    [State("session", "data"), State("clear-uploads", "n_clicks_timestamp")],
+)
+def register_uploads(done_nclicks, clear_nclicks, session_data, clear_nclicks_timestamp):
+    """Tally the files received server-side (via `/uploadChunk`, whether
+    picked in the chunked uploader or dropped on `dcc.Upload`) each time
+    a batch of uploads is done. Only this summary is kept in the browser;
+    callbacks look the uploads themselves up by RUN_ID
+    (`uploads.list_uploads`).
+
+    Args:
+        done_nclicks: int (clicked by `assets/chunked-upload.js`)
+        clear_nclicks: int
+        session_data: Dash.dcc.Store(type='session')
+        clear_nclicks_timestamp: int
 
-    @app.callback(
-        Output(f"cmds-dt-{n}", "style"),
-        [Input(f"show-cmds-{n}", "n_clicks")],
-        [State(f"cmds-dt-{n}", "style")],
+    Returns:
+        dict: {"files", "bytes", "t"}
+    """
+    if not session_data or session_data.get("RUN_ID", "NA") == "NA":
+        raise PreventUpdate
+    RUN_ID = session_data["RUN_ID"]
+    if clear_nclicks > 0 and tns() / 1e9 - clear_nclicks_timestamp / 1e3 < 2:
+        uploads.forget_uploads(RUN_ID)
+        forget_parsed(session_data["PATH_TO_SESSION_OUTPUT"])
+        return {"files": 0, "bytes": 0, "t": tns()}
+    if done_nclicks < 1:
+        raise PreventUpdate
+    handles = uploads.list_uploads(RUN_ID)
+    app.logger.info(
+        f"Uploads received ({len(handles)}): {[h['filename'] for h in handles]}"
+    )
+    return {"files": len(handles), "bytes": sum(h["size"] for h in handles), "t": tns()}
+
+
+# Reveal/hide the exact command lines called during the pipeline run,
+# for any number of blocks, in the browser - odd clicks show, even clicks
+# hide. A block is a `html.Button(id={"type": "show-cmds", "index": i})`
+# and a `html.Pre(id={"type": "cmds-dt", "index": i})`, unique `i` each.
+app.clientside_callback(
+    """
+    function(n_clicks) {
+        if (!n_clicks) {
+            return window.dash_clientside.no_update;
+        }
+        return {"display": n_clicks % 2 === 1 ? "block" : "none"};
+    }
+    """,
+    Output({"type": "cmds-dt", "index": MATCH}, "style"),
+    [Input({"type": "show-cmds", "index": MATCH}, "n_clicks")],
+)
+
+
+def show_list_of_names(list_of_names):
+    """Display the filenames for all successfully received
+    USER-uploaded files.
+
+    Args:
+        list_of_names: <list>
+            List of user-uploaded filenames
+
+    Returns:
+        <html.Div([...])>
+            Reactive response to display after processing upload
+    """
+    if not all([fn.endswith(tuple([".csv",".xlsx"])) for fn in list_of_names]):
+        return html.Div(
+            [
+                html.Br(),
+                html.Code(
+                    f"⚠ UPLOAD ERROR: Not all of the {len(list_of_names)} files are CSV or Excel files !",
+                    style={"color": "red"},
+                ),
+                html.Br(),
+                html.Code(
+                    f"⛔ | Please reset this upload & then perform a fresh upload of either .csv or .xlsx files."
+                ),
+            ]
+        )
+    return html.Div(
+        [
+            html.Br(),
+            html.Code(
+                f"✔ UPLOAD SUCCESSFUL (N={len(list_of_names)})", style={"color": "green"}
+            ),
+            html.Br(),
+            html.Br(),
+            html.Details(
+                [
+                    html.Summary(
+                        html.H3(
+                            f"File(s) received (click to expand)",
+                            style={"textAlign": "left", "fontSize": "120%"},
+                        )
+                    ),
+                    html.Div(
+                        [
+                            html.Li(f"{'{:02d}'.format(i+1)})\t{abi}")
+                            for (i, abi) in enumerate(sorted(list_of_names))
+                        ],
+                        id="files-received",
+                        style={
+                            "textAlign": "left",
+                            "fontSize": "60%",
+                            "columnCount": "3",
+                            "paddingBottom": "2%",
+                            "fontFamily": "'Roboto Mono', monospace",
+                        },
+                    ),
+                    html.Hr(
+                        style={
+                            "borderTop": "1px solid",
+                            "animation": "pact-gradient-text-flow 3s infinite linear",
+                            "borderRadius": "5px",
+                            "opacity": "0.67",
+                            "width": "50%",
+                            "marginLeft": "25%",
+                        }
+                    ),
+                ]
+            ),
+            html.Br(),
+            html.Span(className="fader-line-short", style={"marginBottom": "20px"}),
+        ],
+        style={"width": "80%", "marginLeft": "10%"},
     )
-    def show_pipeline_commands(show_pl_cmds_n_clicks, style):
-        """Enable dynamic reveal/hide functionality for showing
-        the technical-heavy exact command line commands called 
-        during the pipeline execution of processes.
-        
-        Args:
-            show_pl_cmds_n_clicks: int
-            style: <type>
-        
-        Returns:
-            <type>
-        
-        Raises:
-            PreventUpdate: Description
-            PreventUpdate
-        """
-        if show_pl_cmds_n_clicks > 0:
-            if (show_pl_cmds_n_clicks % 2) == 1:
-                app.logger.info(f"show_pl_cmds clicked: {show_pl_cmds_n_clicks % 2}")
-                return {"display": "block"}
-            else:
-                return {"display": "none"}
-        else:
-            raise PreventUpdate
 
 
 @app.callback(
-    Output("output-data-upload", "children"),
+    Output("received-upload", "children"),
     [
-        Input("upload-data", "contents"),
-        Input("upload-data", "filename"),
-        Input("upload-data", "last_modified"),
-        Input("initiate-pipeline", "n_clicks"),
-        Input("clear-pipeline", "n_clicks"),
+        Input("upload-status", "data"),
         Input("append-uploads", "n_clicks"),
         Input("refresh-uploads", "n_clicks"),
         Input("clear-uploads", "n_clicks"),
-        Input("memory", "data"),
+    ],
+    [State("session", "data"), State("clear-uploads", "n_clicks_timestamp")],
+)
+def show_uploads(
+    upload_status,
+    append_uploads_n_clicks,
+    refresh_uploads_n_clicks,
+    clear_uploads_n_clicks,
+    session_data,
+    clear_uploads_timestamp,
+):
+    """List the files uploaded so far (by name, as recorded server-side
+    for the session's RUN_ID), or confirm they were cleared.
+
+    Args:
+        upload_status: dict (see `register_uploads`)
+        append_uploads_n_clicks: int
+        refresh_uploads_n_clicks: int
+        clear_uploads_n_clicks: int
+        session_data: Dash.dcc.Store(type='session')
+        clear_uploads_timestamp: int
+
+    Returns:
+        Dash html component(s)
+    """
+    if not session_data or session_data.get("RUN_ID", "NA") == "NA":
+        raise PreventUpdate
+    RUN_ID = session_data["RUN_ID"]
+    SESSION_OUTPUT_DIR = session_data["PATH_TO_SESSION_OUTPUT"]
+    USER = session_data.get("user_proper")
+    sessionlog.bind(session_data.get("session_log_file"))
+    list_of_names = [h["filename"] for h in uploads.list_uploads(RUN_ID)]
+
+    if clear_uploads_n_clicks > 0:
+        t_elapsed = tns() / 1e9 - clear_uploads_timestamp / 1e3
+        if t_elapsed < 2:
+            for tcr_dir in os.listdir(SESSION_OUTPUT_DIR):
+                if tcr_dir.startswith("."):
+                    continue  # (internal: job records, zip cache, ...)
+                grouped_clone_fqs = f"{SESSION_OUTPUT_DIR}{tcr_dir}"
+                if os.path.isdir(grouped_clone_fqs):
+                    shutil.rmtree(grouped_clone_fqs)
+            forget_parsed(SESSION_OUTPUT_DIR)
+            return html.Div(
+                [
+                    html.Code(f"UPLOADS CLEARED", style={"color": "red"}),
+                    html.H5(
+                        f'To continue, submit at least one new upload & click "✥ Append".'
+                    ),
+                ]
+            )
+
+    if append_uploads_n_clicks > 0 or clear_uploads_n_clicks > 0:
+        if len(list_of_names) > 0:
+            return show_list_of_names(list_of_names)
+        return html.Div(html.Code("NONE"))
+    if not list_of_names:
+        return None
+    app.logger.info(
+        f"{USER} uploaded the following {len(list_of_names)} file(s):"
+        + "\n\t ◇ 📄 "
+        + "\n\t ◇ 📄 ".join(sorted(list_of_names))
+        + ".\n"
+    )
+    return show_list_of_names(list_of_names)
+
+
+@app.callback(
+    Output("output-data-upload", "children"),
+    [
+        Input("initiate-pipeline", "n_clicks"),
+        Input("clear-pipeline", "n_clicks"),
         Input("sign-on-submit", "n_clicks"),
         Input("session", "data"),
     ],
     [
+        State("refresh-uploads", "n_clicks"),
         State("workflow-id", "value"),
         State("initiate-pipeline", "n_clicks_timestamp"),
         State("clear-pipeline", "n_clicks_timestamp"),
         State("sign-on-submit", "n_clicks_timestamp"),
         State("refresh-uploads", "n_clicks_timestamp"),
-        State("clear-uploads", "n_clicks_timestamp"),
     ],
 )
 def update_output(
-    list_of_contents,
-    list_of_names,
-    list_of_dates,
     initiate_pipeline_n_clicks,
     clear_pipeline_n_clicks,
-    append_uploads_n_clicks,
-    refresh_uploads_n_clicks,
-    clear_uploads_n_clicks,
-    memory,
     user_login_n_clicks,
     session_data,
+    refresh_uploads_n_clicks,
     workflow,
     initiate_pipeline_timestamp,
     clear_pipeline_timestamp,
     user_login_timestamp,
     refresh_uploads_timestamp,
-    clear_uploads_timestamp,
 ):
     """Primary APP Pipeline function, as triggered by 'Initiate
     [APP] Pipeline' UI button (located in the "Step 2 (2/2)"
     section).
-    
+
+    Uploads are never part of this callback's request: they are held
+    server-side & looked up by the session's RUN_ID (see `store_uploads`
+    & `seqapp.uploads`).
+
     Parameters
     ----------
-    list_of_contents
-        <list of str>
-        Array containing user-uploaded ABI raw contents as
-        binary strings (thus requiring decoding)
-    list_of_names
-        <list of str>
-        Array containing user-uploaded ABI filenames
-        (does not include the full path for security reasons)
-    list_of_dates
-        <list of int>
-        Array containing user-uploaded ABI last modified timestamps
-        (integers as seconds since 1970)
     initiate_pipeline_n_clicks
         <int>
         Total count of UI button clicks
     clear_pipeline_n_clicks
         <int>
         Total count of UI button clicks
-    append_uploads_n_clicks
-        <int> 
-        Total count of UI button clicks
-    refresh_uploads_n_clicks
-        <int> 
-        Total count of UI button clicks
-    clear_uploads_n_clicks
-        <int> 
-        Total count of UI button clicks
-    memory
-        Dash.dcc.Store(type='session')
     user_login_n_clicks
-        <int> 
+        <int>
         Total count of UI button clicks
     session_data
         Dash.dcc.Store(type='session')
+    refresh_uploads_n_clicks
+        <int>
+        Total count of UI button clicks
     workflow
-        <type>
+        <str>
     initiate_pipeline_timestamp
-        <type>
+        <int>
     clear_pipeline_timestamp
-        <type>
+        <int>
     user_login_timestamp
-        <type>
+        <int>
     refresh_uploads_timestamp
-        <type>
-    clear_uploads_timestamp
-        <type>
-    
-    """
-
-    def show_list_of_names(USER, list_of_names):
-        """Display the filenames for all successfully received 
-        USER-uploaded ABI files.
-        
-        Args:
-            USER: <str>
-                Active user
-            list_of_names: <list> 
-                List of user-uploaded ABI filenames
-        
-        Returns:
-            <html.Div([...])> 
-                Reactive response to display after processing upload
-        """
-        if not all([fn.endswith(tuple([".csv",".xlsx"])) for fn in list_of_names]):
-            return html.Div(
-                [
-                    html.Br(),
-                    html.Code(
-                        f"⚠ UPLOAD ERROR: Not all of the {len(list_of_names)} files are CSV or Excel files !",
-                        style={"color": "red"},
-                    ),
-                    html.Br(),
-                    html.Code(
-                        f"⛔ | Please reset this upload & then perform a fresh upload of either .csv or .xlsx files."
-                    ),
-                ]
-            )
-        return html.Div(
-            [
-                html.Br(),
-                html.Code(
-                    f"✔ UPLOAD SUCCESSFUL (N={len(list_of_names)})", style={"color": "green"}
-                ),
-                html.Br(),
-                html.Br(),
-                html.Details(
-                    [
-                        html.Summary(
-                            html.H3(
-                                f"File(s) received (click to expand)",
-                                style={"textAlign": "left", "fontSize": "120%"},
-                            )
-                        ),
-                        html.Div(
-                            [
-                                html.Li(f"{'{:02d}'.format(i+1)})\t{abi}")
-                                for (i, abi) in enumerate(sorted(list_of_names))
-                            ],
-                            id="files-received",
-                            style={
-                                "textAlign": "left",
-                                "fontSize": "60%",
-                                "columnCount": "3",
-                                "paddingBottom": "2%",
-                                "fontFamily": "'Roboto Mono', monospace",
-                            },
-                        ),
-                        html.Hr(
-                            style={
-                                "borderTop": "1px solid",
-                                "animation": "pact-gradient-text-flow 3s infinite linear",
-                                "borderRadius": "5px",
-                                "opacity": "0.67",
-                                "width": "50%",
-                                "marginLeft": "25%",
-                            }
-                        ),
-                    ]
-                ),
-                html.Br(),
-                html.Span(className="fader-line-short", style={"marginBottom": "20px"}),
-            ],
-            style={"width": "80%", "marginLeft": "10%"},
-        )
+        <int>
 
+    """
     not_signed_in_msg = html.Div(
         [html.H6("Please log in to release the pipeline as ready for activation.")]
     )
@@ -1219,18 +1135,7 @@ def update_output(
             LOG_FILE = session_data["session_log_file"]
             USER = session_data["user_proper"]
             UUID = session_data["UUID"]
-
-            if len(app.logger.handlers) < 1:
-                app.logger.info(
-                    f"Number logger handlers = {len(app.logger.handlers)}->{logger.handlers}"
-                )
-                app.logger.info("Adding log FileHandler...")
-                fh = logging.FileHandler(LOG_FILE)
-                fh.setLevel(logging.INFO)
-                app.logger.addHandler(fh)
-                app.logger.info(
-                    f"Number logger handlers = {len(app.logger.handlers)}->{logger.handlers}"
-                )
+            sessionlog.bind(LOG_FILE)
         else:
             return not_signed_in_msg
 
@@ -1238,266 +1143,398 @@ def update_output(
         app.logger.error(f"No user appears to be logged in (KeyError: {e})")
         return not_signed_in_msg
 
-    ### UPON USER FILE UPLOAD(S):
-    if list_of_contents is not None:
-
-        if initiate_pipeline_n_clicks >= 1:
-            init_t_elapse = tns() / 1e9 - initiate_pipeline_timestamp / 1e3
-            app.logger.info(f"init_t_elapse = {init_t_elapse}; ")
-            if init_t_elapse < 30:
-                if (
-                    clear_pipeline_n_clicks > 0
-                    and refresh_uploads_n_clicks <= clear_pipeline_n_clicks
+    list_of_names = [h["filename"] for h in uploads.list_uploads(RUN_ID)]
+
+    if initiate_pipeline_n_clicks >= 1 and list_of_names:
+        init_t_elapse = tns() / 1e9 - initiate_pipeline_timestamp / 1e3
+        app.logger.info(f"init_t_elapse = {init_t_elapse}; ")
+        if init_t_elapse < 30:
+            if (
+                clear_pipeline_n_clicks > 0
+                and refresh_uploads_n_clicks <= clear_pipeline_n_clicks
+            ):
+                if all(
+                    clear_pipeline_timestamp > ts
+                    for ts in [initiate_pipeline_timestamp, user_login_timestamp]
                 ):
-                    if all(
-                        clear_pipeline_timestamp > ts
-                        for ts in [initiate_pipeline_timestamp, user_login_timestamp]
-                    ):
-                        return [
-                            html.H3(
-                                f"Thanks, {USER}; the previous pipeline results have been cleared."
-                            ),
-                            html.H4(f"Current analysis output folder: {RUN_ID}"),
-                            html.H5(
-                                html.Div(
-                                    [
-                                        html.Span(f"Launch a new analysis."),
-                                        html.Br(),
-                                    ]
-                                )
-                            ),
-                        ]
-                elif clear_pipeline_n_clicks > 0:
-                    if clear_pipeline_timestamp > initiate_pipeline_timestamp:
-                        if refresh_uploads_n_clicks > 0:
-                            if refresh_uploads_timestamp > clear_pipeline_timestamp:
-                                return show_list_of_names(USER, list_of_names)
-                        return html.Div(
-                            html.H5(
-                                f"(Pipeline results [{RUN_ID}] CLEARED)", style={"color": "red"}
+                    return [
+                        html.H3(
+                            f"Thanks, {USER}; the previous pipeline results have been cleared."
+                        ),
+                        html.H4(f"Current analysis output folder: {RUN_ID}"),
+                        html.H5(
+                            html.Div(
+                                [
+                                    html.Span(f"Launch a new analysis."),
+                                    html.Br(),
+                                ]
                             )
+                        ),
+                    ]
+            elif clear_pipeline_n_clicks > 0:
+                if clear_pipeline_timestamp > initiate_pipeline_timestamp:
+                    if refresh_uploads_n_clicks > 0:
+                        if refresh_uploads_timestamp > clear_pipeline_timestamp:
+                            return show_list_of_names(list_of_names)
+                    return html.Div(
+                        html.H5(
+                            f"(Pipeline results [{RUN_ID}] CLEARED)", style={"color": "red"}
                         )
-
-                app.logger.info(
-                    f"📟📶⌁⌁⌁📠Using the following as pipeline data input. \n{len(list_of_names)} USER UPLOADED FILE(S) : \n"
-                    + "\n  📊⇢🧬 ".join(
-                        [
-                            "{:>03d})\t{:>50s}".format(i + 1, abi)
-                            for i, abi in enumerate(sorted(list_of_names))
-                        ]
                     )
-                )
 
-                app.logger.info(
-                    f"INITIALIZING NEW PIPELINE LAUNCH:\n\n\t\t{SESSION_OUTPUT_DIR}"
+            app.logger.info(
+                f"📟📶⌁⌁⌁📠Using the following as pipeline data input. \n{len(list_of_names)} USER UPLOADED FILE(S) : \n"
+                + "\n  📊⇢🧬 ".join(
+                    [
+                        "{:>03d})\t{:>50s}".format(i + 1, abi)
+                        for i, abi in enumerate(sorted(list_of_names))
+                    ]
                 )
+            )
 
-                start_time = tns()
+            app.logger.info(
+                f"INITIALIZING NEW PIPELINE LAUNCH:\n\n\t\t{SESSION_OUTPUT_DIR}"
+            )
 
-                children = []
-                parsed_upload_children = [
-                    html.Details(
-                        [
-                            parse_contents(c, n, d, SESSION_OUTPUT_DIR, session_log_file=LOG_FILE)
-                            for c, n, d in zip(list_of_contents, list_of_names, list_of_dates)
-                        ]
-                    )
-                ]
-                # Generate (single!) TCR alpha/beta chain pair combinations
-                # base pipeline reference files (e.g., agg'd fq, designated master
-                # reference 'genome', DataFrames, log, etc.)
-                try:
-                    pipeline_output = ljoin(
-                        [
-                            r
-                            for r in pipeline.run_pipeline(
-                                RUN_ID,
-                                SESSION_OUTPUT_DIR,
-                                workflow=workflow,
-                                session_log_file=LOG_FILE,
-                            )
-                        ]
-                    )
-                    args = [(*(x), i + 1) for i, x in enumerate(pipeline_output)]
-
-                except Exception as e:
-                    logs = []
-                    report = None
-                    with open(LOG_FILE, "r+") as log_file:
-                        for line in log_file.readlines():
-                            logs.append(line)
-                    stderr = [
-                        dcc.Textarea(
-                            placeholder="(Main Sequence -- logger placeholder)",
-                            value="\n".join(logs),
-                            style={
-                                "height": "400px",
-                                "width": "50%",
-                                "fontSize": "0.7rem",
-                                "lineHeight": "0.9rem",
-                                "fontFamily": "'Roboto Mono', monospace",
-                            },
-                            className="logger-text",
-                            name="organization",
-                            readOnly=True,
-                        )
-                    ]
-                    fatal_crash = "⚠ ALERT: ERROR IN MAIN PIPELINE SEQUENCE"
-                    app.logger.error(f"{fatal_crash}: \n\n{e}")
-                    log_exc(app.logger)
-                    return html.Div(
-                        [
-                            html.H2(fatal_crash, style={"color": "red"}),
-                            html.P(f"App runtime was: {gtt(start_time)}"),
-                            html.Code(f"Primary error message for crash:\n{e}"),
-                            html.H4("See [end of] AUDIT LOG (below) for failure reason."),
-                            html.H5(f"WEB SERVER SYSTEM LOG:", style={"color": "red"}),
-                            html.Div(stderr),
-                        ]
-                    )
+            start_time = tns()
 
-                ###   # # # # # # # # # #### # # # # # # # # #   ###
-                children.append(
-                    html.Div(
-                        [
-                            html.Hr(),
-                            html.Br(),
-                            html.H4("All files analyzed in most recent upload:"),
-                        ]
-                    )
-                )
-                """      ~ ◮ ~
-                     S U M M A R Y
-                 a  n  a  l  y  s  i  s
-                     ~     ~     ~
-                         ~ ◮ ~
-                """
-                if report:
-                    summary_report = [
-                        html.Div(
-                            [
-                                html.Br(),
-                                html.H2(
-                                    "Pipeline Output Summary",
-                                    style={
-                                        "fontSize": "80%",
-                                        "letterSpacing": "1.33rem",
-                                        "fontFamily": "Cinzel",
-                                        "animation": "anim-text-flow-keys 120s infinite linear",
-                                    },
-                            ),
-                                html.Hr(),
-                            ],
-                            style={"width": "90%", "marginLeft": "5%"},
-                        )
-                    ]
-                else:
-                    summary_report = [html.Div([html.H4(f"No final output found.")])]
-
-                html_out = f"{SESSION_OUTPUT_DIR}{RUN_ID}_HTMLprops.tsv"
-                pd.DataFrame(
-                    [str(c.to_plotly_json()) for c in children], columns=["DashHTMLDivComponents"]
-                ).to_csv(html_out, encoding="utf-8", sep="\t")
-                app.logger.info("Processed & analzyed input files were:")
-                app.logger.debug(parsed_upload_children)
-                app.logger.info(",".join([str(type(x)) for x in parsed_upload_children]))
-                total_exec_time = gtt(start_time)
-                app.logger.info(
-                    f"———COMPLETE——-\n\n \t ☆☆☆ Total EXECUTION TIME Required ☆☆☆\n\n \t\t = {total_exec_time} s \n\n"
+            # Parse the uploads, then generate (single!) TCR alpha/beta chain
+            # pair combinations base pipeline reference files (e.g., agg'd fq,
+            # designated master reference 'genome', DataFrames, log, etc.)
+            # -> Queued on the background job engine; progress & the final
+            #    report (incl. the parsed uploads) are rendered by
+            #    `show_pipeline_job_status` below.
+            try:
+                job_id = pipeline.submit_pipeline(
+                    RUN_ID,
+                    SESSION_OUTPUT_DIR,
+                    workflow=workflow,
+                    session_log_file=LOG_FILE,
                 )
-                show_exec_time = [
-                    html.Div(
-                        [
-                            html.Hr(),
-                            html.H3(
-                                f"* ﾟ(>͂ ͡͡︒ ͜ ʖ ͡︒)>-｡ﾟ☆* :・ﾟ.☆ * ･ "
-                            ),
-                            html.H4(f"Total Execution Time Required = {total_exec_time} s"),
-                            html.Hr(),
-                            html.Br(),
-                        ]
-                    )
-                ]
+            except Exception as e:
+                return pipeline_crash_report(e, LOG_FILE, gtt(start_time))
 
-                if len(children) > 50:
-                    full_report = [
-                        html.Div(
-                            [
-                                html.H2(
-                                    f"NOTICE: Due to an unusually large number of results in this analysis (N={len(children)}), full report display has been automatically disabled."
-                                )
-                            ]
-                        )
-                    ]
-                else:
-                    full_report = children
-
-                children = (
-                    show_exec_time
-                    + TOC
-                    + summary_report
-                    + full_report
-                    + parsed_upload_children
-                    + [html.Div(html.Hr())]
-                )
+            app.logger.info(f"Pipeline job {job_id} launched (in {gtt(start_time)} s)")
+            return [
+                html.H4(f"⮊ Pipeline launched — job {job_id}"),
+                dcc.Store(id="pipeline-job", data={"job_id": job_id, "RUN_ID": RUN_ID}),
+                dcc.Interval(
+                    id="pipeline-status-interval", interval=PIPELINE_STATUS_POLL_MS
+                ),
+                html.Div(id="pipeline-status"),
+            ]
 
-                app.logger.debug(",".join([str(type(x)) for x in children]))
-                app.logger.debug(f"Number of html.Div elements in final layout: {len(children)}")
+    return html.Div(
+        [html.Br(), html.H5(f"Logged in as: {USER}", style={"color": "rgb(32,92,188)"})]
+    )
 
-                return children
 
-        elif initiate_pipeline_n_clicks > 15:
-            return html.Div(
+def pipeline_crash_report(e, LOG_FILE, runtime):
+    """Components reporting a fatal pipeline error, incl. the (end of the)
+    session log.
+
+    Args:
+        e: Exception (or error message) which ended the run
+        LOG_FILE: str
+        runtime: str
+
+    Returns:
+        html.Div
+    """
+    logs, _ = logtail.tail(LOG_FILE)
+    stderr = [
+        dcc.Textarea(
+            placeholder="(Main Sequence -- logger placeholder)",
+            value=logs,
+            style={
+                "height": "400px",
+                "width": "50%",
+                "fontSize": "0.7rem",
+                "lineHeight": "0.9rem",
+                "fontFamily": "'Roboto Mono', monospace",
+            },
+            className="logger-text",
+            name="organization",
+            readOnly=True,
+        )
+    ]
+    fatal_crash = "⚠ ALERT: ERROR IN MAIN PIPELINE SEQUENCE"
+    app.logger.error(f"{fatal_crash}: \n\n{e}")
+    if isinstance(e, Exception):
+        log_exc(app.logger)
+    return html.Div(
+        [
+            html.H2(fatal_crash, style={"color": "red"}),
+            html.P(f"App runtime was: {runtime}"),
+            html.Code(f"Primary error message for crash:\n{e}"),
+            html.H4("See [end of] AUDIT LOG (below) for failure reason."),
+            html.H5(f"WEB SERVER SYSTEM LOG:", style={"color": "red"}),
+            html.Div(stderr),
+        ]
+    )
+
+
+def pipeline_report(status, results, RUN_ID, SESSION_OUTPUT_DIR):
+    """Final report components of a finished pipeline job.
+
+    Args:
+        status: dict (see `jobs.job_status`)
+        results: list (see `jobs.job_results`)
+        RUN_ID: str
+        SESSION_OUTPUT_DIR: str
+
+    Returns:
+        list of Dash HTML components
+    """
+    children = [
+        html.Div(
+            [
+                html.Hr(),
+                html.Br(),
+                html.H4("All files analyzed in most recent upload:"),
+                html.Ul(
+                    [
+                        html.Li(f"{sample} — {entry['state']}")
+                        for sample, entry in status["samples"].items()
+                    ]
+                ),
+            ]
+        )
+    ]
+    """      ~ ◮ ~
+         S U M M A R Y
+     a  n  a  l  y  s  i  s
+         ~     ~     ~
+             ~ ◮ ~
+    """
+    if any(r is not None for r in results):
+        summary_report = [
+            html.Div(
                 [
-                    html.H4(
-                        "⚠ | ALERT ! : Un𝒇ortunately, you have over-activated the pipeline submissions check system. Please re𝒇resh the page, re-log in, and re-upload the set o𝒇 ABI 𝒇iles you would like analyzed.  🛠⎆ "
+                    html.Br(),
+                    html.H2(
+                        "Pipeline Output Summary",
+                        style={
+                            "fontSize": "80%",
+                            "letterSpacing": "1.33rem",
+                            "fontFamily": "Cinzel",
+                            "animation": "anim-text-flow-keys 120s infinite linear",
+                        },
                     ),
-                    html.H6("↺ Please Re𝒇resh the page. ↺"),
+                    html.Hr(),
+                ],
+                style={"width": "90%", "marginLeft": "5%"},
+            )
+        ]
+    else:
+        summary_report = [html.Div([html.H4(f"No final output found.")])]
+
+    html_out = f"{SESSION_OUTPUT_DIR}{RUN_ID}_HTMLprops.tsv"
+    pd.DataFrame(
+        [str(c.to_plotly_json()) for c in children], columns=["DashHTMLDivComponents"]
+    ).to_csv(html_out, encoding="utf-8", sep="\t")
+    total_exec_time = status["elapsed"]
+    app.logger.info(
+        f"———COMPLETE——-\n\n \t ☆☆☆ Total EXECUTION TIME Required ☆☆☆\n\n \t\t = {total_exec_time} s \n\n"
+    )
+    show_exec_time = [
+        html.Div(
+            [
+                html.Hr(),
+                html.H3(
+                    f"* ﾟ(>͂ ͡͡︒ ͜ ʖ ͡︒)>-｡ﾟ☆* :・ﾟ.☆ * ･ "
+                ),
+                html.H4(f"Total Execution Time Required = {total_exec_time} s"),
+                html.Hr(),
+                html.Br(),
+            ]
+        )
+    ]
+
+    if status["total"] > 50:
+        full_report = [
+            html.Div(
+                [
+                    html.H2(
+                        f"NOTICE: Due to an unusually large number of results in this analysis (N={status['total']}), full report display has been automatically disabled."
+                    )
                 ]
             )
+        ]
+    else:
+        full_report = children
 
-        if clear_uploads_n_clicks > 0:
-            t_elapsed = tns() / 1e9 - clear_uploads_timestamp / 1e3
-            if t_elapsed < 2:
-                for tcr_dir in os.listdir(SESSION_OUTPUT_DIR):
-                    grouped_clone_fqs = f"{SESSION_OUTPUT_DIR}{tcr_dir}"
-                    if os.path.isdir(grouped_clone_fqs):
-                        shutil.rmtree(grouped_clone_fqs)
-                return html.Div(
-                    [
-                        html.Code(f"UPLOADS CLEARED", style={"color": "red"}),
-                        html.H5(
-                            f'To continue, submit at least one new upload & click "✥ Append".'
-                        ),
-                    ]
-                )
+    return show_exec_time + summary_report + full_report + [html.Div(html.Hr())]
+
+
+@app.callback(
+    [
+        Output("pipeline-status", "children"),
+        Output("pipeline-status-interval", "disabled"),
+    ],
+    [Input("pipeline-status-interval", "n_intervals")],
+    [State("pipeline-job", "data")],
+)
+def show_pipeline_job_status(n_intervals, job):
+    """Poll the background pipeline job launched by `update_output`:
+    per-sample progress while it runs, then the final report & the
+    parsed uploads (and stop polling).
+
+    Args:
+        n_intervals: int
+        job: dict {"job_id", "RUN_ID"} (dcc.Store)
 
-        if append_uploads_n_clicks > 0 or clear_uploads_n_clicks > 0:
-            if len(list_of_names) > 0 and len(memory.items()) > 0:
-                all_uploads = (
-                    memory[f"{RUN_ID}-list_of_names"]
-                    if len(memory[f"{RUN_ID}-list_of_names"]) > 0
-                    else list_of_names
+    Returns:
+        (list of Dash HTML components, bool [interval disabled])
+    """
+    if not job:
+        raise PreventUpdate
+    SESSION_OUTPUT_DIR = session_output_dir(job["RUN_ID"])
+    status = jobs.job_status(SESSION_OUTPUT_DIR, job["job_id"])
+    if status is None:
+        return [html.H5(f"Waiting for pipeline job {job['job_id']}...")], False
+
+    if status["state"] == "queued":
+        position = status.get("queue_position")
+        return (
+            [
+                html.H5(
+                    "Pipeline queued — waiting for a free CPU slot"
+                    + (f" ({position} run(s) ahead in the queue)" if position else "")
+                    + "...",
+                    style={"color": "goldenrod"},
                 )
-                return show_list_of_names(USER, all_uploads)
-            elif len(memory.items()) == 0:
-                return html.Div(html.Code("NONE"))
-        else:
-            app.logger.info(
-                f"{USER} uploaded the following {len(list_of_names)} file(s):"
-                + "\n\t ◇ 📄 "
-                + "\n\t ◇ 📄 ".join(sorted(list_of_names))
-                + ".\n"
-            )
-            return show_list_of_names(USER, list_of_names)
+            ],
+            False,
+        )
 
-    else:
-        return html.Div(
-            [html.Br(), html.H5(f"Logged in as: {USER}", style={"color": "rgb(32,92,188)"})]
+    if status["state"] == "preparing":
+        return [html.H5("Pipeline starting: parsing the uploaded files...")], False
+
+    if status["state"] == "running":
+        finished = status["n_done"] + status["n_failed"]
+        return (
+            [
+                html.H5(f"Pipeline running: {finished}/{status['total']} samples finished"),
+                html.Progress(value=f"{finished}", max=f"{max(status['total'], 1)}"),
+                html.Ul(
+                    [
+                        html.Li(
+                            f"{sample} — {entry['state']}",
+                            style={"fontFamily": "'Roboto Mono', monospace", "fontSize": "70%"},
+                        )
+                        for sample, entry in status["samples"].items()
+                    ],
+                    style={"textAlign": "left", "columnCount": "3"},
+                ),
+            ],
+            False,
         )
 
+    if status["state"] == "failed" and (status["n_done"] == 0 or status.get("error")):
+        errors = [f"{sample}: {entry.get('error')}" for sample, entry in status["samples"].items()]
+        if status.get("error"):
+            errors.insert(0, status["error"])
+        errors = "\n".join(errors)
+        LOG_FILE = f"{SESSION_OUTPUT_DIR}{job['RUN_ID']}_CurrentSession.log"
+        return [pipeline_crash_report(errors, LOG_FILE, status["elapsed"])], True
+
+    results = jobs.job_results(SESSION_OUTPUT_DIR, job["job_id"])
+    # (parsed by the job: read back from the parse cache)
+    parsed_uploads = html.Details(
+        [
+            parse_upload(job["RUN_ID"], h, SESSION_OUTPUT_DIR)
+            for h in uploads.list_uploads(job["RUN_ID"])
+        ]
+    )
+    report = pipeline_report(status, results, job["RUN_ID"], SESSION_OUTPUT_DIR)
+    return report + [parsed_uploads], True
+
+
+def log_viewer(files):
+    """Live session log viewer: the last `LOG_TAIL_LINES` of each log,
+    then (polled every `LOG_POLL_MS`) only newly appended lines.
+
+    Args:
+        files: list of log file paths
+
+    Returns:
+        list: Dash components (Textarea, offset & new-lines Stores, Interval)
+    """
+    texts, offsets = [], {}
+    for f in files:
+        text, offsets[f] = logtail.tail(f)
+        texts.append(text)
+    return [
+        dcc.Textarea(
+            id="log-viewer",
+            placeholder="(No logged activity yet.)",
+            value="".join(texts),
+            style={
+                "height": "550px",
+                "width": "60%",
+                "fontSize": "0.7rem",
+                "lineHeight": "0.9rem",
+                "fontFamily": "'Roboto Mono', monospace",
+            },
+            className="logger-text",
+            name="organization",
+            readOnly=True,
+        ),
+        dcc.Store(id="log-offsets", data=offsets),
+        dcc.Store(id="log-new-lines"),
+        dcc.Interval(id="log-poll-interval", interval=LOG_POLL_MS),
+    ]
 
 
+@app.callback(
+    [Output("log-offsets", "data"), Output("log-new-lines", "data")],
+    [Input("log-poll-interval", "n_intervals")],
+    [State("log-offsets", "data"), State("session", "data")],
+)
+def poll_session_logs(n_intervals, offsets, session_data):
+    """Send the log viewer only the lines appended since its last poll.
+
+    Args:
+        n_intervals: int
+        offsets: dict - {log file path: byte offset read up to}
+        session_data: Dash.dcc.Store(type='session')
+
+    Returns:
+        tuple: updated offsets, new text (appended client-side)
+    """
+    if not offsets or not session_data or "PATH_TO_SESSION_OUTPUT" not in session_data:
+        raise PreventUpdate
+    session_output = os.path.realpath(session_data["PATH_TO_SESSION_OUTPUT"])
+    updated, new_text = {}, []
+    for f, offset in offsets.items():
+        if not os.path.realpath(f).startswith(session_output + os.sep):
+            continue
+        text, updated[f] = logtail.read_from(f, offset)
+        new_text.append(text)
+    if not any(new_text):
+        raise PreventUpdate
+    return updated, "".join(new_text)
+
+
+app.clientside_callback(
+    f"""
+    function(newLines, current) {{
+        if (!newLines) {{
+            return window.dash_clientside.no_update;
+        }}
+        var text = (current || "") + newLines;
+        if (text.length > {LOG_VIEWER_MAX_CHARS}) {{
+            text = text.slice(text.indexOf("\\n", text.length - {LOG_VIEWER_MAX_CHARS}) + 1);
+        }}
+        return text;
+    }}
+    """,
+    Output("log-viewer", "value"),
+    [Input("log-new-lines", "data")],
+    [State("log-viewer", "value")],
+)
+
 
 @app.callback(
     Output(f"output-file-list", "children"),
@@ -1550,30 +1587,10 @@ def update_link(refresh_n_clicks, value, session_data):
                 return [html.Li(f"(Please log in first!)")]
             if value == "LOGS":
                 files = sorted(get_output_files(selection, session_output))
-                logs = []
-                for f in files:
-                    with open(f, "r+") as log_file:
-                        for line in log_file.readlines():
-                            logs.append(line)
-                    if len(app.logger.handlers) < 1:
-                        app.logger.addHandler(add_logfile(f))
-                        app.logger.info("Re-added logfile (post-log printout)")
-                return [html.Li(file_download_link(filename)) for filename in files] + [
-                    dcc.Textarea(
-                        placeholder="(No logged activity yet.)",
-                        value="\n".join(logs),
-                        style={
-                            "height": "550px",
-                            "width": "60%",
-                            "fontSize": "0.7rem",
-                            "lineHeight": "0.9rem",
-                            "fontFamily": "'Roboto Mono', monospace",
-                        },
-                        className="logger-text",
-                        name="organization",
-                        readOnly=True,
-                    )
-                ]
+                sessionlog.bind(session_data.get("session_log_file"))
+                return [html.Li(file_download_link(filename)) for filename in files] + log_viewer(
+                    files
+                )
             elif value == "REF":
                 return [
                     html.Li(
@@ -1605,7 +1622,7 @@ def update_link(refresh_n_clicks, value, session_data):
     [State(f"download-dropdown", "value"), State(f"session", "data")],
 )
 def zip_all_downloadables(getZipped_n_clicks, value, session_data):
-    """Create a downloadable zip of USER selected set of output files.
+    """Link to a (streamed, see `/downloadZAll`) zip of USER selected set of output files.
     
     Args:
         getZipped_n_clicks: int
@@ -1616,20 +1633,18 @@ def zip_all_downloadables(getZipped_n_clicks, value, session_data):
         html.Div([]): Dash HTML div component↦ itself an array of Dash HTML components
     """
     if getZipped_n_clicks > 0 and any(session_data):
-        selection = output_filetype_genres[value]
-        session_output = session_data["PATH_TO_SESSION_OUTPUT"]
         RUN_ID = session_data["RUN_ID"]
-        source = session_output if value != "REF" else PLASMIDS_ARCHIVE
-        files = get_output_files(selection, final_output_dir=source)
-        zipped = re.sub("['\ \(\)]", "", f"{session_output}{RUN_ID}_{clock()[-4:]}.zip")
-        for i, filename in enumerate(files):
-            fbn = f"{os.path.basename(filename)}"
-            app.logger.info(f"{i}: Adding file {filename} to new zipped archive: {fbn}...")
-            with zipfile.ZipFile(zipped, "a") as zipf:
-                zipf.write(filename, fbn)
+        href = f"/downloadZAll?run_id={urlsafe(RUN_ID)}&genre={urlsafe(value)}"
         return html.Div(
             [
                 html.H4(f"Zip⇝⇶🗃⇨Download All:"),
-                html.H4([html.Li(file_download_link(zipped), className="zip-dl-link")]),
+                html.H4(
+                    [
+                        html.Li(
+                            html.A(f"{RUN_ID}_{value}.zip", href=href),
+                            className="zip-dl-link",
+                        )
+                    ]
+                ),
             ]
         )
\ No newline at end of file
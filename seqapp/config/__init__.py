@@ -3,6 +3,7 @@ import base64
 import collections
 import datetime as dt
 import functools
+import importlib
 import itertools as itl
 import json
 import logging
@@ -21,6 +22,7 @@ import textwrap
 import threading
 import time
 import traceback
+import types
 import warnings
 import zipfile
 
@@ -33,48 +35,25 @@ from multiprocessing import Pool
 from sys import exc_info
 from traceback import format_exception
 
+from seqapp.config.buildinfo import load_build_info
+
 import Bio
 import Levenshtein as pylev
-import argon2
-import asyncio
-import bs4 # Beautiful Soup
 import dash
-import dash_bio as dashbio
 import flask
-import ftfy
 import io
-import matplotlib as mpl
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import plotly
-import plotly.graph_objs as go
-import plotly.io as pyio
-import plotly.offline as poff
-import plotly.tools as tls
-import requests
-import scipy
-import scipy.stats as stats
-import seaborn as sns
-import sklearn
-
-from Bio import Alphabet
-from Bio import Emboss
-from Bio import SeqIO
-from Bio.Alphabet import IUPAC
-from Bio.Data.IUPACData import ambiguous_dna_values
-from Bio.GenBank.Record import Record
+
 from Bio.Seq import Seq
-from Bio.SeqFeature import FeatureLocation
-from Bio.SeqFeature import SeqFeature
-from Bio.SeqIO.QualityIO import FastqGeneralIterator
 from Bio.SeqRecord import SeqRecord
-from Bio.SeqUtils import six_frame_translations
-from Bio.SubsMat.MatrixInfo import blosum62
 from dash import dash_table
 from dash import dcc
 from dash import html
+from dash.dependencies import ClientsideFunction
 from dash.dependencies import Input
+from dash.dependencies import MATCH
 from dash.dependencies import Output
 from dash.dependencies import State
 from dash.exceptions import PreventUpdate
@@ -82,15 +61,82 @@ from dataclasses import dataclass
 from flask import Flask
 from io import BytesIO
 from io import StringIO
-from matplotlib.collections import LineCollection
 from pathlib import Path
-from six.moves.urllib import request as urlreq
 from typing import Any
 from typing import List
 from urllib.parse import quote_plus as urlsafe
 from urllib.parse import unquote_plus as unquote
 
 
+class LazyModule(types.ModuleType):
+    """Placeholder for a module which is only actually imported upon
+    first attribute access (e.g., `plt.figure`), keeping the heavy
+    scientific libraries out of app/worker start up.
+
+    Parameters
+    ----------
+    name : str
+        Full (dotted) module name.
+    """
+
+    def _load(self):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+argon2 = LazyModule("argon2")
+asyncio = LazyModule("asyncio")
+bs4 = LazyModule("bs4")  # Beautiful Soup
+dashbio = LazyModule("dash_bio")
+ftfy = LazyModule("ftfy")
+go = LazyModule("plotly.graph_objs")
+mpl = LazyModule("matplotlib")
+plt = LazyModule("matplotlib.pyplot")
+poff = LazyModule("plotly.offline")
+pyio = LazyModule("plotly.io")
+requests = LazyModule("requests")
+scipy = LazyModule("scipy")
+sklearn = LazyModule("sklearn")
+sns = LazyModule("seaborn")
+stats = LazyModule("scipy.stats")
+tls = LazyModule("plotly.tools")
+SeqIO = LazyModule("Bio.SeqIO")
+
+_LAZY_ATTRS = {
+    # name: (module, attribute) - importable from this module on demand
+    # (`from seqapp.config import blosum62`), but no longer star-exported
+    "Alphabet": ("Bio", "Alphabet"),
+    "Emboss": ("Bio", "Emboss"),
+    "FastqGeneralIterator": ("Bio.SeqIO.QualityIO", "FastqGeneralIterator"),
+    "FeatureLocation": ("Bio.SeqFeature", "FeatureLocation"),
+    "IUPAC": ("Bio.Alphabet", "IUPAC"),
+    "LineCollection": ("matplotlib.collections", "LineCollection"),
+    "Record": ("Bio.GenBank.Record", "Record"),
+    "SeqFeature": ("Bio.SeqFeature", "SeqFeature"),
+    "ambiguous_dna_values": ("Bio.Data.IUPACData", "ambiguous_dna_values"),
+    "blosum62": ("Bio.SubsMat.MatrixInfo", "blosum62"),
+    "six_frame_translations": ("Bio.SeqUtils", "six_frame_translations"),
+    "urlreq": ("six.moves.urllib", "request"),
+}
+
+
+def __getattr__(name):
+    """Module-level lazy attributes (PEP 562); see `_LAZY_ATTRS` and
+    `entity_schemas`."""
+    if name == "entity_schemas":
+        return get_entity_schemas()
+    if name in _LAZY_ATTRS:
+        module, attr = _LAZY_ATTRS[name]
+        value = getattr(importlib.import_module(module), attr)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # mpl.use('Qt5Agg')
 
 
@@ -184,8 +230,16 @@ APP_NAME = "seqapp" # NOTE: Change this!
 TOP_DIR = path.join(*path.split(APP_HOME)[:-1])
 GUNICORN_STDERR = f"{APP_HOME}/{APP_NAME}/app/prod/gunicorn/logs/{today()}"
 RUN_OUTPUT_DIR = f"{APP_HOME}/{APP_NAME}/app/prod/sessions"
+PLASMIDS_ARCHIVE = f"{APP_HOME}/{APP_NAME}/app/prod/plasmids"  # (indexed; see bioinfo.faidx)
+
+ENTITY_SCHEMAS_FILE = f"{APP_HOME}/{APP_NAME}/assets/data/entity-schemas.csv"
+
+
+@functools.lru_cache(maxsize=None)
+def get_entity_schemas():
+    """Entity schemas table (read once per process, on first use)."""
+    return pd.read_csv(ENTITY_SCHEMAS_FILE, sep='\t')
 
-entity_schemas = pd.read_csv(f"{APP_HOME}/{APP_NAME}/assets/data/entity-schemas.csv", sep='\t')
 #
 #  ----| FILE HEADERS (Useful for, e.g., common DataFrames.)
 #
@@ -210,15 +264,11 @@ a3 = PATH_TO_ANACONDA3_ON_SERVER
 #
 # git_dir = TOP_DIR
 
-v = subprocess.run(["git", "describe", "--tags"],
-                   cwd=APP_HOME,
-                   capture_output=True)
-VERSION = v.stdout.decode("utf-8").rstrip()
-
-u = subprocess.run(["git", "log", "-n 50"], cwd=APP_HOME, capture_output=True)
-UPDATES = u.stdout.decode("utf-8").rstrip().split("\n\ncommit")
-# Remove "commit" from only first item in array for consistency
-UPDATES = [UPDATES[0][7:]] + UPDATES[1:]
+# (Cached at build time - see `config/buildinfo.py` - rather than
+# queried from git by every starting worker.)
+BUILD_INFO = load_build_info(APP_HOME)
+VERSION = BUILD_INFO["version"]
+UPDATES = BUILD_INFO["updates"]
 
 #
 #  ----| LOGGING OF ALL ACTIVITY & DATA GENERATION
@@ -227,6 +277,118 @@ DAILY_SESSIONS_DIR = f"{RUN_OUTPUT_DIR}/{today()}"
 os.makedirs(DAILY_SESSIONS_DIR, exist_ok=True)
 logging_level = logging.INFO
 
+#
+#  ----| LIVE SESSION LOG VIEWER (SEE `seqapp.logtail`)
+#
+LOG_TAIL_LINES = 500  # shown on opening the viewer
+LOG_TAIL_MAX_BYTES = 1024 ** 2  # most new log text sent per poll
+LOG_VIEWER_MAX_CHARS = 4 * 1024 ** 2  # kept in the browser's textarea
+LOG_POLL_MS = 3000
+
+#
+#  ----| SESSION AUDIT LOGS (QUEUED; SEE `seqapp.sessionlog`)
+#
+SESSION_LOG_BUFFER = 64 * 1024  # bytes buffered per open session log
+SESSION_LOG_MAX_OPEN = 64  # session log files kept open per process
+SESSION_LOG_FLUSH_S = 1.0
+
+#
+#  ----| USER PROFILES & RUN HISTORY (SERVER-SIDE; SEE `seqapp.session_store`)
+#
+SESSION_STORE_DB = f"{RUN_OUTPUT_DIR}/.session-store.sqlite3"
+SESSION_STORE_MAX_RUNS = 100  # per profile (oldest dropped)
+SESSION_STORE_RETENTION_DAYS = 180  # runs & idle profiles older are pruned
+SESSION_STORE_PRUNE_INTERVAL_S = 3600  # (per process)
+
+#
+#  ----| START UP (SEE `benchmarks.bench_import_time`)
+#
+IMPORT_TIME_BUDGET_S = float(os.getenv("IMPORT_TIME_BUDGET_S", 1.0))  # `import deploy`
+
+#
+#  ----| HTML -> DASH COMPONENTS CONVERSION CACHE (PER PROCESS)
+#
+HTML_TO_DASH_CACHE_MAX_ENTRIES = 256
+
+#
+#  ----| SERVER-SIDE (CHUNKED, RESUMABLE) FILE UPLOADS
+#
+UPLOAD_CHUNK_SIZE = 8 * 1024 ** 2  # bytes per POST to `/uploadChunk`
+UPLOAD_IO_BLOCK = 64 * 1024  # bytes per read of the request stream
+UPLOADS_MANIFEST = ".uploads.jsonl"  # per-session, append-only
+
+# Callback requests (`_dash-update-component` POSTs) larger than this are
+# logged (with their output), as no callback should carry file contents.
+CALLBACK_REQUEST_WARN_BYTES = 256 * 1024
+
+#
+#  ----| PARSED UPLOADS CACHE (KEYED BY CONTENT HASH: PER PROCESS, & PER SESSION ON DISK)
+#
+PARSE_CACHE_MAX_ENTRIES = 1000
+PARSE_CACHE_MAX_BYTES = 512 * 1024 ** 2
+PARSE_CACHE_GENERATION_FILE = ".parse-generation"  # per-session; touched on clearing uploads
+PARSE_CACHE_DIR = ".parsed"  # per-session (pickled DataFrames, shared by all workers)
+
+#
+#  ----| BACKGROUND PIPELINE JOBS
+#
+PIPELINE_SLOTS = int(os.environ.get("PIPELINE_SLOTS", mp.cpu_count()))  # host-wide cap
+PIPELINE_WORKERS = PIPELINE_SLOTS  # per-process (long-lived) pool size
+PIPELINE_MP_START_METHOD = "forkserver"  # (workers must not inherit held slot locks)
+PIPELINE_JOBS_DIR = ".jobs"  # per-session job status files
+PIPELINE_STATUS_POLL_MS = 2000
+PIPELINE_JOB_HEARTBEAT_S = 10  # owner refreshes its unfinished jobs' status files
+PIPELINE_JOB_STALE_S = 6 * PIPELINE_JOB_HEARTBEAT_S  # no heartbeat since -> failed
+GOVERNOR_DIR = f"{APP_HOME}/{APP_NAME}/app/prod/governor"  # shared by all workers
+GOVERNOR_POLL_S = 0.5
+
+#
+#  ----| OUTPUT FILES INDEX (PER PROCESS; SEE `utils.OutputIndex`)
+#
+OUTPUT_INDEX_MAX_ROOTS = 256  # session dirs (+ plasmids archive) kept indexed
+
+#
+#  ----| "DOWNLOAD ALL" ZIP ARCHIVES (STREAMED; SEE `seqapp.archive`)
+#
+ZIP_STREAM_BLOCK = 1024 ** 2  # bytes read (& sent) per member file read
+ZIP_STORED_EXTENSIONS = tuple([  # already compressed -> stored, not deflated
+    ".bam", ".bcf", ".gz", ".jpg", ".pdf", ".png", ".xlsx", ".zip",
+])
+ZIP_CACHE_DIR = ".zipcache"  # per-session; archives keyed by manifest hash
+ZIP_CACHE_MAX_BYTES = 4 * 1024 ** 3  # per-session budget (LRU eviction)
+PARALLEL_ZIP_GENRES = tuple(["ALL", "AGG_FQ"])  # deflated on a thread pool
+ZIP_COMPRESSLEVEL = {"ALL": 6, "AGG_FQ": 6}  # zlib level (0-9), by genre (else: zlib default)
+ZIP_COMPRESS_WORKERS = int(  # one pool per process, shared by all downloads
+    os.environ.get("ZIP_COMPRESS_WORKERS", max(1, mp.cpu_count() // 2))
+)
+ZIP_SPOOL_MAX_BYTES = 1024 ** 2  # compressed member kept in memory up to (then: temp file)
+ZIP_READAHEAD_BYTES = 256 * 1024 ** 2  # per download: input bytes compressed ahead of sending
+
+#
+#  ----| FILE DOWNLOADS (SEE `seqapp.downloads`)
+#
+# Set DOWNLOADS_X_ACCEL=1 when behind the shipped nginx.conf, to have nginx
+# send (authorised) files via its `internal` locations below.
+DOWNLOADS_X_ACCEL = os.environ.get("DOWNLOADS_X_ACCEL", "0") == "1"
+DOWNLOAD_ROOTS = {  # root dir -> nginx internal location
+    RUN_OUTPUT_DIR: "/protected-sessions/",
+    PLASMIDS_ARCHIVE: "/protected-plasmids/",
+}
+
+#
+#  ----| STATIC ASSETS (FINGERPRINTED; SEE `seqapp.static_assets`)
+#
+ASSETS_DIR = f"{APP_HOME}/{APP_NAME}/assets"
+STATIC_ASSETS_URL = "/static-assets/"  # (+ nginx location; see nginx.conf)
+STATIC_ASSETS_MAX_AGE = 365 * 24 * 3600  # (immutable: URLs change with content)
+STATIC_ASSETS_EXTENSIONS = tuple(
+    [".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp", ".mp4", ".webm",
+     ".woff", ".woff2", ".ttf", ".css", ".js"]
+)
+CLIENTSIDE_ASSETS = tuple(  # media referenced by `assets/clientside.js`
+    ["animations/T-Cell_TEM_4-3.mp4", "animations/dna-minimal-green.gif", "images/scope-unic.png"]
+)
+
 #
 #  ----| APPLICATION OUTPUT-DOWNLOAD COMPONENT - FILE EXT.'S OPTIONS
 # (NOTE:VARIABLE COMPONENT CONFIG)
@@ -0,0 +1,100 @@
+"""
+B U I L D I N F O  |  app.config.buildinfo
+-----------------------
+Build-time app metadata (release VERSION & latest commits, shown as
+"UPDATES"), cached as JSON next to this file.
+
+Reading the cached file costs no `git` subprocesses at import time; it
+is regenerated (via `git describe --tags` & `git log -n 50`) only if it
+is missing or was written for another commit than the checked-out HEAD
+(read straight from `.git`). Generate it ahead of deployment with:
+
+    >$ python seqapp/config/buildinfo.py [APP_HOME]
+
+(Standard library only: runnable as a script, before the app exists.)
+"""
+import json
+import os
+import subprocess
+import sys
+
+BUILD_INFO_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)), "build-info.json")
+
+
+def git_head(repo):
+    """Commit hash checked out in `repo`, read from `.git` (None if
+    unavailable, e.g. for a deployed export without git metadata)."""
+    git_dir = os.path.join(repo, ".git")
+    try:
+        with open(os.path.join(git_dir, "HEAD")) as f:
+            head = f.read().strip()
+        if not head.startswith("ref: "):
+            return head
+        ref = head[len("ref: "):]
+        try:
+            with open(os.path.join(git_dir, ref)) as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            with open(os.path.join(git_dir, "packed-refs")) as f:
+                for line in f:
+                    if line.rstrip().endswith(f" {ref}"):
+                        return line.split()[0]
+    except OSError:
+        pass
+    return None
+
+
+def git_build_info(repo):
+    """Query `git` for the app metadata.
+
+    Returns
+    -------
+    dict
+        {"commit", "version", "updates"}
+    """
+    v = subprocess.run(["git", "describe", "--tags"], cwd=repo, capture_output=True)
+    u = subprocess.run(["git", "log", "-n 50"], cwd=repo, capture_output=True)
+    updates = u.stdout.decode("utf-8").rstrip().split("\n\ncommit")
+    # Remove "commit" from only first item in array for consistency
+    updates = [updates[0][7:]] + updates[1:]
+    return {
+        "commit": git_head(repo),
+        "version": v.stdout.decode("utf-8").rstrip(),
+        "updates": updates,
+    }
+
+
+def write_build_info(repo, path=BUILD_INFO_FILE):
+    """(Re)generate the build metadata file from `git`."""
+    info = git_build_info(repo)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(info, f)
+    os.replace(tmp, path)
+    return info
+
+
+def load_build_info(repo, path=BUILD_INFO_FILE):
+    """Cached build metadata, regenerated if stale or missing.
+
+    Returns
+    -------
+    dict
+        {"commit", "version", "updates"}
+    """
+    try:
+        with open(path) as f:
+            info = json.load(f)
+        head = git_head(repo)
+        if head is None or info.get("commit") == head:
+            return info
+    except (OSError, ValueError):
+        pass
+    try:
+        return write_build_info(repo, path)
+    except OSError:  # (e.g., read-only deployment)
+        return git_build_info(repo)
+
+
+if __name__ == "__main__":
+    write_build_info(sys.argv[1] if len(sys.argv) > 1 else "/var/www/Apps/dash-webapp-template")
@@ -0,0 +1,100 @@
+"""
+D O W N L O A D S  |  app.downloads
+-------------------
+Authorised file downloads, optionally offloaded to nginx.
+
+The app only ever serves regular files under one of the
+`DOWNLOAD_ROOTS` (session outputs & plasmids archive). With
+`DOWNLOADS_X_ACCEL` on, a download response carries no body at all: it
+is an `X-Accel-Redirect` to the root's `internal` nginx location (see
+`config/dependencies/nginx/nginx.conf`), and nginx sends the file itself
+(with `sendfile`, ETag / If-None-Match and byte ranges), freeing the
+gunicorn worker at once. Otherwise, Flask sends the file, also
+answering conditional & Range requests.
+
+Attributes
+----------
+logger : logging.Logger
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+from urllib.parse import quote
+
+from seqapp.config import *
+
+logger = logging.getLogger(__name__)
+
+
+def authorize(filepath, allow_hidden=False):
+    """Resolve a requested download path, refusing anything but regular
+    files under the `DOWNLOAD_ROOTS`.
+
+    Parameters
+    ----------
+    filepath : str
+    allow_hidden : bool, optional
+        Whether paths through hidden (".") entries - app-internal state,
+        e.g. `.jobs/` - may be served.
+
+    Returns
+    -------
+    tuple
+        (real path, download root, nginx internal location)
+
+    Raises
+    ------
+    PermissionError
+        If the path is outside every download root, or hidden.
+    FileNotFoundError
+        If it is not an existing regular file.
+    """
+    realpath = os.path.realpath(filepath)
+    for root, location in DOWNLOAD_ROOTS.items():
+        root = os.path.realpath(root)
+        if realpath.startswith(root + os.sep):
+            relpath = os.path.relpath(realpath, root)
+            if not allow_hidden and any(p.startswith(".") for p in relpath.split(os.sep)):
+                raise PermissionError(f"Download refused (hidden path): {filepath}")
+            if not os.path.isfile(realpath):
+                raise FileNotFoundError(f"No such file: {filepath}")
+            return realpath, root, location
+    raise PermissionError(f"Download refused (outside download roots): {filepath}")
+
+
+def send_download(filepath, download_name=None, mimetype=None, allow_hidden=False):
+    """Response sending an (authorised) file as an attachment.
+
+    Parameters
+    ----------
+    filepath : str
+    download_name : str, optional
+        Defaults to the file's basename.
+    mimetype : str, optional
+    allow_hidden : bool, optional
+        See `authorize`.
+
+    Returns
+    -------
+    flask.Response
+        An `X-Accel-Redirect` (if `DOWNLOADS_X_ACCEL`), else the file.
+    """
+    realpath, root, location = authorize(filepath, allow_hidden=allow_hidden)
+    download_name = download_name or os.path.basename(realpath)
+    if DOWNLOADS_X_ACCEL:
+        response = flask.Response(mimetype=mimetype or "application/octet-stream")
+        response.headers["X-Accel-Redirect"] = location + quote(os.path.relpath(realpath, root))
+        response.headers["Content-Disposition"] = (
+            f"attachment; filename*=UTF-8''{quote(download_name)}"
+        )
+        return response
+    return flask.send_file(
+        realpath,
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=download_name,
+        conditional=True,
+        etag=True,
+    )
@@ -0,0 +1,215 @@
+"""
+G O V E R N O R  |  app.governor
+-----------------------
+Host-wide admission control for pipeline CPU slots.
+
+Every gunicorn worker (and every thread therein) shares the same
+`PIPELINE_SLOTS` slots, implemented as `flock`-ed lock files under
+`GOVERNOR_DIR`, so that no matter how many users launch runs at once,
+at most `PIPELINE_SLOTS` pipeline processes compute concurrently.
+
+Runs wait their turn in a FIFO queue: a `Ticket` is a numbered entry
+file in `GOVERNOR_DIR/queue`, held `flock`-ed by its owner for as long
+as it waits. Only the ticket at the head of the queue may take free
+slots, and a ticket's position is the number of live tickets ahead of
+it. Locks are released by the kernel when their owner dies, so entries
+& slots of crashed workers never block the queue. Note that a process
+*forked* while a slot is held shares its lock until it exits too (hence
+the forkserver-started pool of `seqapp.jobs`); lock fds are opened
+close-on-exec, so exec'd subprocesses never hold one.
+
+Examples
+--------
+>>> with Ticket(label=job_id) as ticket:
+...     for sample in samples:
+...         slot = ticket.acquire_slot(on_wait=report_position)
+...         run(sample, then=slot.release)
+
+>>> with slots(4, label="dfapply") as held:
+...     with mp.Pool(len(held)) as p:
+...         ...
+
+Attributes
+----------
+logger : logging.Logger
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import contextlib
+import fcntl
+
+from seqapp.config import *
+
+logger = logging.getLogger(__name__)
+
+
+def _dirs():
+    queue_dir = os.path.join(GOVERNOR_DIR, "queue")
+    slots_dir = os.path.join(GOVERNOR_DIR, "slots")
+    os.makedirs(queue_dir, exist_ok=True)
+    os.makedirs(slots_dir, exist_ok=True)
+    return queue_dir, slots_dir
+
+
+def _next_ticket_number():
+    """Host-wide monotonically increasing ticket counter."""
+    with open(os.path.join(GOVERNOR_DIR, "tickets"), "a+") as counter:
+        fcntl.flock(counter, fcntl.LOCK_EX)
+        counter.seek(0)
+        number = int(counter.read() or 0) + 1
+        counter.seek(0)
+        counter.truncate()
+        counter.write(f"{number}")
+    return number
+
+
+def _is_live(entry_path):
+    """Whether a queue entry is still held by a (live) waiting process;
+    stale entries (owner gone) are removed on sight."""
+    try:
+        fd = os.open(entry_path, os.O_RDONLY)
+    except FileNotFoundError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(entry_path)
+    return False
+
+
+class Slot:
+    """One held pipeline CPU slot; `release()` (idempotent) frees it."""
+
+    def __init__(self, index, fd):
+        self.index = index
+        self._fd = fd
+
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)  # (drops the flock)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class Ticket:
+    """A place in the host-wide FIFO queue for pipeline slots.
+
+    Parameters
+    ----------
+    label : str, optional
+        Shown in the queue entry's filename (e.g., the job ID).
+    """
+
+    def __init__(self, label=""):
+        queue_dir, self._slots_dir = _dirs()
+        self.number = _next_ticket_number()
+        name = f"{self.number:020d}-{os.getpid()}-{rpunct(f'{label}')[:40]}"
+        # Lock *before* the entry becomes visible, so that it is never
+        # mistaken for a stale one.
+        tmp = os.path.join(queue_dir, f".{name}")
+        self._fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        self.entry = os.path.join(queue_dir, name)
+        os.rename(tmp, self.entry)
+
+    def position(self):
+        """Number of live tickets ahead of this one (0 = head of queue)."""
+        queue_dir = os.path.dirname(self.entry)
+        ahead = [
+            e for e in os.listdir(queue_dir)
+            if not e.startswith(".") and int(e.split("-")[0]) < self.number
+        ]
+        return sum(_is_live(os.path.join(queue_dir, e)) for e in ahead)
+
+    def _try_slot(self):
+        for index in range(PIPELINE_SLOTS):
+            fd = os.open(
+                os.path.join(self._slots_dir, f"{index}.lock"),
+                os.O_RDWR | os.O_CREAT | os.O_CLOEXEC,
+                0o644,
+            )
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            return Slot(index, fd)
+        return None
+
+    def acquire_slot(self, on_wait=None):
+        """Block until this ticket is at the head of the queue and a slot
+        is free; then take it.
+
+        Parameters
+        ----------
+        on_wait : callable, optional
+            Called with the current queue position (int) on every
+            unsuccessful poll.
+
+        Returns
+        -------
+        Slot
+        """
+        while True:
+            position = self.position()
+            if position == 0:
+                slot = self._try_slot()
+                if slot is not None:
+                    return slot
+            if on_wait:
+                on_wait(position)
+            time.sleep(GOVERNOR_POLL_S)
+
+    def close(self):
+        """Leave the queue (slots already taken stay held)."""
+        if self._fd is not None:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.entry)
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextlib.contextmanager
+def slots(n=1, label="", on_wait=None):
+    """Queue for, then hold, `n` slots (capped at `PIPELINE_SLOTS`) for
+    the duration of the `with` block.
+
+    Yields
+    ------
+    list of Slot
+    """
+    held = []
+    try:
+        with Ticket(label) as ticket:
+            for _ in range(max(1, min(n, PIPELINE_SLOTS))):
+                held.append(ticket.acquire_slot(on_wait=on_wait))
+        yield held
+    finally:
+        for slot in held:
+            slot.release()
+
+
+def queue_length():
+    """Number of live tickets currently waiting, host-wide."""
+    queue_dir, _ = _dirs()
+    return sum(
+        _is_live(os.path.join(queue_dir, e)) for e in os.listdir(queue_dir) if not e.startswith(".")
+    )
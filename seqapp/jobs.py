@@ -0,0 +1,382 @@
+"""
+J O B S  |  app.jobs
+-----------------
+Background job engine for (per-sample) pipeline runs.
+
+`submit` returns a job ID immediately: a dispatcher thread queues the
+job in the host-wide FIFO of `seqapp.governor` and, as pipeline CPU
+slots become free, hands each sample to a long-lived, per-process
+`ProcessPoolExecutor` (created once, on first use, rather than a fresh
+`mp.Pool` per request); the callback thread is released right away.
+The samples may themselves be the outcome of a first, "preparing" task
+run on the pool (e.g., parsing the uploads into per-sample directories),
+so that no input processing happens within the request either.
+The pool's workers are started by a "forkserver", never forked from
+the dispatching process itself: a forked worker would inherit (& keep
+locked, for its whole life) the governor slot held at that moment.
+Job progress is written as JSON to
+`<session output dir>/.jobs/<job_id>.json` as samples finish, so that
+the status can be polled (see `job_status`) from *any* gunicorn worker,
+not just the one which launched the job. Jobs live in the process which
+launched them (their "owner"): while unfinished, their status carries
+the owner's pid & a heartbeat, refreshed every `PIPELINE_JOB_HEARTBEAT_S`,
+and a job whose owner is gone (e.g., a worker recycled by gunicorn's
+`--max-requests`) is reported - and recorded - as failed.
+
+Attributes
+----------
+logger : logging.Logger
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import atexit
+import contextlib
+import pickle
+import socket
+import uuid
+
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+
+from seqapp.config import *
+from seqapp import governor
+from seqapp import sessionlog
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+_jobs = {}
+_heartbeat = {"pid": None}
+
+
+def _get_executor():
+    """The process-wide worker pool (re-created after a fork)."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=PIPELINE_WORKERS, mp_context=mp.get_context(PIPELINE_MP_START_METHOD)
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _jobs_dir(session_dir):
+    return os.path.join(session_dir, PIPELINE_JOBS_DIR)
+
+
+def _write_json(filepath, obj):
+    """Atomically (re)write `obj` as JSON to `filepath`."""
+    tmp = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(obj, f)
+    os.replace(tmp, filepath)
+
+
+class Job:
+    """Book-keeping of one submitted job, within the submitting process.
+
+    Parameters
+    ----------
+    session_dir : str
+        Session output directory the job's status is written to.
+    samples : list of str
+        Names of the samples (one task each).
+    preparing : bool, optional
+        Whether the samples are yet to be set (see `prepared`).
+    """
+
+    def __init__(self, session_dir, samples, preparing=False):
+        self.job_id = f"JOB_{now()}_{uuid.uuid4().hex[:8]}"
+        self.session_dir = session_dir
+        self.samples = [*samples]
+        self.results = {}
+        self._lock = threading.Lock()
+        self._t0 = tns()
+        self.status = {
+            "job_id": self.job_id,
+            "state": "queued" if self.samples or preparing else "done",
+            "queue_position": None,
+            "submitted": now(),
+            "elapsed": None,
+            "total": len(self.samples),
+            "n_done": 0,
+            "n_failed": 0,
+            "samples": {s: {"state": "queued"} for s in self.samples},
+            "owner": {"host": socket.gethostname(), "pid": os.getpid()},
+            "heartbeat": None,
+        }
+        os.makedirs(_jobs_dir(session_dir), exist_ok=True)
+        self.save()
+
+    @property
+    def status_file(self):
+        return os.path.join(_jobs_dir(self.session_dir), f"{self.job_id}.json")
+
+    def save(self):
+        self.status["heartbeat"] = time.time()
+        _write_json(self.status_file, self.status)
+
+    def beat(self):
+        """Refresh the heartbeat of the (unfinished) job."""
+        with self._lock:
+            if self.job_id in _jobs:
+                self.save()
+
+    def abort(self, error, running=False):
+        """Fail every sample not started yet (e.g., the dispatcher failed),
+        and - if `running` (the owner process is exiting) - the running
+        ones too; otherwise, those still report in via `sample_done`."""
+        with self._lock:
+            self.status["error"] = error
+            for entry in self.status["samples"].values():
+                if entry["state"] == "queued" or (running and entry["state"] == "running"):
+                    entry.update(state="failed", error=error)
+                    self.status["n_failed"] += 1
+            self.status["queue_position"] = None
+            finished = self.status["n_done"] + self.status["n_failed"]
+            if finished == self.status["total"]:
+                self.finish()
+            self.save()
+
+    def queued(self, position):
+        """`governor` wait-callback: record the job's place in the queue."""
+        with self._lock:
+            if self.status["queue_position"] != position:
+                self.status["queue_position"] = position
+                self.save()
+
+    def preparing(self):
+        with self._lock:
+            self.status["state"] = "preparing"
+            self.status["queue_position"] = None
+            self.save()
+
+    def prepared(self, samples):
+        """Set the samples output by the preparing task."""
+        with self._lock:
+            self.samples = [*samples]
+            self.status["total"] = len(self.samples)
+            self.status["samples"] = {s: {"state": "queued"} for s in self.samples}
+            if not self.samples:
+                self.finish()
+            self.save()
+
+    def sample_started(self, sample):
+        with self._lock:
+            self.status["state"] = "running"
+            self.status["queue_position"] = None
+            self.status["samples"][sample]["state"] = "running"
+            self.save()
+
+    def sample_done(self, sample, slot, future):
+        """`Future` done-callback: free the sample's CPU slot, then record
+        its outcome, and - once all samples have finished - the final job
+        state & results."""
+        slot.release()
+        with self._lock:
+            entry = self.status["samples"][sample]
+            error = future.exception()
+            if error is None:
+                self.results[sample] = future.result()
+                entry["state"] = "done"
+                self.status["n_done"] += 1
+            else:
+                entry["state"] = "failed"
+                entry["error"] = f"{type(error).__name__}: {error}"
+                self.status["n_failed"] += 1
+                logger.error(f"Pipeline job {self.job_id}: sample {sample} failed: {error}")
+            finished = self.status["n_done"] + self.status["n_failed"]
+            if finished == self.status["total"]:
+                self.finish()
+            self.save()
+
+    def finish(self):
+        """Mark the job complete, persisting per-sample results (in sample order)."""
+        failed = self.status["n_failed"] or self.status.get("error")
+        self.status["state"] = "failed" if failed else "done"
+        self.status["elapsed"] = gtt(self._t0)
+        results_file = os.path.join(_jobs_dir(self.session_dir), f"{self.job_id}.pkl")
+        with open(results_file, "wb") as f:
+            pickle.dump([self.results.get(s) for s in self.samples], f)
+        _jobs.pop(self.job_id, None)
+        logger.info(
+            f"Pipeline job {self.job_id} {self.status['state']} "
+            f"({self.status['n_done']}/{self.status['total']} samples) in {self.status['elapsed']}"
+        )
+
+
+def submit(session_dir, func, samples, **kwargs):
+    """Queue `func(sample, **kwargs)` for every sample on the worker pool.
+
+    Parameters
+    ----------
+    session_dir : str
+        Current session output directory.
+    func : callable
+        Module-level (i.e., picklable) per-sample task.
+    samples : list of str, or callable
+        The samples; or a module-level task `samples(**kwargs)` returning
+        them, run first (in a slot of the worker pool, as the job's
+        "preparing" state) - e.g., to write the sample inputs.
+    **kwargs
+        Passed through to every `func` (& `samples`) call.
+
+    Returns
+    -------
+    str
+        Job ID, for `job_status` / `job_results`.
+    """
+    prepare = samples if callable(samples) else None
+    job = Job(session_dir, [] if prepare else samples, preparing=prepare is not None)
+    _jobs[job.job_id] = job
+    _start_heartbeat()
+    if not job.samples and not prepare:
+        job.finish()
+        job.save()
+        return job.job_id
+    threading.Thread(
+        target=_dispatch,
+        args=(job, func, kwargs, prepare),
+        name=f"dispatch-{job.job_id}",
+        daemon=True,
+    ).start()
+    logger.info(
+        f"Submitted pipeline job {job.job_id} "
+        + ("(samples to be prepared)" if prepare else f"({len(job.samples)} samples)")
+    )
+    return job.job_id
+
+
+def _run_task(func, args, kwargs):
+    """Worker-side task wrapper: logs to the session log (if any)."""
+    sessionlog.install(logging.getLogger(APP_NAME))  # (= app.logger)
+    with sessionlog.session(kwargs.get("session_log_file")):
+        return func(*args, **kwargs)
+
+
+def _start_heartbeat():
+    """Start (once per process) the thread refreshing the heartbeat of
+    this process' unfinished jobs."""
+    with _executor_lock:
+        if _heartbeat["pid"] == os.getpid():
+            return
+        _heartbeat["pid"] = os.getpid()
+    threading.Thread(target=_beat, name="jobs-heartbeat", daemon=True).start()
+
+
+def _beat():
+    while True:
+        time.sleep(PIPELINE_JOB_HEARTBEAT_S)
+        for job in [*_jobs.values()]:
+            try:
+                job.beat()
+            except OSError as e:
+                logger.warning(f"Pipeline job {job.job_id}: heartbeat failed: {e}")
+
+
+@atexit.register
+def _abort_jobs():
+    """On (orderly) exit, fail this process' unfinished jobs right away."""
+    for job in [*_jobs.values()]:
+        with contextlib.suppress(Exception):
+            job.abort(f"Worker process {os.getpid()} exited before the job finished", running=True)
+
+
+def _dispatch(job, func, kwargs, prepare=None):
+    """Feed a job's samples to the worker pool (see `_dispatch_samples`);
+    if dispatching (or preparing) fails, the samples not yet started are
+    failed."""
+    try:
+        _dispatch_samples(job, func, kwargs, prepare)
+    except Exception as e:
+        logger.exception(f"Pipeline job {job.job_id}: dispatch failed")
+        job.abort(f"{type(e).__name__}: {e}")
+
+
+def _dispatch_samples(job, func, kwargs, prepare=None):
+    """Feed a job's samples to the worker pool, one per governor slot
+    (holding the job's place at the head of the queue until all of its
+    samples have been started), after running `prepare` for them, if
+    given."""
+    executor = _get_executor()
+    with governor.Ticket(label=job.job_id) as ticket:
+        if prepare is not None:
+            with ticket.acquire_slot(on_wait=job.queued):
+                job.preparing()
+                job.prepared(executor.submit(_run_task, prepare, (), kwargs).result())
+        for sample in job.samples:
+            slot = ticket.acquire_slot(on_wait=job.queued)
+            job.sample_started(sample)
+            try:
+                future = executor.submit(_run_task, func, (sample,), kwargs)
+            except Exception as e:  # (e.g., broken pool) -> fail the sample
+                future = Future()
+                future.set_exception(e)
+            future.add_done_callback(partial(job.sample_done, sample, slot))
+
+
+def job_status(session_dir, job_id):
+    """Latest persisted status of a job (None if unknown).
+
+    An unfinished job whose owner process is gone (or whose heartbeat
+    is older than `PIPELINE_JOB_STALE_S`) is recorded as failed.
+
+    Returns
+    -------
+    dict
+        {"job_id", "state" ('queued'|'preparing'|'running'|'done'|'failed'),
+        "queue_position" (runs ahead, while queued), "submitted",
+        "elapsed", "total", "n_done", "n_failed", "samples": {name:
+        {"state"[, "error"]}}, "owner": {"host", "pid"}, "heartbeat"
+        [, "error" (job-level)]}
+    """
+    status_file = os.path.join(_jobs_dir(session_dir), f"{os.path.basename(job_id)}.json")
+    try:
+        with open(status_file) as f:
+            status = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if status["state"] in ("queued", "preparing", "running") and not _owner_alive(status):
+        error = f"Job owner process {status['owner']['pid']} is gone"
+        logger.error(f"Pipeline job {status['job_id']}: {error}; marking it failed")
+        status.update(state="failed", error=error, queue_position=None)
+        for entry in status["samples"].values():
+            if entry["state"] in ("queued", "running"):
+                entry.update(state="failed", error=error)
+                status["n_failed"] += 1
+        _write_json(status_file, status)
+    return status
+
+
+def _owner_alive(status):
+    """Whether the process running a job is (presumably) still alive."""
+    owner = status.get("owner")
+    if owner is None or status.get("heartbeat") is None:
+        return True
+    if time.time() - status["heartbeat"] > PIPELINE_JOB_STALE_S:
+        return False
+    if owner["host"] == socket.gethostname():
+        try:
+            os.kill(owner["pid"], 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+    return True
+
+
+def job_results(session_dir, job_id):
+    """Per-sample results of a finished job, in sample order (None for
+    failed samples); [] if the job has not finished."""
+    results_file = os.path.join(_jobs_dir(session_dir), f"{os.path.basename(job_id)}.pkl")
+    if not os.path.exists(results_file):
+        return []
+    with open(results_file, "rb") as f:
+        return pickle.load(f)
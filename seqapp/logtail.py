@@ -0,0 +1,98 @@
+"""
+L O G T A I L  |  app.logtail
+-----------------
+Incremental reads of (growing) log files.
+
+Rather than re-reading & re-sending whole session logs, the log viewer
+first shows the last lines of each log (`tail`, reading backwards from
+the end of the file), then polls for whatever was appended since the
+byte offset it last saw (`read_from`). Only whole lines are ever
+returned, so a line still being written is picked up on the next poll.
+
+Examples
+--------
+>>> text, offset = tail(log_file, n=100)
+>>> new_text, offset = read_from(log_file, offset)
+
+Attributes
+----------
+logger : logging.Logger
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+from seqapp.config import *
+
+logger = logging.getLogger(__name__)
+
+_BLOCK = 64 * 1024
+
+
+def read_from(filepath, offset=0, max_bytes=None):
+    """Whole lines appended to a file since byte `offset`.
+
+    If the file is now shorter than `offset` (truncated or rotated), it
+    is read again from the start; if more than `max_bytes` (default
+    `LOG_TAIL_MAX_BYTES`) are new, only the lines within the last
+    `max_bytes` are returned.
+
+    Parameters
+    ----------
+    filepath : str
+    offset : int, optional
+    max_bytes : int, optional
+
+    Returns
+    -------
+    tuple
+        (text, new offset) - resume the next read from the new offset.
+    """
+    max_bytes = max_bytes or LOG_TAIL_MAX_BYTES
+    try:
+        size = os.path.getsize(filepath)
+    except FileNotFoundError:
+        return "", 0
+    if size < offset:
+        offset = 0
+    if size == offset:
+        return "", offset
+    with open(filepath, "rb") as f:
+        skip = size - offset > max_bytes
+        f.seek(size - max_bytes if skip else offset)
+        data = f.read(size - f.tell())
+    if skip:  # drop the (partial) first line
+        data = data[data.find(b"\n") + 1:]
+    end = data.rfind(b"\n") + 1  # (0 if no complete line yet)
+    new_offset = (size - len(data) if skip else offset) + end
+    return data[:end].decode("utf-8", errors="replace"), new_offset
+
+
+def tail(filepath, n=None):
+    """Last `n` (default `LOG_TAIL_LINES`) whole lines of a file, read
+    backwards block by block from its end.
+
+    Returns
+    -------
+    tuple
+        (text, offset of the end of the last line) - pass the offset to
+        `read_from` to follow the file from there.
+    """
+    n = n or LOG_TAIL_LINES
+    try:
+        f = open(filepath, "rb")
+    except FileNotFoundError:
+        return "", 0
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        position, data = end, b""
+        while position > 0 and data.count(b"\n") <= n:
+            step = min(_BLOCK, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    complete = data.rfind(b"\n") + 1
+    end -= len(data) - complete
+    lines = data[:complete].splitlines(keepends=True)[-n:]
+    return b"".join(lines).decode("utf-8", errors="replace"), end
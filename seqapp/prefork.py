@@ -0,0 +1,113 @@
+"""
+P R E F O R K  |  app.prefork
+-----------------
+Production (gunicorn `--preload`) entry point: the app, fully warmed
+in the master process before it forks its workers.
+
+Importing this module imports the whole app (`deploy`), loads the
+lazily-imported scientific stack (see `config.LazyModule`), the entity
+schemas & the 404 page, and renders the index page, layout & callback dependencies
+once (compiling & caching their payloads, and running Flask's first-
+request setup). It then `gc.freeze()`s every object allocated so far,
+so that the garbage collector never touches (& thereby copies) those
+pages in the workers: forked workers share the warm heap copy-on-write,
+and workers recycled by `--max-requests` serve from their first request.
+
+    >$ gunicorn --preload ... seqapp.prefork:server
+
+`/readyz` answers `200` once the process is warm (`503` before).
+
+Attributes
+----------
+logger : logging.Logger
+server : flask.Flask
+WARMUP : dict
+    Warm-up report: {"ready", "pid", "seconds", "modules", "errors"}.
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import gc
+
+from werkzeug.routing import Rule
+
+from seqapp import config
+from seqapp.config import *
+
+from deploy import app, compile_404_page, server
+
+logger = logging.getLogger(__name__)
+
+WARM_PATHS = ("/", "_dash-layout", "_dash-dependencies")
+
+WARMUP = {"ready": False, "pid": None, "seconds": None, "modules": [], "errors": []}
+
+
+def load_lazy_modules():
+    """Import every `config.LazyModule` now (so that workers share them)."""
+    loaded = []
+    for name, value in vars(config).items():
+        if isinstance(value, LazyModule):
+            try:
+                value._load()
+                loaded.append(value.__name__)
+            except ImportError as e:
+                WARMUP["errors"].append(f"{name}: {e}")
+    return loaded
+
+
+def render_warm_paths():
+    """Request each of `WARM_PATHS` once, through the Flask test client."""
+    prefix = app.config.routes_pathname_prefix
+    with server.test_client() as client:
+        for path in WARM_PATHS:
+            url = path if path.startswith("/") else f"{prefix}{path}"
+            status = client.get(url).status_code
+            if status != 200:
+                WARMUP["errors"].append(f"GET {url}: {status}")
+
+
+def warm():
+    """Warm this (master) process up, then freeze the GC-tracked heap.
+
+    Returns
+    -------
+    dict
+        `WARMUP`
+    """
+    t0 = time.perf_counter()
+    WARMUP["modules"] = load_lazy_modules()
+    try:
+        get_entity_schemas()
+    except (OSError, ValueError) as e:
+        WARMUP["errors"].append(f"entity schemas: {e}")
+    try:
+        compile_404_page()
+    except OSError as e:
+        WARMUP["errors"].append(f"404 page: {e}")
+    render_warm_paths()
+    gc.collect()
+    gc.freeze()
+    WARMUP.update(ready=True, pid=os.getpid(), seconds=round(time.perf_counter() - t0, 3))
+    for error in WARMUP["errors"]:
+        logger.warning(f"Warm-up: {error}")
+    logger.info(
+        f"Warm-up done in {WARMUP['seconds']}s ({len(WARMUP['modules'])} modules"
+        f" preloaded; {gc.get_freeze_count():,d} objects frozen)."
+    )
+    return WARMUP
+
+
+server.url_map.add(Rule("/readyz", endpoint="/readyz"))
+
+
+@server.endpoint("/readyz")
+def readyz():
+    """Readiness probe: `200` once warm, `503` until then."""
+    return flask.jsonify(dict(WARMUP, worker=os.getpid())), (200 if WARMUP["ready"] else 503)
+
+
+warm()
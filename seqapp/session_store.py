@@ -0,0 +1,201 @@
+"""
+S E S S I O N _ S T O R E  |  app.session_store
+---------------------------
+Server-side user profiles & run history (SQLite).
+
+The browser's `local` store only holds an opaque profile token; the
+profile (account, sign-on count, ...) and the history of its runs (the
+session data of each sign-on) live in `SESSION_STORE_DB`, shared by all
+workers (WAL mode: readers never block the writer). Each profile keeps
+its latest `SESSION_STORE_MAX_RUNS` runs, and runs & idle profiles older
+than `SESSION_STORE_RETENTION_DAYS` are pruned as sign-ons come in.
+
+Examples
+--------
+>>> token = session_store.record_sign_on(token, account, name, RUN_ID, data)
+>>> session_store.recent_runs(token, limit=10)
+
+Attributes
+----------
+logger : logging.Logger
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import contextlib
+import secrets
+import sqlite3
+
+from seqapp.config import *
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    token TEXT PRIMARY KEY,
+    account TEXT NOT NULL,
+    name TEXT,
+    created REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    logins INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    token TEXT NOT NULL REFERENCES profiles (token) ON DELETE CASCADE,
+    created REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_token ON runs (token, created DESC);
+CREATE INDEX IF NOT EXISTS runs_by_age ON runs (created);
+"""
+
+_local = threading.local()
+_last_prune = {"pid": None, "t": 0.0}
+
+
+def _connect():
+    """This thread's connection (re-opened after a fork)."""
+    db = getattr(_local, "db", None)
+    if db is None or _local.pid != os.getpid():
+        os.makedirs(os.path.dirname(SESSION_STORE_DB), exist_ok=True)
+        db = sqlite3.connect(SESSION_STORE_DB, timeout=10, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA foreign_keys=ON")
+        db.executescript(SCHEMA)
+        _local.db, _local.pid = db, os.getpid()
+    return db
+
+
+@contextlib.contextmanager
+def _transaction(db):
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        yield db
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+
+
+def profile(token):
+    """The profile a token stands for.
+
+    Returns
+    -------
+    dict or None
+        {"token", "account", "name", "created", "last_seen", "logins"}
+    """
+    if not token:
+        return None
+    row = _connect().execute("SELECT * FROM profiles WHERE token = ?", (token,)).fetchone()
+    return dict(row) if row else None
+
+
+def record_sign_on(token, account, name, RUN_ID, data):
+    """Record a sign-on (& its new run) for the browser holding `token`.
+
+    A new profile (& token) is created if the token is unknown or was
+    issued for another account.
+
+    Parameters
+    ----------
+    token : str or None
+        As held by the browser.
+    account : str
+    name : str
+    RUN_ID : str
+    data : dict
+        Session data of the run (JSON-serializable).
+
+    Returns
+    -------
+    str
+        The profile token for the browser to keep.
+    """
+    db = _connect()
+    t = time.time()
+    with _transaction(db):
+        row = db.execute("SELECT account FROM profiles WHERE token = ?", (token,)).fetchone()
+        if row is None or row["account"] != account:
+            token = secrets.token_urlsafe(24)
+            db.execute(
+                "INSERT INTO profiles (token, account, name, created, last_seen) VALUES (?, ?, ?, ?, ?)",
+                (token, account, name, t, t),
+            )
+        db.execute(
+            "UPDATE profiles SET logins = logins + 1, last_seen = ?, name = ? WHERE token = ?",
+            (t, name, token),
+        )
+        db.execute(
+            "INSERT OR REPLACE INTO runs (run_id, token, created, data) VALUES (?, ?, ?, ?)",
+            (RUN_ID, token, t, json.dumps(data)),
+        )
+        db.execute(
+            """DELETE FROM runs WHERE token = ? AND run_id NOT IN (
+                   SELECT run_id FROM runs WHERE token = ? ORDER BY created DESC LIMIT ?
+               )""",
+            (token, token, SESSION_STORE_MAX_RUNS),
+        )
+    _maybe_prune()
+    return token
+
+
+def recent_runs(token, limit=10):
+    """Latest runs of a profile, most recent first.
+
+    Returns
+    -------
+    list of dict
+        {"run_id", "created", "data"}
+    """
+    if not token:
+        return []
+    rows = _connect().execute(
+        "SELECT run_id, created, data FROM runs WHERE token = ? ORDER BY created DESC LIMIT ?",
+        (token, limit),
+    )
+    return [
+        {"run_id": r["run_id"], "created": r["created"], "data": json.loads(r["data"])}
+        for r in rows
+    ]
+
+
+def prune(max_age_days=None):
+    """Delete runs, then profiles without runs, idle for longer than
+    `max_age_days` (default `SESSION_STORE_RETENTION_DAYS`).
+
+    Returns
+    -------
+    tuple
+        (runs deleted, profiles deleted)
+    """
+    cutoff = time.time() - (max_age_days or SESSION_STORE_RETENTION_DAYS) * 86400
+    db = _connect()
+    with _transaction(db):
+        runs = db.execute("DELETE FROM runs WHERE created < ?", (cutoff,)).rowcount
+        profiles = db.execute(
+            """DELETE FROM profiles WHERE last_seen < ?
+               AND NOT EXISTS (SELECT 1 FROM runs WHERE runs.token = profiles.token)""",
+            (cutoff,),
+        ).rowcount
+    if runs or profiles:
+        logger.info(f"Session store pruned: {runs} run(s), {profiles} profile(s)")
+    return runs, profiles
+
+
+def _maybe_prune():
+    """`prune`, at most every `SESSION_STORE_PRUNE_INTERVAL_S` per process."""
+    if (
+        _last_prune["pid"] == os.getpid()
+        and time.time() - _last_prune["t"] < SESSION_STORE_PRUNE_INTERVAL_S
+    ):
+        return
+    _last_prune.update(pid=os.getpid(), t=time.time())
+    try:
+        prune()
+    except sqlite3.Error as e:
+        logger.warning(f"Session store pruning failed: {e}")
@@ -0,0 +1,188 @@
+"""
+S E S S I O N L O G  |  app.sessionlog
+---------------------
+Non-blocking, per-session audit logging.
+
+A single `QueueHandler` on the app logger stamps each record with the
+log file of the session it belongs to (carried in a `contextvars`
+variable; see `bind` / `session`) and only enqueues it - callbacks
+never wait on disk I/O. One background listener thread per process
+routes records to their session files through buffered, LRU-bounded
+file handles, flushed every `SESSION_LOG_FLUSH_S` seconds (at once for
+warnings & errors, and at exit), so handler counts no longer grow with
+every sign on.
+
+Examples
+--------
+>>> sessionlog.install(app.logger, app.server)  # (once, at import)
+>>> sessionlog.bind(session_log_file)  # (within a request)
+>>> app.logger.info("...")  # -> session_log_file
+
+>>> with sessionlog.session(session_log_file):  # (outside requests)
+...     logger.info("...")
+
+Attributes
+----------
+logger : logging.Logger
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import atexit
+import contextlib
+import contextvars
+import logging.handlers
+import queue
+
+from seqapp.config import *
+
+logger = logging.getLogger(__name__)
+
+SESSION_LOG_FORMAT = (
+    "%(asctime)s %(name)s %(processName)-12s %(module)s➜%(funcName)-40s↴\n"
+    "%(asctime)s ⎙=%(levelname)s: %(message)s"
+)
+
+_session_log = contextvars.ContextVar("session_log", default=None)
+
+_state = {"pid": None, "queue": None, "listener": None, "router": None}
+_state_lock = threading.Lock()
+
+
+def bind(log_file):
+    """Route records logged from the current context (e.g., the current
+    request's callback) to `log_file`; reset after each request."""
+    return _session_log.set(log_file or None)
+
+
+def unbind(token=None):
+    if token is not None:
+        _session_log.reset(token)
+    else:
+        _session_log.set(None)
+
+
+@contextlib.contextmanager
+def session(log_file):
+    """Route records logged within the `with` block to `log_file`."""
+    token = bind(log_file)
+    try:
+        yield
+    finally:
+        unbind(token)
+
+
+def current_log_file():
+    return _session_log.get()
+
+
+class _RoutingHandler(logging.Handler):
+    """Listener-side handler: appends each record to its session's log
+    file, keeping at most `SESSION_LOG_MAX_OPEN` (buffered) files open."""
+
+    def __init__(self):
+        super().__init__(level=logging_level)
+        self.setFormatter(logging.Formatter(SESSION_LOG_FORMAT))
+        self._files = collections.OrderedDict()
+
+    def _file(self, log_file):
+        f = self._files.pop(log_file, None)
+        if f is None:
+            f = open(log_file, "a", buffering=SESSION_LOG_BUFFER, encoding="utf-8")
+            while len(self._files) >= SESSION_LOG_MAX_OPEN:
+                self._files.popitem(last=False)[1].close()
+        self._files[log_file] = f
+        return f
+
+    def emit(self, record):
+        try:
+            f = self._file(record.session_log)
+            f.write(self.format(record) + "\n")
+            if record.levelno >= logging.WARNING:
+                f.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        with self.lock:
+            for f in self._files.values():
+                with contextlib.suppress(OSError, ValueError):
+                    f.flush()
+
+    def close(self):
+        with self.lock:
+            for f in self._files.values():
+                with contextlib.suppress(OSError, ValueError):
+                    f.close()
+            self._files.clear()
+        super().close()
+
+
+class _SessionQueueHandler(logging.handlers.QueueHandler):
+    """Caller-side handler: enqueues records bound to a session log (in
+    this process' queue, starting its listener after a fork)."""
+
+    def __init__(self):
+        super().__init__(None)
+        self.setLevel(logging_level)
+
+    def filter(self, record):
+        record.session_log = _session_log.get()
+        return record.session_log is not None and super().filter(record)
+
+    def enqueue(self, record):
+        _ensure_listener()
+        _state["queue"].put_nowait(record)
+
+
+def _flush_periodically(pid):
+    while _state["pid"] == pid:
+        time.sleep(SESSION_LOG_FLUSH_S)
+        _state["router"].flush()
+
+
+def _ensure_listener():
+    """Start (or, after a fork, restart) this process' listener."""
+    if _state["pid"] == os.getpid():
+        return
+    with _state_lock:
+        if _state["pid"] == os.getpid():
+            return
+        _state["queue"] = queue.SimpleQueue()
+        _state["router"] = _RoutingHandler()
+        _state["listener"] = logging.handlers.QueueListener(
+            _state["queue"], _state["router"], respect_handler_level=True
+        )
+        _state["listener"].start()
+        _state["pid"] = os.getpid()
+        threading.Thread(
+            target=_flush_periodically,
+            args=(_state["pid"],),
+            name="sessionlog-flush",
+            daemon=True,
+        ).start()
+
+
+@atexit.register
+def shutdown():
+    """Drain the queue & close all session log files (this process)."""
+    with _state_lock:
+        if _state["pid"] != os.getpid():
+            return
+        _state["listener"].stop()
+        _state["router"].close()
+        _state["pid"] = None
+
+
+def install(target_logger, server=None):
+    """Attach the (single) session-log queue handler to `target_logger`,
+    and - given the Flask `server` - unbind sessions after each request.
+    Idempotent."""
+    if not any(isinstance(h, _SessionQueueHandler) for h in target_logger.handlers):
+        target_logger.addHandler(_SessionQueueHandler())
+    if server is not None and not getattr(server, "_sessionlog_installed", False):
+        server.teardown_request(lambda exc: unbind())
+        server._sessionlog_installed = True
+    return target_logger
@@ -0,0 +1,119 @@
+"""
+S T A T I C _ A S S E T S  |  app.static_assets
+---------------------------
+Fingerprinted, long-lived URLs for the media under `seqapp/assets/`.
+
+`asset_url("images/logo.png")` -> `/static-assets/images/logo.<hash>.png`,
+where <hash> is (the start of) the SHA-1 of the file's contents. As the
+URL changes whenever the file does, responses are cacheable "forever"
+(`immutable`), and pages & callbacks only ever carry the URL - never
+the (base64-inlined) file itself. Behind the shipped nginx.conf, nginx
+serves these URLs straight from disk; otherwise `send_asset` does.
+
+Attributes
+----------
+logger : logging.Logger
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import hashlib
+
+from urllib.parse import quote
+
+from seqapp import app
+from seqapp.config import *
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_LENGTH = 12
+
+_FINGERPRINTED = re.compile(rf"^(?P<stem>.+)\.(?P<digest>[0-9a-f]{{{FINGERPRINT_LENGTH}}})(?P<ext>\.[^./]+)$")
+
+_digests = {}  # path -> (mtime_ns, size, digest)
+
+
+def fingerprint(path):
+    """Content hash of an asset (cached until the file changes).
+
+    Parameters
+    ----------
+    path : str
+        Path relative to `ASSETS_DIR`.
+
+    Returns
+    -------
+    str or None
+        None if there is no such file.
+    """
+    try:
+        st = os.stat(os.path.join(ASSETS_DIR, path))
+    except OSError:
+        return None
+    cached = _digests.get(path)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    sha1 = hashlib.sha1()
+    with open(os.path.join(ASSETS_DIR, path), "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha1.update(block)
+    digest = sha1.hexdigest()[:FINGERPRINT_LENGTH]
+    _digests[path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+def asset_url(path):
+    """Fingerprinted URL of an asset (falls back to Dash's own, plain
+    `/assets/` URL for files without a fingerprintable extension, or
+    missing).
+
+    Parameters
+    ----------
+    path : str
+        Path relative to `ASSETS_DIR`, e.g. "images/logo.png".
+
+    Returns
+    -------
+    str
+    """
+    stem, ext = os.path.splitext(path)
+    digest = fingerprint(path) if ext.lower() in STATIC_ASSETS_EXTENSIONS else None
+    if digest is None:
+        return app.get_asset_url(path)
+    return f"{STATIC_ASSETS_URL}{quote(stem)}.{digest}{ext}"
+
+
+def send_asset(name):
+    """Response for a fingerprinted asset URL (path `name` under
+    `STATIC_ASSETS_URL`): cached for good if the fingerprint is current;
+    a stale fingerprint (e.g., a page from before a deploy) gets the
+    current file, revalidated on every use.
+
+    Returns
+    -------
+    flask.Response
+
+    Raises
+    ------
+    werkzeug.exceptions.NotFound
+    """
+    match = _FINGERPRINTED.match(name)
+    if not match or match["ext"].lower() not in STATIC_ASSETS_EXTENSIONS:
+        flask.abort(404)
+    path = match["stem"] + match["ext"]
+    if any(p.startswith(".") for p in path.split("/")):
+        flask.abort(404)
+    digest = fingerprint(path)
+    if digest is None:
+        flask.abort(404)
+    immutable = digest == match["digest"]
+    response = flask.send_from_directory(
+        ASSETS_DIR, path, max_age=STATIC_ASSETS_MAX_AGE if immutable else 0
+    )
+    if immutable:
+        response.headers["Cache-Control"] = f"public, max-age={STATIC_ASSETS_MAX_AGE}, immutable"
+    else:
+        response.headers["Cache-Control"] = "no-cache"
+    return response
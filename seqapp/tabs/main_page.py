@@ -18,7 +18,7 @@ Attributes:
     components - the app software version updates notifications displayed
     at top of main page just below the log in dialog.
     version (str): The config-imported automatically up-to-date software
-    release version as queried via subprocess call `git describe --tags`.
+    release version, from the build metadata (`config/buildinfo.py`).
 """
 import os
 import sys
@@ -26,12 +26,35 @@ import sys
 sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 
 from seqapp.config import *
+from seqapp.static_assets import asset_url
+from seqapp.utils import LazyProp
 from seqapp.utils import ljoin
 
 version = VERSION
 updates = UPDATES
 
-app_logo = f'data:image/png;base64,{base64.b64encode(open(f"{APP_HOME}/{APP_NAME}/assets/images/dash-webapp-template-logo-light-web.png", "rb").read()).decode()}'
+app_logo = asset_url("images/dash-webapp-template-logo-light-web.png")
+
+
+def entity_schema_options():
+    """Options of the schema dropdown (`dd1-dropdown`): read from the
+    entity schemas table when the layout is first serialized, not at
+    import (see `LazyProp`)."""
+    return [
+        {
+            "label": "—🔍⤑Select by Schema Name/ID—",
+            "value": "None",
+        }
+    ] + [
+        {
+            "label": f" 📃 : —{name}🔑{ent_id}— ",
+            "value": f"{ent_id}-{name}",
+        }
+        for (name, ent_id) in sorted(
+            zip(get_entity_schemas().index, get_entity_schemas().id),
+            key=lambda x: x[0],  # reverse=True
+        )
+    ]
 
 
 updates = [u.split("Date: ") for u in updates]
@@ -186,8 +209,10 @@ components_list = [
     # [ For more info on `dcc.Store` browser caching, see:
     #    https://dash.plot.ly/dash-core-components/store  ]
     dcc.Store(id="memory", storage_type="session"),
-    dcc.Store(id="local", storage_type="local"),
+    dcc.Store(id="local", storage_type="local"),  # (profile token only)
     dcc.Store(id="session", storage_type="session"),
+    # (Fingerprinted URLs of media used by clientside callbacks)
+    dcc.Store(id="asset-urls", data={p: asset_url(p) for p in CLIENTSIDE_ASSETS}),
     html.Div(id="back-to-top", style={"display": "hidden"}),
     html.Header(
         children=header,
@@ -445,22 +470,7 @@ components_list = [
                                 value="None",
                                 clearable=True,
                                 searchable=True,
-                                options=[
-                                    {
-                                        "label": "—🔍⤑Select by Schema Name/ID—",
-                                        "value": "None",
-                                    }
-                                ]
-                                + [
-                                    {
-                                        "label": f" 📃 : —{name}🔑{ent_id}— ",
-                                        "value": f"{ent_id}-{name}",
-                                    }
-                                    for (name, ent_id) in sorted(
-                                        zip(entity_schemas.index, entity_schemas.id),
-                                        key=lambda x: x[0],  # reverse=True
-                                    )
-                                ],
+                                options=LazyProp(entity_schema_options),
                                 style={
                                     "textAlign": "center",
                                     "backgroundColor": "rgba(0,0,0,0.25)",
@@ -602,6 +612,19 @@ components_list = [
         ),
         multiple=True,  # (Allow multiple files to be uploaded)
     ),
+    # Large batches: streamed to the server in chunks (resumable) by
+    # assets/chunked-upload.js instead of base64 through `dcc.Upload`.
+    html.Div(
+        [
+            html.Span("⇪ Large / many files? Stream them instead: "),
+            html.Button("📂 Select files", id="chunked-upload-input", n_clicks=0),
+            html.Div(id="chunked-upload-progress", className="notes"),
+            html.Button(id="chunked-upload-done", n_clicks=0, style={"display": "none"}),
+            dcc.Store(id="upload-status", storage_type="session"),
+        ],
+        id="chunked-upload-zone",
+        style={"textAlign": "center", "fontSize": "80%", "margin": "0% 15% 2% 15%"},
+    ),
     html.Br(),
     html.Button(
         "✥ Append", id="append-uploads", className="refresh-files-button", n_clicks=0
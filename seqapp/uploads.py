@@ -0,0 +1,201 @@
+"""
+U P L O A D S  |  app.uploads
+-----------------
+Resumable, chunked server-side file uploads.
+
+Files are streamed by the browser (see `assets/chunked-upload.js`) in
+`UPLOAD_CHUNK_SIZE` pieces straight into the session output directory
+(`PATH_TO_SESSION_OUTPUT`), rather than passing through `dcc.Upload`
+as base64 data URIs. Callbacks only ever deal with lightweight upload
+"handles" (plain dicts of filename, size, digest, timestamp), looked up
+by RUN_ID, so peak memory grows with the chunk size - not the size of
+the upload batch.
+
+A partially received file lives at `.<filename>.part` in the session
+directory until its last chunk arrives; an interrupted upload resumes
+from the size of that file. Completed uploads are recorded in the
+per-session `UPLOADS_MANIFEST` (JSON lines, append-only). Files still
+dropped on `dcc.Upload` are sent on through `/uploadChunk` by the
+browser too (and its `contents` cleared), never through a callback.
+
+Attributes
+----------
+logger : logging.Logger
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+import fcntl
+import hashlib
+
+from werkzeug.utils import secure_filename
+
+from seqapp.config import *
+from seqapp.utils import register_output
+from seqapp.utils import session_output_dir
+
+logger = logging.getLogger(__name__)
+
+
+def _part_path(session_dir, filename):
+    """Hidden in-progress path for `filename` (kept out of download listings)."""
+    return os.path.join(session_dir, f".{filename}.part")
+
+
+def _sha256(filepath):
+    """Content digest of a completed upload, read in `UPLOAD_IO_BLOCK`s."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(partial(f.read, UPLOAD_IO_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _record_upload(session_dir, handle):
+    """Append a completed upload handle to the session manifest."""
+    with open(os.path.join(session_dir, UPLOADS_MANIFEST), "a") as manifest:
+        fcntl.flock(manifest, fcntl.LOCK_EX)
+        manifest.write(json.dumps(handle) + "\n")
+
+
+def clean_filename(filename):
+    """Filesystem-safe basename for a client-supplied upload filename.
+
+    Raises
+    ------
+    ValueError
+        If nothing usable remains of `filename`.
+    """
+    safe = secure_filename(f"{filename}")
+    if not safe:
+        raise ValueError(f"Invalid upload filename: {filename!r}")
+    return safe
+
+
+def upload_offset(RUN_ID, filename):
+    """Number of bytes of `filename` already received for this session,
+    i.e. the offset from which an interrupted upload should resume.
+
+    Parameters
+    ----------
+    RUN_ID : str
+    filename : str
+
+    Returns
+    -------
+    dict
+        {"filename", "offset", "complete"}
+    """
+    session_dir = session_output_dir(RUN_ID)
+    filename = clean_filename(filename)
+    part = _part_path(session_dir, filename)
+    if os.path.exists(part):
+        return {"filename": filename, "offset": os.path.getsize(part), "complete": False}
+    for handle in list_uploads(RUN_ID):
+        if handle["filename"] == filename:
+            return {"filename": filename, "offset": handle["size"], "complete": True}
+    return {"filename": filename, "offset": 0, "complete": False}
+
+
+def write_chunk(RUN_ID, filename, offset, total, stream, last_modified=None):
+    """Write one chunk of an upload (read incrementally from `stream`)
+    at byte `offset` of the in-progress file; upon receipt of the final
+    byte, move the file into place and record its handle.
+
+    Parameters
+    ----------
+    RUN_ID : str
+    filename : str
+        Client-side filename (sanitized here).
+    offset : int
+        Byte position of this chunk within the whole file. Must equal
+        the number of bytes received so far (see `upload_offset`).
+    total : int
+        Size in bytes of the whole file.
+    stream : file-like
+        Chunk body; e.g., `flask.request.stream`.
+    last_modified : int, optional
+        Client-side modification time of the file (ms since epoch).
+
+    Returns
+    -------
+    dict
+        {"filename", "offset", "complete"} after this chunk.
+
+    Raises
+    ------
+    ValueError
+        If `offset` does not match the bytes received so far.
+    """
+    session_dir = session_output_dir(RUN_ID)
+    filename = clean_filename(filename)
+    os.makedirs(session_dir, exist_ok=True)
+    part = _part_path(session_dir, filename)
+    with open(part, "ab") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        received = f.seek(0, os.SEEK_END)
+        if offset != received:
+            raise ValueError(
+                f"Upload offset mismatch for {filename}: got {offset}, expected {received}"
+            )
+        for block in iter(partial(stream.read, UPLOAD_IO_BLOCK), b""):
+            f.write(block)
+        received = f.tell()
+    if received < total:
+        return {"filename": filename, "offset": received, "complete": False}
+
+    _complete_upload(session_dir, part, filename, last_modified)
+    return {"filename": filename, "offset": received, "complete": True}
+
+
+def _complete_upload(session_dir, part, filename, last_modified=None):
+    """Move a fully received upload into place & record its handle."""
+    final = os.path.join(session_dir, filename)
+    os.replace(part, final)
+    handle = {
+        "filename": filename,
+        "size": os.path.getsize(final),
+        "sha256": _sha256(final),
+        "last_modified": last_modified,
+        "received": now(),
+    }
+    _record_upload(session_dir, handle)
+    register_output(final)
+    logger.info(f"Upload received: {final} ({handle['size']} bytes)")
+    return handle
+
+
+def list_uploads(RUN_ID):
+    """All completed uploads of a session, as lightweight handles
+    (most recent upload of any given filename wins).
+
+    Returns
+    -------
+    list of dict
+        {"filename", "size", "sha256", "last_modified", "received"}
+    """
+    manifest = os.path.join(session_output_dir(RUN_ID), UPLOADS_MANIFEST)
+    if not os.path.exists(manifest):
+        return []
+    handles = {}
+    with open(manifest) as f:
+        for line in f:
+            if line.strip():
+                handle = json.loads(line)
+                handles[handle["filename"]] = handle
+    return [*handles.values()]
+
+
+def forget_uploads(RUN_ID):
+    """Reset the session's list of completed uploads (the uploaded
+    files themselves are kept, as with any other session output)."""
+    manifest = os.path.join(session_output_dir(RUN_ID), UPLOADS_MANIFEST)
+    if os.path.exists(manifest):
+        os.remove(manifest)
+
+
+def upload_path(RUN_ID, handle):
+    """Server-side full path of an uploaded file given its handle."""
+    return os.path.join(session_output_dir(RUN_ID), clean_filename(handle["filename"]))
@@ -16,11 +16,202 @@ import sys
 
 sys.path.append(os.path.dirname(os.path.realpath(__file__)))
 
+import hashlib
+
 from seqapp.config import *
+from seqapp import governor
 
 logger = logging.getLogger(__name__)
 
 
+class LRUCache:
+    """Thread-safe, size-bounded least-recently-used cache with hit/miss
+    counters.
+
+    Evicts least recently used entries once either more than `maxsize`
+    entries are held, or (if given) the summed `sizeof(value)` of all
+    entries exceeds `maxbytes`.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of entries.
+    maxbytes : int, optional
+        Maximum total size of all values, as measured by `sizeof`.
+    sizeof : callable, optional
+        value -> int (bytes); required for `maxbytes` to take effect.
+
+    Examples
+    --------
+    >>> cache = LRUCache(maxsize=2)
+    >>> cache.get_or_create("a", lambda: 1)
+    1
+    >>> cache.get_or_create("a", lambda: 2)
+    1
+    >>> cache.stats()
+    {'hits': 1, 'misses': 1, 'entries': 1, 'bytes': 0}
+    """
+
+    def __init__(self, maxsize=128, maxbytes=None, sizeof=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self.hits = 0
+        self.misses = 0
+        self._nbytes = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Cached value for `key` (marking it most recently used), else `default`."""
+        with self._lock:
+            try:
+                value, _ = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Insert/replace `key`, then evict down to the size bounds."""
+        nbytes = self.sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._nbytes -= self._data.pop(key)[1]
+            self._data[key] = (value, nbytes)
+            self._nbytes += nbytes
+            while len(self._data) > 1 and (
+                len(self._data) > self.maxsize
+                or (self.maxbytes is not None and self._nbytes > self.maxbytes)
+            ):
+                self._nbytes -= self._data.popitem(last=False)[1][1]
+
+    def get_or_create(self, key, factory):
+        """Cached value for `key`; on a miss, `factory()` is called and its
+        result cached (exceptions propagate and nothing is cached)."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def pop(self, key, default=None):
+        """Drop `key`, returning its value (`default` if not cached)."""
+        with self._lock:
+            if key not in self._data:
+                return default
+            value, nbytes = self._data.pop(key)
+            self._nbytes -= nbytes
+            return value
+
+    def keys(self):
+        """Snapshot of the cached keys, least recently used first."""
+        with self._lock:
+            return [*self._data]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
+
+    def stats(self):
+        """dict: hits, misses, entries & bytes currently held."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._data),
+            "bytes": self._nbytes,
+        }
+
+
+class CachedPayload:
+    """An immutable response body, pre-compressed (gzip, and brotli if
+    installed) once, served with a strong ETag per content-coding (see
+    `response`): each encoded variant is a distinct representation, so
+    a cache never pairs one's validator with another's bytes.
+
+    Parameters
+    ----------
+    body : bytes
+    mimetype : str, optional
+    """
+
+    def __init__(self, body, mimetype="application/json"):
+        import gzip
+
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {"identity": body, "gzip": gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(body)
+        self.etags = {
+            encoding: self.etag if encoding == "identity" else f"{self.etag}-{encoding}"
+            for encoding in self.variants
+        }
+
+    def encoding_for(self, request):
+        """Best available content-coding accepted by `request`."""
+        accepted = request.accept_encodings
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and accepted[encoding]:
+                return encoding
+        return "identity"
+
+    def response(self, request):
+        """`304 Not Modified` if the client holds the current version of
+        the variant it accepts (If-None-Match), else that (best-compressed)
+        variant.
+
+        Returns
+        -------
+        flask.Response
+        """
+        encoding = self.encoding_for(request)
+        etag = self.etags[encoding]
+        if request.if_none_match.contains(etag):
+            response = flask.Response(status=304)
+        else:
+            response = flask.Response(self.variants[encoding], mimetype=self.mimetype)
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+        response.set_etag(etag)
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = "no-cache"  # (always revalidate)
+        return response
+
+
+class LazyProp:
+    """A component prop value computed on first serialization to JSON
+    (e.g., of the cached layout payload - see `deploy.layout_payload`),
+    rather than when the component is created (e.g., at import).
+
+    Parameters
+    ----------
+    func : callable
+        Returns the JSON-serializable prop value.
+    """
+
+    def __init__(self, func):
+        self.func = func
+
+    def to_plotly_json(self):
+        return self.func()
+
+
 def _verify_login():
     """Argon2-based user authentication cryptography (of sorts).
 
@@ -69,6 +260,10 @@ def add_logfile(logfile, logger=logger):
     return fh
 
 
+HTML_TO_DASH_CACHE = LRUCache(maxsize=HTML_TO_DASH_CACHE_MAX_ENTRIES)
+"""Dash component trees converted from HTML source strings (per process)."""
+
+
 def convert_html_to_dash(el, style=None):
     """[Quite] Conveniently auto-converts whole input HTML
     into the corresponding Python Dash HTML components. Uses
@@ -77,7 +272,7 @@ def convert_html_to_dash(el, style=None):
 
     Parameters
     ----------
-    el : bs.element.NavigableString, str
+    el : bs4.element.NavigableString, str
         Accepts bs4 HTML 'element' object or raw html as string.
         (Input condition checked and converted by inner function)
         Beautiful Soup-parsed HTML element, by the tag (e.g., "<p>Hello</p>").
@@ -85,13 +280,16 @@ def convert_html_to_dash(el, style=None):
         auto bs4-parse the HTML into a `NavigableString` which can then be passed
         into the included Dash conversion.
     style : None, optional
-        Style params for the HTML element.
+        Style params for the HTML element (bs4 element input only; HTML
+        given as str keeps the inline styles of its own markup).
 
     Returns
     -------
     Dash.html.Div()
         Where content (i.e. via attr 'children') is a list of Dash `html` components
         precisely mirroring the elements input as standard-format HTML.
+        For str input, the converted tree is memoized (`HTML_TO_DASH_CACHE`,
+        keyed by source hash) and shared - treat it as read-only.
     """
     ALLOWED_TAGS = {
         "a",
@@ -144,7 +342,7 @@ def convert_html_to_dash(el, style=None):
 
         Parameters
         ----------
-        el : bs.element.NavigableString
+        el : bs4.element.NavigableString
 
         Returns
         -------
@@ -162,9 +360,12 @@ def convert_html_to_dash(el, style=None):
         }
 
     if type(el) is str:
-        return convert_html_to_dash(bs.BeautifulSoup(el, "html.parser"))
+        key = hashlib.sha1(el.encode("utf-8")).hexdigest()
+        return HTML_TO_DASH_CACHE.get_or_create(
+            key, lambda: convert_html_to_dash(bs4.BeautifulSoup(el, "html.parser"))
+        )
 
-    if type(el) == bs.element.NavigableString:
+    if type(el) == bs4.element.NavigableString:
         return str(el)
     else:
         name = el.name
@@ -285,6 +486,134 @@ def now():
     return re.sub("[ :.\-]", "", str(dt.datetime.now()))
 
 
+class OutputIndex:
+    """Incrementally refreshed index of the files under one output root
+    (session output directory, or the plasmids archive), by extension.
+
+    A refresh costs one `stat` per *directory*: only directories whose
+    mtime changed since the last look (i.e., which gained, lost or
+    renamed entries) are re-listed. Hidden entries (e.g., in-progress
+    `.<name>.part` uploads, `.jobs/`) are never indexed.
+
+    Parameters
+    ----------
+    root : str
+        Top directory to index.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._dirs = {}  # dirpath -> (mtime_ns, {file paths}, {subdir paths})
+        self._by_ext = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def _drop_dir(self, dirpath):
+        _, files, subdirs = self._dirs.pop(dirpath, (None, (), ()))
+        for filepath in files:
+            self._by_ext[os.path.splitext(filepath)[1]].discard(filepath)
+        for subdir in subdirs:
+            self._drop_dir(subdir)
+
+    def _scan_dir(self, dirpath, mtime):
+        files, subdirs = set(), set()
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    subdirs.add(entry.path)
+                elif entry.is_file():
+                    files.add(entry.path)
+        _, old_files, old_subdirs = self._dirs.get(dirpath, (None, set(), set()))
+        for filepath in old_files - files:
+            self._by_ext[os.path.splitext(filepath)[1]].discard(filepath)
+        for filepath in files - old_files:
+            self._by_ext[os.path.splitext(filepath)[1]].add(filepath)
+        for subdir in old_subdirs - subdirs:
+            self._drop_dir(subdir)
+        # A directory modified within the last second may change again
+        # within the same mtime tick: re-list it on the next refresh too.
+        settled = tns() - mtime > 1e9
+        self._dirs[dirpath] = (mtime if settled else None, files, subdirs)
+        return subdirs
+
+    def refresh(self):
+        """Bring the index up to date with the filesystem."""
+        with self._lock:
+            pending = [self.root]
+            while pending:
+                dirpath = pending.pop()
+                try:
+                    mtime = os.stat(dirpath).st_mtime_ns
+                except FileNotFoundError:
+                    self._drop_dir(dirpath)
+                    continue
+                known = self._dirs.get(dirpath)
+                if known is not None and known[0] == mtime:
+                    pending.extend(known[2])
+                else:
+                    pending.extend(self._scan_dir(dirpath, mtime))
+
+    def register(self, filepath):
+        """Index a newly written file right away (ahead of the next refresh).
+
+        The file is also recorded with its directory (and the directory
+        with its parents), marked to be re-listed on the next refresh, so
+        that the file is dropped again if it is deleted meanwhile.
+        """
+        name = os.path.basename(filepath)
+        if name.startswith("."):
+            return
+        dirpath = os.path.dirname(filepath)
+        with self._lock:
+            self._by_ext[os.path.splitext(name)[1]].add(filepath)
+            _, files, subdirs = self._dirs.get(dirpath, (None, set(), set()))
+            files.add(filepath)
+            self._dirs[dirpath] = (None, files, subdirs)
+            while dirpath != self.root and dirpath.startswith(self.root + os.sep):
+                parent = os.path.dirname(dirpath)
+                _, files, subdirs = self._dirs.get(parent, (None, set(), set()))
+                known = dirpath in subdirs
+                subdirs.add(dirpath)
+                if parent in self._dirs and known:
+                    break
+                self._dirs[parent] = (None, files, subdirs)
+                dirpath = parent
+
+    def files(self, extensions):
+        """Indexed files with any of the given extensions (O(matches)).
+
+        Returns
+        -------
+        list
+            Full file paths.
+        """
+        self.refresh()
+        with self._lock:
+            return [*itl.chain.from_iterable(self._by_ext.get(ext, ()) for ext in set(extensions))]
+
+
+OUTPUT_INDEXES = LRUCache(maxsize=OUTPUT_INDEX_MAX_ROOTS)
+"""`OutputIndex`es (per process), by root directory."""
+
+
+def output_index(root):
+    """Shared `OutputIndex` of the files under `root`."""
+    root = os.path.normpath(root)
+    return OUTPUT_INDEXES.get_or_create(root, lambda: OutputIndex(root))
+
+
+def register_output(filepath):
+    """Record a newly written output file with any open `OutputIndex`
+    whose root holds it, so that it is listed for download at once."""
+    filepath = os.path.normpath(filepath)
+    for root in OUTPUT_INDEXES.keys():
+        if filepath.startswith(root + os.sep):
+            index = OUTPUT_INDEXES.get(root)
+            if index is not None:
+                index.register(filepath)
+
+
 def get_output_files(selected_filetypes,
                      final_output_dir=None):
     """List all files in the current RUN's output directory,
@@ -305,21 +634,14 @@ def get_output_files(selected_filetypes,
     Returns
     -------
     list
-        List of full filepaths for files to download.
+        List of full filepaths for files to download
+        (answered from the directory's `OutputIndex`).
     """
-    files_to_dl = []
     if final_output_dir:
         dl_dir = final_output_dir
     else:
         dl_dir = PLASMIDS_ARCHIVE
-    for topdir, currdir, files in os.walk(dl_dir):
-        for filename in files:
-            path = os.path.join(topdir, filename)
-            if os.path.isfile(path):
-                full_fn, ext = os.path.splitext(path)
-                if ext in selected_filetypes:
-                    files_to_dl.append(path)
-    return files_to_dl
+    return output_index(dl_dir).files(selected_filetypes)
 
 
 def initiate_logging(app=__name__, log_filename=None):
@@ -440,6 +762,36 @@ def make_randuid(salt="", n=8):
     return f"{salt}{''.join(random.choices(string.hexdigits, k=n))}"
 
 
+def _df_reader(filename, max_cols=1000, tab_delimited_input=True):
+    """Read input data from an Excel (.xlsx) file,
+    comma-separated raw text file; or else assumes
+    tab-delimited raw text input.
+
+    (Module-level, i.e. picklable: run by the worker pool of
+    `parallelized_dfapply_concat`.)
+
+    Parameters
+    ----------
+    filename : str
+        Full path to file
+    max_cols : int, optional
+        Defaults to 1000
+    tab_delimited_input : bool, optional
+        Assumes tab separated data unless explicitly specified
+        otherwise.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    if filename.endswith(".xlsx"):
+        return pd.read_excel(filename, usecols=max_cols)
+    elif filename.endswith(".csv") and not tab_delimited_input:
+        return pd.read_csv(filename, usecols=max_cols)
+    else:
+        return pd.read_csv(filename, sep="\t", usecols=max_cols)
+
+
 def parallelized_dfapply_concat(
         file_list,
         jobs=((mp.cpu_count() * 2) + 1),
@@ -455,7 +807,8 @@ def parallelized_dfapply_concat(
     file_list : list
         List of <str> file paths.
     jobs : int, optional
-        Number of workers in multiprocessing pool to spawn.
+        Number of workers in multiprocessing pool to spawn
+        (capped by / queued for free host-wide `PIPELINE_SLOTS`).
     drop_blank_cols : bool, optional
         Do not return entirely null column variates.
     tab_delimited_input : bool, optional
@@ -470,35 +823,17 @@ def parallelized_dfapply_concat(
         Single aggregated df
 
     """
+    df_reader = partial(_df_reader, max_cols=max_cols, tab_delimited_input=tab_delimited_input)
 
-    def df_reader(filename, max_cols=max_cols):
-        """Read input data from an Excel (.xlsx) file,
-        comma-separated raw text file; or else assumes
-        tab-delimited raw text input.
-
-        Parameters
-        ----------
-        filename : str
-            Full path to file
-        max_cols : int, optional
-            Defaults to 1000
-
-        Returns
-        -------
-        pd.DataFrame
-        """
-        if filename.endswith(".xlsx"):
-            return pd.read_excel(filename, usecols=max_cols)
-        elif filename.endswith(".csv") and not tab_delimited_input:
-            return pd.read_csv(filename, usecols=max_cols)
-        else:
-            return pd.read_csv(filename, sep="\t", usecols=max_cols)
-
-    with mp.Pool(jobs) as p:
-        dfs = p.map(df_reader, file_list)
-        df = pd.concat(dfs)
+    # Processes count against the host-wide pipeline CPU slots; they are
+    # started by a forkserver (see `PIPELINE_MP_START_METHOD`), so that
+    # none inherits - & keeps locked - the slots held here.
+    with governor.slots(jobs, label="dfapply_concat") as held:
+        with mp.get_context(PIPELINE_MP_START_METHOD).Pool(len(held)) as p:
+            dfs = p.map(df_reader, file_list)
+            df = pd.concat(dfs)
 
-    if drop_blank_columns:
+    if drop_blank_cols:
         df = df.dropna(axis=1, how="all")
 
     return df
@@ -556,6 +891,34 @@ def ntw(n):
             return "[error:Number out of range]"
 
 
+def session_output_dir(RUN_ID):
+    """Resolve the server-side output directory of a user session
+    from its `RUN_ID` alone (i.e., without trusting any client-
+    supplied path).
+
+    Parameters
+    ----------
+    RUN_ID : str
+        Session ID as created at user sign on; e.g.,
+        'APP_RUNID_20191103224547407862'
+
+    Returns
+    -------
+    str
+        Full path (with trailing slash) of the session directory,
+        matching `data["PATH_TO_SESSION_OUTPUT"]`.
+
+    Raises
+    ------
+    ValueError
+        If `RUN_ID` is not a well-formed session ID.
+    """
+    match = re.fullmatch(r"APP_RUNID_(\d{8})\d+", f"{RUN_ID}")
+    if not match:
+        raise ValueError(f"Invalid RUN_ID: {RUN_ID!r}")
+    return f"{RUN_OUTPUT_DIR}/{match.group(1)}/{RUN_ID}/"
+
+
 def today():
     """Current date in YYYYMMDD format.
     
@@ -0,0 +1,44 @@
+"""
+No server-side callback may carry uploaded file contents: uploads reach
+the server through `/uploadChunk` only, and callbacks look them up by
+RUN_ID (see `seqapp.uploads`).
+"""
+import pytest
+
+pytest.importorskip("dash")
+
+from seqapp.benchmarks import FORMER_UPLOAD_CALLBACKS
+from seqapp.benchmarks import REFRESH_UPLOADS_TRIGGER
+from seqapp.benchmarks import callback_request_bytes
+from seqapp.benchmarks import server_callbacks
+from seqapp.benchmarks import upload_client_state
+
+# Bytes POSTed to `_dash-update-component` per "Refresh Uploads" click,
+# whatever the size of the upload batch.
+REFRESH_CLICK_MAX_BYTES = 8 * 1024
+
+
+@pytest.fixture(scope="module")
+def callbacks():
+    from deploy import app
+
+    return server_callbacks(app)
+
+
+def test_no_server_callback_takes_upload_contents(callbacks):
+    offending = [
+        output for output, inputs, state in callbacks if ("upload-data", "contents") in [*inputs, *state]
+    ]
+    assert not offending, f"Callbacks carrying `upload-data.contents`: {offending}"
+
+
+@pytest.mark.parametrize("batch_bytes, n_files", [(1024 ** 2, 5), (500 * 1024 ** 2, 500)])
+def test_refresh_click_request_size_is_bounded(callbacks, batch_bytes, n_files):
+    client_state, contents_bytes = upload_client_state(batch_bytes, n_files)
+    sizes = callback_request_bytes(callbacks, REFRESH_UPLOADS_TRIGGER, client_state, contents_bytes)
+    assert sizes, "No callback fires on a refresh click"
+    assert sum(sizes.values()) < REFRESH_CLICK_MAX_BYTES, sizes
+    former = callback_request_bytes(
+        FORMER_UPLOAD_CALLBACKS, REFRESH_UPLOADS_TRIGGER, client_state, contents_bytes
+    )
+    assert sum(former.values()) > batch_bytes  # (the bound is not vacuous)
@@ -0,0 +1,316 @@
+"""
+Parity of the clientside callbacks (`window.dash_clientside.ui`, in
+seqapp/assets/clientside.js) with the server-side callbacks they
+replaced: each JS function is evaluated under node, and its output is
+compared with the JSON of the components the former Python callback
+returned for the same inputs.
+"""
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+CLIENTSIDE_JS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "seqapp", "assets", "clientside.js"
+)
+
+NODE = shutil.which("node")
+
+pytestmark = pytest.mark.skipif(NODE is None, reason="node is not installed")
+
+# Minimal browser globals: Dash's config (for un-fingerprinted asset URLs).
+RUNNER = """
+global.window = {};
+global.document = {
+    getElementById: (id) => id === "_dash-config"
+        ? {textContent: JSON.stringify({requests_pathname_prefix: "/app/"})}
+        : null
+};
+require(process.argv[1]);
+const cases = JSON.parse(require("fs").readFileSync(0, "utf-8"));
+const results = cases.map(([name, args]) => {
+    const out = window.dash_clientside.ui[name](...args);
+    return out === undefined ? null : out;
+});
+process.stdout.write(JSON.stringify(results));
+"""
+
+ASSETS = {
+    "animations/dna-minimal-green.gif": "/static-assets/animations/dna-minimal-green.0123456789ab.gif",
+    "images/scope-unic.png": "/static-assets/images/scope-unic.0123456789ab.png",
+    "animations/T-Cell_TEM_4-3.mp4": "/static-assets/animations/T-Cell_TEM_4-3.0123456789ab.mp4",
+}
+
+
+def run_ui(*cases):
+    """Results of `window.dash_clientside.ui[name](*args)`, per (name, args) case."""
+    proc = subprocess.run(
+        [NODE, "-e", RUNNER, CLIENTSIDE_JS],
+        input=json.dumps(cases),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout)
+
+
+try:
+    import plotly
+    from dash import html as _dash_html
+
+    def h(type_, children=None, **props):
+        component = getattr(_dash_html, type_)(children, **props)
+        return json.loads(json.dumps(component, cls=plotly.utils.PlotlyJSONEncoder))
+
+except ImportError:
+
+    def h(type_, children=None, **props):
+        """JSON of `dash.html.<type_>(children, **props)`."""
+        return {"namespace": "dash_html_components", "type": type_, "props": dict(props, children=children)}
+
+
+# The former (Python) callbacks, returning their components' JSON; media
+# URLs are those of the assets (formerly relative paths & data URIs).
+def former_update_workflow_choice(workflow):
+    return [h("H2", f"{workflow}", style={"textAlign": "center"})]
+
+
+def former_trigger_dropdowns(submit_n_clicks, clear_n_clicks, dd1, dd2):
+    if clear_n_clicks == submit_n_clicks + 1:
+        return h(
+            "Code",
+            "⚠ | ℹ Overclicking clear *may* require compensatory submits! (I.e., Try clicking submit button >1 times, if submissions are not going through.)",
+            style={
+                "color": "red",
+                "display": "flex",
+                "flexFlow": "column wrap",
+                "fontSize": "1.0rem",
+                "margin": "0px 30% 20px 30%",
+            },
+        )
+    if all(ui not in ("None", None) for ui in [dd1, dd2]):
+        return [h("Code", f"SUBMISSION for: {dd1}, @Well{dd2}")]
+    elif clear_n_clicks > submit_n_clicks + 1:
+        return h(
+            "Code",
+            f"Submissions cleared: {clear_n_clicks}, [submissions_count={submit_n_clicks}].",
+            style={"fontStyle": "normal", "color": "gray", "margin": "0px 30% 20px 30%"},
+        )
+    else:
+        return h("Code", "No submissions received, it seems...")
+
+
+def former_display_generated_dd_output(
+    dd1, dd2, submission, clear_submission, workflow, session_data, submission_timestamp, assets
+):
+    if (dd1 == "None" and dd2 == "None") or dd1 is None:
+        return [
+            h(
+                "Div",
+                [
+                    h(
+                        "Span",
+                        "Make a new selection.",
+                        style={"textAlign": "center", "fontFamily": "Muli", "fontSize": "1.5rem"},
+                    ),
+                    h(
+                        "Span",
+                        h(
+                            "Img",
+                            src=assets["animations/dna-minimal-green.gif"],
+                            height="150",
+                            style={
+                                "transform": "translateY(-55px) translateX(5px)",
+                                "filter": "hue-rotate(100deg) contrast(1.1) saturate(5)",
+                                "position": "absolute",
+                                "opacity": "0.5",
+                                "borderRadius": "250px",
+                            },
+                        ),
+                    ),
+                ],
+                style={
+                    "marginLeft": "25%",
+                    "position": "relative",
+                    "textAlign": "center",
+                    "width": "50%",
+                    "zIndex": "-1",
+                },
+            ),
+            h(
+                "Div",
+                [
+                    h("Span", "↪⦿"),
+                    h(
+                        "Img",
+                        src=assets["images/scope-unic.png"],
+                        width="80",
+                        style={"marginTop": "15px", "marginBottom": "-25px", "cursor": "pointer"},
+                    ),
+                    h("Span", "⥅♅"),
+                ],
+                style={
+                    "textAlign": "center",
+                    "fontSize": "1.75rem",
+                    "animation": "animateGlow 45s infinite linear!important",
+                    "cursor": "pointer",
+                },
+            ),
+        ]
+    elif any(ui == "Error" for ui in [dd1, dd2]):
+        return None
+    elif dd1 != "None" and dd2 is None:
+        return [
+            h(
+                "H5",
+                "ℹ | Informational message to display.",
+                style={"textAlign": "center", "marginLeft": "25%", "width": "50%"},
+            )
+        ]
+    elif all(ui != "None" for ui in [dd1, dd2]):
+        return h(
+            "Div",
+            [
+                h(
+                    "Code",
+                    f"♻ Cleared submission state: [total_clears={clear_submission}]",
+                    style={"fontStyle": "italic", "fontSize": "0.9rem", "marginBottom": "5px"},
+                ),
+                h("Br"),
+                h(
+                    "Div",
+                    [
+                        h(
+                            "H6",
+                            [
+                                h("P", f"⮊ Click ⬫Submit⬫ 𝑓𝗈𝓇⤑{dd2} ~ {dd1}"),
+                                h("Span", "to initiate "),
+                                h(
+                                    "Span",
+                                    "in silico ",
+                                    style={"fontStyle": "italic", "fontFamily": "'Times', serif"},
+                                ),
+                                h("Span", "analysis of selections."),
+                            ],
+                            style={
+                                "textAlign": "center",
+                                "cursor": "pointer",
+                                "color": "#ffffff6e",
+                                "backgroundImage": "url(https://media.giphy.com/media/4HIOPSXOitJ2o/giphy.gif)",
+                                "mozBackgroundClip": "text",
+                                "webkitBackgroundClip": "text",
+                                "fontWeight": "700",
+                                "backgroundSize": "60%",
+                            },
+                        )
+                    ],
+                    style={
+                        "position": "absolute",
+                        "margin": "0.5% -5% -5% -5%",
+                        "textAlign": "center",
+                        "display": "inline-block",
+                        "mixBlendMode": "lighten",
+                        "width": "200px",
+                    },
+                ),
+                h("Br"),
+                h("Br"),
+                h(
+                    "Div",
+                    [
+                        h("Span", "✂"),
+                        h("Span", "۝"),
+                        h("Span", "⭾"),
+                        h("Span", "α/β"),
+                        h(
+                            "Div",
+                            [
+                                h(
+                                    "Video",
+                                    src=assets["animations/T-Cell_TEM_4-3.mp4"],
+                                    id="t-cell",
+                                    autoPlay=True,
+                                    loop=True,
+                                    controls=False,
+                                    preload="true",
+                                    muted=True,
+                                )
+                            ],
+                            style={"filter": "opacity(0.25)"},
+                        ),
+                    ],
+                    style={
+                        "textAlign": "center",
+                        "fontSize": "2rem",
+                        "width": "20%",
+                        "marginLeft": "40.5%",
+                        "mixBlendMode": "exclusion",
+                    },
+                    className="animate twirl",
+                ),
+            ],
+            style={"textAlign": "center"},
+        )
+    return None
+
+
+def former_clear_dd1_selection(n_clicks):
+    if n_clicks > 0:
+        return "None"
+    return None
+
+
+def former_clear_dd2_selection(val, n_clicks):
+    if n_clicks > 0 and val == "None":
+        return "None"
+    return None
+
+
+FORMER = {
+    "update_workflow_choice": former_update_workflow_choice,
+    "trigger_dropdowns": former_trigger_dropdowns,
+    "display_generated_dd_output": former_display_generated_dd_output,
+    "clear_dd1_selection": former_clear_dd1_selection,
+    "clear_dd2_selection": former_clear_dd2_selection,
+}
+
+DROPDOWN_VALUES = [None, "None", "Error", "PL001-ABC", "A01"]
+
+# (submit n_clicks, clear n_clicks): equal, clear = submit + 1 (overclicked),
+# clear > submit + 1 (cleared), submit ahead of clear
+CLICKS = [(0, 0), (0, 1), (2, 3), (0, 2), (1, 5), (3, 1)]
+
+CASES = (
+    [("update_workflow_choice", [w]) for w in [None, "Gene Editing: [ ... ]"]]
+    + [
+        ("trigger_dropdowns", [submit, clear, dd1, dd2])
+        for submit, clear in CLICKS
+        for dd1 in DROPDOWN_VALUES
+        for dd2 in DROPDOWN_VALUES
+    ]
+    + [
+        ("display_generated_dd_output", [dd1, dd2, 1, clear, "wf", {}, None, ASSETS])
+        for dd1 in DROPDOWN_VALUES
+        for dd2 in DROPDOWN_VALUES
+        for clear in [0, 4]
+    ]
+    + [("clear_dd1_selection", [n]) for n in [0, 1, 3]]
+    + [("clear_dd2_selection", [val, n]) for val in DROPDOWN_VALUES for n in [0, 1, 3]]
+)
+
+
+def test_clientside_callbacks_match_former_python_callbacks():
+    results = run_ui(*CASES)
+    assert len(results) == len(CASES)
+    for (name, args), result in zip(CASES, results):
+        expected = FORMER[name](*args)
+        assert result == expected, f"ui.{name}{tuple(args)}"
+
+
+def test_asset_urls_fall_back_to_dash_assets_path():
+    """Without the `asset-urls` store, media use Dash's own /assets/ URLs."""
+    [prompt] = run_ui(("display_generated_dd_output", [None, None, 0, 0, "wf", {}, None, None]))
+    plain = {path: f"/app/assets/{path}" for path in ASSETS}
+    assert prompt == former_display_generated_dd_output(None, None, 0, 0, "wf", {}, None, plain)
@@ -0,0 +1,104 @@
+"""
+Streaming FASTA reading (`iter_fasta`, `_fasta_batches` & `read_fasta`,
+in seqapp/bioinfo/pipeline.py): records as Biopython parses them, and
+the same table (& side outputs) whether read whole or in chunks.
+"""
+import io
+
+import pytest
+
+pytest.importorskip("dash")
+pytest.importorskip("Bio")
+
+import pandas as pd
+
+from Bio import SeqIO
+
+from seqapp.bioinfo.pipeline import FASTA_COLUMNS
+from seqapp.bioinfo.pipeline import _fasta_batches
+from seqapp.bioinfo.pipeline import iter_fasta
+from seqapp.bioinfo.pipeline import read_fasta
+
+FASTA = """\
+>pUC19 cloning vector, 2686 bp
+TCGCGCGTTTCGGTGATGACGGTGAAAACCTCTGACACATGCAGCTCCCGGAGACGGTCACAGCTTGTCTG
+TAAGCGGATGCCGGGAGCAGACAAGCCCGTCAGGGCGCGTCAGCGGGTGTTGGCGGGTGTCGGGGCTGGCT
+TAACTATGCGGCATCAGAGCAGATTGTACTGAGAGTGCACCATATG
+>TRAV1-1*01
+GGACAAAGCCTTGAGCAGCCCTCTGAAGTGACAGCTGTGGAAGGAGCCATTGTCCAGATAAACTGCACGTAC
+>TRBV2*01 single line
+GAACCTGAAGTCACCCAGACTCCCAGCCATCAGGTCACACAGATGGGACAGGAAGTGATCTTGCGCTGTGTC
+
+>empty-record
+>lower-case, blank lines & trailing spaces
+acgtnNACGT   
+
+ACGT
+"""
+
+
+def biopython_records(fasta=FASTA):
+    return [(r.id, r.description, str(r.seq)) for r in SeqIO.parse(io.StringIO(fasta), "fasta")]
+
+
+def test_iter_fasta_matches_biopython():
+    records = [*iter_fasta(io.StringIO(FASTA))]
+    assert records == biopython_records()
+    assert [len(seq) for _, _, seq in records] == [188, 72, 72, 0, 14]
+
+
+def test_iter_fasta_reads_paths_and_binary_handles(tmp_path):
+    path = tmp_path / "refs.fasta"
+    path.write_text(FASTA)
+    assert [*iter_fasta(str(path))] == biopython_records()
+    assert [*iter_fasta(io.BytesIO(FASTA.encode()))] == biopython_records()
+
+
+@pytest.mark.parametrize("fasta", ["", "\n\n", "no header line\nACGT\n"])
+def test_iter_fasta_without_records(fasta):
+    assert [*iter_fasta(io.StringIO(fasta))] == []
+
+
+def test_read_fasta_table():
+    df = read_fasta(io.StringIO(FASTA))
+    assert df.index.name == "id"
+    assert [*df.columns] == FASTA_COLUMNS[1:]
+    records = biopython_records()
+    assert [*df.index] == [r[0] for r in records]
+    assert df["description"].tolist() == [r[1] for r in records]
+    assert df["seq"].tolist() == [r[2] for r in records]
+    assert df["length"].tolist() == [len(r[2]) for r in records]
+
+
+def test_read_fasta_of_an_empty_file():
+    df = read_fasta(io.StringIO(""))
+    assert df.empty and [*df.columns] == FASTA_COLUMNS[1:]
+    assert [*read_fasta(io.StringIO(""), chunksize=2)] == []
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 4, 5, 6])
+def test_fasta_batches_split_between_records(batch_size):
+    """Records on either side of a batch boundary (incl. the multi-line &
+    blank-line ones) come out whole, in order, in full batches."""
+    batches = [*_fasta_batches(io.StringIO(FASTA), batch_size=batch_size)]
+    assert [len(b["id"]) for b in batches[:-1]] == [batch_size] * (len(batches) - 1)
+    assert 0 < len(batches[-1]["id"]) <= batch_size
+    ids, seqs = sum((b["id"] for b in batches), []), sum((b["seq"] for b in batches), [])
+    assert [*zip(ids, seqs)] == [(r[0], r[2]) for r in biopython_records()]
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 4, 5, 100])
+def test_chunked_read_fasta_equals_whole(chunksize, tmp_path):
+    whole_out, chunked_out = tmp_path / "whole.fasta", tmp_path / "chunked.fasta"
+    whole = read_fasta(io.StringIO(FASTA), fa_out=str(whole_out))
+    chunks = [*read_fasta(io.StringIO(FASTA), fa_out=str(chunked_out), chunksize=chunksize)]
+    assert all(len(chunk) <= chunksize for chunk in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks), whole)
+    # (side outputs, written as records are read)
+    assert chunked_out.read_text() == whole_out.read_text()
+    assert [(r.id, str(r.seq)) for r in SeqIO.parse(str(whole_out), "fasta")] == [
+        (r[0], r[2]) for r in biopython_records()
+    ]
+    tsv = pd.read_csv(f"{chunked_out}.DataFrame.tsv", sep="\t", index_col="id", keep_default_na=False)
+    assert tsv["seq"].tolist() == whole["seq"].tolist()
+    assert tsv["length"].tolist() == whole["length"].tolist()
@@ -0,0 +1,25 @@
+"""
+Start up: `import deploy` (what every gunicorn worker does before its
+first request) stays within `IMPORT_TIME_BUDGET_S`, as measured by
+`python -X importtime` in a fresh interpreter.
+"""
+import os
+
+import pytest
+
+pytest.importorskip("dash")
+
+from seqapp.benchmarks import import_time
+from seqapp.config import IMPORT_TIME_BUDGET_S
+
+REPO = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+def test_deploy_import_time_is_within_budget():
+    try:
+        import_time("deploy", cwd=REPO)  # (compiles the bytecode caches)
+        total, rows = import_time("deploy", cwd=REPO)
+    except ImportError as e:
+        pytest.skip(f"deploy is not importable here: {e}")
+    slowest = "\n".join(f"{us / 1e3:>10,.1f}ms  {name}" for us, name in sorted(rows, reverse=True)[:15])
+    assert total <= IMPORT_TIME_BUDGET_S, f"`import deploy`: {total:.3f}s\n{slowest}"
@@ -0,0 +1,108 @@
+"""
+`get_N_quals` (over `PackedReads` buffers) returns what its former
+per-read implementation did, for reads parsed from a small FASTQ.
+"""
+import io
+import itertools as itl
+
+import pytest
+
+pytest.importorskip("dash")
+pytest.importorskip("Bio")
+
+import pandas as pd
+
+from Bio import SeqIO
+
+from seqapp.bioinfo.pipeline import PackedReads
+from seqapp.bioinfo.pipeline import get_N_quals
+
+FASTQ = """\
+@read1 (no N)
+ACGTACGTAC
++
+IIIIIHHHGG
+@read2 (N in the middle)
+ACGTNACGTA
++
+IIII#IIIII
+@read3 (N at both ends, & a run)
+NACNNGTN
++
+!5I$%I?+
+@read4 (all N)
+NNNN
++
+&'()
+@read5 (no N)
+GATTACA
++
+ABCDEFG
+"""
+
+
+def former_get_N_quals(df):
+    """`get_N_quals` as it was before `PackedReads` (per-read loop)."""
+    bqs = []
+    for n in range(df.shape[0]):
+        bqs.append(
+            [
+                (b, q)
+                for (b, q) in [*zip(df.iloc[n].seq, df.iloc[n].Q_arrays)]
+                if b == "N"
+            ]
+        )
+    N_quals = [q for (b, q) in [*itl.chain.from_iterable(bqs)]]
+    df_NQs = pd.Series(N_quals)
+    return df_NQs, df_NQs.describe()
+
+
+def reads_df(fastq=FASTQ):
+    records = [*SeqIO.parse(io.StringIO(fastq), "fastq")]
+    return pd.DataFrame(
+        {
+            "seq": [str(r.seq) for r in records],
+            "Q_arrays": [r.letter_annotations["phred_quality"] for r in records],
+        },
+        index=[r.id for r in records],
+    )
+
+
+def assert_same_N_quals(result, expected):
+    (quals, stats), (former_quals, former_stats) = result, expected
+    assert quals.tolist() == former_quals.tolist()
+    pd.testing.assert_series_equal(stats.astype(float), former_stats.astype(float))
+
+
+def test_get_N_quals_matches_former_implementation():
+    df = reads_df()
+    assert_same_N_quals(get_N_quals(df), former_get_N_quals(df))
+    assert get_N_quals(df)[0].tolist() == [2, 0, 3, 4, 10, 5, 6, 7, 8]
+
+
+@pytest.mark.parametrize("rows", [[1], [3], [0, 1], [2, 0, 3], [4, 3, 1]])
+def test_get_N_quals_matches_former_implementation_per_batch(rows):
+    df = reads_df().iloc[rows]
+    assert_same_N_quals(get_N_quals(df), former_get_N_quals(df))
+
+
+def test_get_N_quals_without_any_N():
+    df = reads_df().iloc[[0, 4]]
+    quals, stats = get_N_quals(df)
+    assert len(quals) == len(former_get_N_quals(df)[0]) == 0
+    assert stats["count"] == 0
+
+
+def test_packed_reads_from_quality_strings_and_arrays_agree():
+    df = reads_df()
+    ascii_quals = ["".join(chr(q + 33) for q in quals) for quals in df.Q_arrays]
+    packed = PackedReads.from_reads(df.seq, ascii_quals, index=[*df.index])
+    assert get_N_quals(packed)[0].tolist() == get_N_quals(df)[0].tolist()
+    assert packed.lengths.tolist() == [len(s) for s in df.seq]
+    assert packed.read_ids.tolist() == [i for i, s in enumerate(df.seq) for _ in s]
+
+
+def test_reads_are_truncated_to_the_shorter_of_bases_and_qualities():
+    df = pd.DataFrame({"seq": ["NNANN", "AN"], "Q_arrays": [[1, 2, 3], [4, 5, 6]]})
+    assert_same_N_quals(get_N_quals(df), former_get_N_quals(df))
+    assert get_N_quals(df)[0].tolist() == [1, 2, 5]
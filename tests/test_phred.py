@@ -0,0 +1,59 @@
+"""
+Table-driven Phred quality -> error probability conversion (`phred_table`
+& co., in seqapp/bioinfo/pipeline.py), against known values: Q = -10
+log10(P), i.e. Q10 -> 0.1, Q20 -> 0.01, Q30 -> 0.001.
+"""
+import pytest
+
+pytest.importorskip("dash")
+pytest.importorskip("Bio")
+
+import numpy as np
+
+from seqapp.bioinfo.pipeline import PackedReads
+from seqapp.bioinfo.pipeline import phred_table
+from seqapp.bioinfo.pipeline import q2p
+from seqapp.bioinfo.pipeline import quals_to_probs
+from seqapp.bioinfo.pipeline import read_error_stats
+from seqapp.bioinfo.pipeline import read_fastq
+
+KNOWN = {0: 1.0, 10: 0.1, 20: 0.01, 30: 0.001, 40: 0.0001}
+
+
+@pytest.mark.parametrize("offset", [0, 33, 64])
+def test_phred_table(offset):
+    table = phred_table(offset)
+    assert table.shape == (256,)
+    for q, p in KNOWN.items():
+        assert table[q + offset] == pytest.approx(p, rel=1e-12)
+    assert (table[:offset] == 1.0).all()  # (invalid scores)
+    assert not table.flags.writeable
+
+
+def test_quals_to_probs_of_strings_bytes_and_arrays():
+    expected = [0.1, 0.01, 0.001, 1.0]
+    for quals in ["+5?!", b"+5?!", np.frombuffer(b"+5?!", dtype=np.uint8)]:
+        np.testing.assert_allclose(quals_to_probs(quals), expected, rtol=1e-12)
+    np.testing.assert_allclose(quals_to_probs([10, 20, 30, 0], offset=0), expected, rtol=1e-12)
+
+
+def test_q2p():
+    assert [q2p(c) for c in "+5?I"] == [0.1, 0.01, 0.001, 0.0001]
+
+
+def test_read_error_stats():
+    packed = PackedReads.from_reads(["ACGT", "AC", "G"], [[10, 20, 30, 40], [10, 10], [20]])
+    stats = read_error_stats(packed)
+    assert stats["length"].tolist() == [4, 2, 1]
+    np.testing.assert_allclose(stats["expected_errors"], [0.1111, 0.2, 0.01], rtol=1e-12)
+    np.testing.assert_allclose(stats["mean_error"], [0.1111 / 4, 0.1, 0.01], rtol=1e-12)
+
+
+def test_read_fastq():
+    fastq = b"@r1 first read\nACGT\n+\n+5?I\n@r2\nNN\n+\n++\n"
+    df = read_fastq(fastq)
+    assert df["id"].tolist() == ["r1", "r2"]
+    assert df["seq"].tolist() == ["ACGT", "NN"]
+    assert df["length"].tolist() == [4, 2]
+    np.testing.assert_allclose(df["expected_errors"], [0.1111, 0.2], rtol=1e-12)
+    assert read_fastq(b"").empty
@@ -0,0 +1,49 @@
+"""
+Chunked uploads (`seqapp.uploads`), as driven by assets/chunked-upload.js:
+the final chunk moves the file into place and records its handle.
+"""
+import io
+
+import pytest
+
+pytest.importorskip("werkzeug")
+
+from seqapp import uploads
+
+RUN_ID = "APP_RUNID_20191103224547407862"
+
+
+@pytest.fixture
+def session_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "session_output_dir", lambda RUN_ID: str(tmp_path))
+    return tmp_path
+
+
+def test_chunks_complete_upload(session_dir):
+    data = b"ACGT" * 10
+    first = uploads.write_chunk(RUN_ID, "reads.fa", 0, len(data), io.BytesIO(data[:16]))
+    assert first == {"filename": "reads.fa", "offset": 16, "complete": False}
+    assert uploads.upload_offset(RUN_ID, "reads.fa")["offset"] == 16
+    last = uploads.write_chunk(RUN_ID, "reads.fa", 16, len(data), io.BytesIO(data[16:]))
+    assert last == {"filename": "reads.fa", "offset": len(data), "complete": True}
+    assert (session_dir / "reads.fa").read_bytes() == data
+    assert [h["size"] for h in uploads.list_uploads(RUN_ID)] == [len(data)]
+
+
+def test_empty_file_completes_on_its_single_empty_chunk(session_dir):
+    assert uploads.upload_offset(RUN_ID, "empty.fa") == {
+        "filename": "empty.fa",
+        "offset": 0,
+        "complete": False,
+    }
+    status = uploads.write_chunk(RUN_ID, "empty.fa", 0, 0, io.BytesIO(b""))
+    assert status == {"filename": "empty.fa", "offset": 0, "complete": True}
+    assert (session_dir / "empty.fa").read_bytes() == b""
+    [handle] = uploads.list_uploads(RUN_ID)
+    assert (handle["filename"], handle["size"]) == ("empty.fa", 0)
+    assert uploads.upload_offset(RUN_ID, "empty.fa")["complete"]
+
+
+def test_out_of_order_chunk_is_rejected(session_dir):
+    with pytest.raises(ValueError):
+        uploads.write_chunk(RUN_ID, "reads.fa", 8, 16, io.BytesIO(b"ACGTACGT"))